@@ -1,38 +1,254 @@
-from tempo_worklog_automation.client import make_async_create_worklog_requests
-from tempo_worklog_automation.client.models import WorklogModel
+import logging
+import sys
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from tempo_worklog_automation.client.exceptions import (
+    FailureThresholdError,
+    InvalidWorklogsError,
+    ScheduleConflictsError,
+    UnknownIssuesError,
+)
+from tempo_worklog_automation.client.models import CliArguments
 from tempo_worklog_automation.client.utils.arguments import parse_args
-from tempo_worklog_automation.client.utils.csv import load_csv_file
 from tempo_worklog_automation.client.utils.log import LoggingClass
-from tempo_worklog_automation.settings import settings
+from tempo_worklog_automation.settings import (
+    LogFormat,
+    OverlapCheck,
+    load_settings,
+    settings,
+)
+
+
+def run_delete_command(
+    cli_arguments: CliArguments,
+    logger: logging.Logger,
+) -> Dict[str, Any]:
+    """
+    Run the delete command selected by the cli args.
+
+    :param cli_arguments: parsed CliArguments.
+    :param logger: application logger.
+    :return: dictionary with the deleted, missing and failed counts.
+    """
+    from tempo_worklog_automation.client import api  # noqa: WPS433
+
+    if cli_arguments.delete_range is not None:
+        date_from, date_to = cli_arguments.delete_range
+        logger.info("Deleting worklogs between %s and %s.", date_from, date_to)
+        return api.make_async_delete_author_worklogs(
+            cli_arguments.author or settings.author_account_id,
+            date_from,
+            date_to,
+        )
+    logger.info("Deleting uploaded worklogs.")
+    return api.make_async_delete_uploaded_worklogs(cli_arguments.file_path)  # type: ignore # noqa: E501
+
+
+def run_command(cli_arguments: CliArguments, logger: logging.Logger) -> Dict[str, Any]:
+    """
+    Run the upload, sync or delete command selected by the cli args.
+
+    The api client is imported here, so the offline commands do not load it.
+
+    :param cli_arguments: parsed CliArguments.
+    :param logger: application logger.
+    :return: dictionary with the counts of the command.
+    """
+    from tempo_worklog_automation.client import api  # noqa: WPS433
+
+    if cli_arguments.delete_range is not None or cli_arguments.delete_uploaded:
+        return run_delete_command(cli_arguments, logger)
+    if cli_arguments.sync:
+        logger.info("Synchronising worklogs.")
+        return api.make_async_sync_worklogs_file(cli_arguments.file_path)  # type: ignore # noqa: E501
+
+    if cli_arguments.manifest is not None:
+        from tempo_worklog_automation.client.manifest import (  # noqa: WPS433
+            load_upload_manifest,
+        )
+
+        manifest = load_upload_manifest(cli_arguments.manifest)
+        logger.info("Uploading worklogs of %s authors.", len(manifest.authors))
+        return api.make_async_upload_manifest(
+            manifest,
+            cli_arguments.resume,
+            cli_arguments.skip_existing,
+            cli_arguments.coalesce,
+        )
+
+    if cli_arguments.watch:
+        logger.info("Watching worklogs, stop with Ctrl+C.")
+        return api.make_async_watch_worklogs_file(cli_arguments.file_path)  # type: ignore # noqa: E501
+
+    if len(cli_arguments.file_paths) > 1:
+        logger.info("Uploading worklogs of %s files.", len(cli_arguments.file_paths))
+        return api.make_async_upload_worklog_files(
+            cli_arguments.file_paths,  # type: ignore
+            cli_arguments.resume,
+            cli_arguments.skip_existing,
+            cli_arguments.coalesce,
+        )
+
+    logger.info("Uploading worklogs.")
+    return api.make_async_upload_worklogs_file(
+        cli_arguments.file_path,  # type: ignore
+        cli_arguments.resume,
+        cli_arguments.skip_existing,
+        cli_arguments.receipt,
+        cli_arguments.coalesce,
+    )
+
+
+def count_failures(summary: Dict[str, Any]) -> int:
+    """
+    Count the failed and retryable rows of a command summary.
+
+    Summaries of several files are counted file by file, a file that failed as a
+    whole counts as one.
+
+    :param summary: dictionary returned by run_command.
+    :return: number of failures.
+    """
+    from tempo_worklog_automation.client.results import (  # noqa: WPS433
+        FAILED,
+        RETRYABLE,
+    )
+
+    if "error" in summary:
+        return 1
+    file_failures = sum(
+        count_failures(file_summary)
+        for file_summary in summary.values()
+        if isinstance(file_summary, dict)
+    )
+    return file_failures + summary.get(FAILED, 0) + summary.get(RETRYABLE, 0)
+
+
+def exit_status(summary: Dict[str, Any], logger: logging.Logger) -> int:
+    """
+    Return the exit status of a command, logging its failures.
+
+    :param summary: dictionary returned by run_command.
+    :param logger: application logger.
+    :return: 1 when some row or file failed, 0 otherwise.
+    """
+    failures = count_failures(summary)
+    if failures:
+        logger.error("%s rows or files failed.", failures)
+        return 1
+    return 0
+
+
+def report_schedule(file_path: Path) -> bool:
+    """
+    Print the overlapping worklogs and the overbooked days of a file.
+
+    Nothing is checked when the overlap check is off.
+
+    :param file_path: Path object for the worklogs file.
+    :return: whether some were found and the overlap check is set to fail.
+    """
+    if settings.overlap_check == OverlapCheck.OFF:
+        return False
+
+    from tempo_worklog_automation.client.schedule import (  # noqa: WPS433
+        check_worklogs_file,
+    )
+
+    report = check_worklogs_file(file_path)
+    for line in report.format_lines():
+        print(f"{file_path}:{line}")  # noqa: WPS421
+    return bool(report) and settings.overlap_check == OverlapCheck.FAIL
+
+
+def validate_files(file_paths: List[Path], processes: Optional[int] = None) -> int:
+    """
+    Validate worklogs files offline and print a report of each file.
+
+    Overlapping worklogs and days over 24 hours are reported too, unless the
+    overlap check is off.
+
+    :param file_paths: list of Path objects for the csv files.
+    :param processes: processes validating each file, 0 for one per core, defaults
+        to the settings.
+    :return: exit status, 1 when some row is invalid or the overlap check fails.
+    """
+    from tempo_worklog_automation.client.validation import (  # noqa: WPS433
+        validate_worklogs_file,
+        validate_worklogs_file_sharded,
+    )
+
+    if processes is None:
+        processes = settings.validation_processes
+    exit_status = 0
+    for file_path in file_paths:
+        if processes == 1:
+            report = validate_worklogs_file(file_path)
+        else:
+            report = validate_worklogs_file_sharded(file_path, processes or None)
+        for error in report.errors:
+            print(  # noqa: WPS421
+                f"{file_path}:{error.row}: {error.field}: {error.message}",
+            )
+        schedule_failed = report_schedule(file_path)
+        print(  # noqa: WPS421
+            f"{file_path}: {report.rows} rows, {report.invalid_rows} invalid",
+        )
+        if report.invalid_rows or schedule_failed:
+            exit_status = 1
+    return exit_status
 
 
 def main() -> None:
     """Main function."""
+    cli_arguments = parse_args()
+    load_settings(require_credentials=not cli_arguments.validate_only)
+
     logger_instance = LoggingClass(
         name=settings.logger_name,
         level=settings.log_level.value,
+        json_format=settings.log_format == LogFormat.JSON,
+        use_queue=settings.log_queue,
     )
     logger = logger_instance.create_logger()
 
-    logger.info("Uploading worklogs.")
-
-    cli_arguments = parse_args()
-
-    csv_object = load_csv_file(cli_arguments.file_path)
-
-    list_of_worklogs = [
-        WorklogModel(
-            issue=worklog["issue"],
-            time_spent=worklog["time_spent"],
-            start_date=worklog["start_date"],
-            start_time=worklog["start_time"],
+    if cli_arguments.validate_only:
+        sys.exit(
+            validate_files(
+                cli_arguments.file_paths,  # type: ignore
+                cli_arguments.processes,
+            ),
         )
-        for worklog in csv_object["worklogs"]
-    ]
 
-    make_async_create_worklog_requests(list_of_worklogs)  # type: ignore
+    from tempo_worklog_automation.client.metrics import (  # noqa: WPS433
+        RunStatistics,
+        hook_scope,
+    )
+
+    stats_file = cli_arguments.stats_file or settings.stats_file
+    with hook_scope(RunStatistics()) as statistics:
+        try:
+            summary = run_command(cli_arguments, logger)
+        except (
+            UnknownIssuesError,
+            ScheduleConflictsError,
+            FailureThresholdError,
+            InvalidWorklogsError,
+        ) as exc:
+            logger.error(exc)
+            sys.exit(1)
+        except KeyboardInterrupt:
+            logger.info("Interrupted.")
+            sys.exit(130)
+        finally:
+            if stats_file is not None:
+                statistics.write(stats_file)
 
-    logger.info("Finished upload.")
+    logger.info("Finished: %s", summary)
+    if cli_arguments.stats:
+        print(statistics.format_summary())  # noqa: WPS421
+    sys.exit(exit_status(summary, logger))
 
 
 if __name__ == "__main__":
@@ -0,0 +1 @@
+"""Benchmarks for tempo_worklog_automation, run them with python -m."""
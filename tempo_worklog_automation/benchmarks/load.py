@@ -0,0 +1,206 @@
+"""
+End-to-end load benchmark of the create and delete runners against the stand-in.
+
+Starts the local stand-in server on its own thread, points the api settings at it
+and reports rows/sec, p50/p95/p99 request latency and retries for each run.
+Run with ``python -m tempo_worklog_automation.benchmarks.load --rows 1000 10000``.
+"""
+import argparse
+import time
+from typing import Any, Dict, List, Sequence
+
+import anyio
+import httpx
+
+from tempo_worklog_automation.benchmarks.stub_server import (
+    StubServer,
+    config_from_args,
+    parse_config_args,
+)
+from tempo_worklog_automation.benchmarks.validation import generate_rows
+from tempo_worklog_automation.client import (
+    run_create_worklog_requests,
+    run_delete_worklog_requests,
+)
+from tempo_worklog_automation.client.session import HttpSession
+from tempo_worklog_automation.client.validation import validate_worklogs
+from tempo_worklog_automation.settings import settings
+
+STARTED_AT = "benchmark_started_at"
+
+
+class LatencyRecorder:
+    """Record the latency and status code of every response of an httpx client."""
+
+    def __init__(self) -> None:
+        self.latencies: List[float] = []
+        self.status_codes: List[int] = []
+
+    def attach(self, client: httpx.AsyncClient) -> None:
+        """
+        Install request and response event hooks on a client.
+
+        :param client: instance of httpx.AsyncClient.
+        """
+        client.event_hooks["request"].append(self._on_request)
+        client.event_hooks["response"].append(self._on_response)
+
+    def reset(self) -> None:
+        """Forget the recorded responses."""
+        self.latencies.clear()
+        self.status_codes.clear()
+
+    def percentile(self, fraction: float) -> float:
+        """
+        Return a latency percentile with the nearest rank method.
+
+        :param fraction: percentile between 0 and 1.
+        :return: latency in seconds, 0 without responses.
+        """
+        if not self.latencies:
+            return 0
+        ordered = sorted(self.latencies)
+        rank = min(len(ordered) - 1, max(0, round(fraction * len(ordered)) - 1))
+        return ordered[rank]
+
+    async def _on_request(self, request: httpx.Request) -> None:
+        request.extensions[STARTED_AT] = time.perf_counter()
+
+    async def _on_response(self, response: httpx.Response) -> None:
+        started_at = response.request.extensions[STARTED_AT]
+        self.latencies.append(time.perf_counter() - started_at)
+        self.status_codes.append(response.status_code)
+
+
+def point_settings_at(server: StubServer) -> None:
+    """
+    Direct the Jira and Tempo api settings to the stand-in server.
+
+    :param server: running StubServer.
+    """
+    settings.jira_base_api_url = f"{server.base_url}/rest/api/2/issue"
+    settings.jira_search_api_url = f"{server.base_url}/rest/api/2/search"
+    settings.tempo_base_api_url = f"{server.base_url}/4/worklogs"
+    settings.issue_id_cache_persist = False
+    settings.upload_journal = False
+
+
+def summarize(
+    phase: str,
+    rows: int,
+    elapsed: float,
+    recorder: LatencyRecorder,
+) -> Dict[str, Any]:
+    """
+    Summarize the responses recorded for one phase.
+
+    :param phase: phase name.
+    :param rows: number of rows processed.
+    :param elapsed: wall clock seconds of the phase.
+    :param recorder: LatencyRecorder of the phase.
+    :return: dictionary with the throughput, latency percentiles and retries.
+    """
+    throttled = recorder.status_codes.count(429)  # noqa: WPS432
+    server_errors = sum(code >= 500 for code in recorder.status_codes)  # noqa: WPS432
+    return {
+        "phase": phase,
+        "rows": rows,
+        "seconds": elapsed,
+        "rows_per_second": rows / elapsed if elapsed else 0,
+        "p50_ms": recorder.percentile(0.5) * 1000,
+        "p95_ms": recorder.percentile(0.95) * 1000,
+        "p99_ms": recorder.percentile(0.99) * 1000,
+        "requests": len(recorder.status_codes),
+        "throttled": throttled,
+        "server_errors": server_errors,
+        "retries": throttled + server_errors,
+    }
+
+
+async def run_benchmark(rows: Sequence[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """
+    Create then delete the rows through the runners, timing each phase.
+
+    :param rows: row dictionaries.
+    :return: list with the summary of each phase.
+    """
+    list_of_worklogs = validate_worklogs(rows).worklogs
+    jira_recorder = LatencyRecorder()
+    tempo_recorder = LatencyRecorder()
+    async with HttpSession.from_settings() as session:
+        jira_recorder.attach(session.jira)
+        tempo_recorder.attach(session.tempo)
+
+        started_at = time.perf_counter()
+        results = await run_create_worklog_requests(list_of_worklogs, session)
+        create_summary = summarize(
+            "create",
+            len(list_of_worklogs),
+            time.perf_counter() - started_at,
+            tempo_recorder,
+        )
+        create_summary["jira_requests"] = len(jira_recorder.status_codes)
+
+        tempo_recorder.reset()
+        worklog_ids = results["worklog_ids"]
+        started_at = time.perf_counter()
+        await run_delete_worklog_requests(worklog_ids, session)
+        delete_summary = summarize(
+            "delete",
+            len(worklog_ids),
+            time.perf_counter() - started_at,
+            tempo_recorder,
+        )
+    return [create_summary, delete_summary]
+
+
+def main() -> None:
+    """Run the benchmark for each requested row count."""
+    parser = argparse.ArgumentParser(description="Create and delete load benchmark.")
+    parser.add_argument(
+        "--rows",
+        nargs="+",
+        type=int,
+        default=[1000, 10000],
+        help="Row counts to benchmark.",
+    )
+    parser.add_argument(
+        "--tempo-requests-per-second",
+        type=float,
+        default=settings.tempo_requests_per_second,
+        help="Client side Tempo rate limit, 0 disables it.",
+    )
+    parser.add_argument(
+        "--tempo-max-concurrency",
+        type=int,
+        default=settings.tempo_max_concurrency,
+        help="Client side concurrent Tempo requests, 0 disables the limit.",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=settings.upload_workers,
+        help="Concurrent upload pipeline workers.",
+    )
+    parse_config_args(parser)
+    args = parser.parse_args()
+    settings.tempo_requests_per_second = args.tempo_requests_per_second
+    settings.tempo_max_concurrency = args.tempo_max_concurrency
+    settings.upload_workers = args.workers
+
+    print(  # noqa: WPS421
+        f"{'phase':>6} {'rows':>8} {'rows/s':>9} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'retries':>8}",  # noqa: E501
+    )
+    for count in args.rows:
+        server = StubServer(config_from_args(args))
+        with server.run_in_thread():
+            point_settings_at(server)
+            summaries = anyio.run(run_benchmark, generate_rows(count, args.seed))
+        for summary in summaries:
+            print(  # noqa: WPS421
+                f"{summary['phase']:>6} {summary['rows']:>8} {summary['rows_per_second']:>9.1f} {summary['p50_ms']:>8.1f} {summary['p95_ms']:>8.1f} {summary['p99_ms']:>8.1f} {summary['retries']:>8}",  # noqa: E501
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,101 @@
+"""
+Compare the streaming worklog readers on generated files of each format.
+
+The whole-document ``yaml.safe_load`` the YAML files were read with before is
+timed as a baseline. Run with
+``python -m tempo_worklog_automation.benchmarks.readers --rows 10000 100000``.
+"""
+import argparse
+import csv
+import json
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, List
+
+import yaml
+
+from tempo_worklog_automation.benchmarks.validation import generate_rows
+from tempo_worklog_automation.client.utils.readers import iter_worklog_rows
+
+
+def write_files(rows: List[Dict[str, Any]], directory: Path) -> Dict[str, Path]:
+    """
+    Write the rows as csv, JSON Lines and YAML files.
+
+    :param rows: row dictionaries.
+    :param directory: directory receiving the files.
+    :return: dictionary with the path of each format.
+    """
+    paths = {
+        "csv": directory / "worklogs.csv",
+        "jsonl": directory / "worklogs.jsonl",
+        "yaml": directory / "worklogs.yaml",
+    }
+    with open(paths["csv"], "w", newline="") as csv_file:
+        writer = csv.DictWriter(csv_file, fieldnames=list(rows[0]))
+        writer.writeheader()
+        writer.writerows(rows)
+    with open(paths["jsonl"], "w") as jsonl_file:
+        for row in rows:
+            jsonl_file.write(f"{json.dumps(row)}\n")
+    with open(paths["yaml"], "w") as yaml_file:
+        yaml.dump({"worklogs": rows}, yaml_file, Dumper=yaml.SafeDumper)
+    return paths
+
+
+def measure(read: Callable[[Path], Any], file_path: Path) -> float:
+    """
+    Time reading every row of a file.
+
+    :param read: reading function.
+    :param file_path: Path object for the file.
+    :return: elapsed seconds.
+    """
+    started_at = time.perf_counter()
+    for _ in read(file_path):  # noqa: WPS328
+        pass  # noqa: WPS420
+    return time.perf_counter() - started_at
+
+
+def safe_load_rows(yaml_file_path: Path) -> List[Dict[str, Any]]:
+    """
+    Read a YAML file with the pure Python loader, as a whole document.
+
+    :param yaml_file_path: Path object for the YAML file.
+    :return: list of row dictionaries.
+    """
+    with open(yaml_file_path) as yaml_file:
+        return yaml.safe_load(yaml_file)["worklogs"]
+
+
+def main() -> None:
+    """Run the benchmark for each requested row count."""
+    parser = argparse.ArgumentParser(description="Worklog readers benchmark.")
+    parser.add_argument(
+        "--rows",
+        nargs="+",
+        type=int,
+        default=[10000, 100000],
+        help="Row counts to benchmark.",
+    )
+    args = parser.parse_args()
+
+    print(  # noqa: WPS421
+        f"{'rows':>10} {'csv s':>8} {'jsonl s':>8} {'yaml s':>8} {'safe_load s':>12}",
+    )
+    for count in args.rows:
+        with tempfile.TemporaryDirectory() as directory:
+            paths = write_files(generate_rows(count), Path(directory))
+            seconds = [
+                measure(iter_worklog_rows, paths[file_format])
+                for file_format in ("csv", "jsonl", "yaml")
+            ]
+            safe_load_seconds = measure(safe_load_rows, paths["yaml"])
+        print(  # noqa: WPS421
+            f"{count:>10} {seconds[0]:>8.3f} {seconds[1]:>8.3f} {seconds[2]:>8.3f} {safe_load_seconds:>12.3f}",  # noqa: E501
+        )
+
+
+if __name__ == "__main__":
+    main()
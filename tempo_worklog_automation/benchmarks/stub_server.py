@@ -0,0 +1,398 @@
+"""
+Local stand-in for the Jira and Tempo apis used by tests and benchmarks.
+
+Serves the Jira issue and search endpoints and the Tempo worklog POST, PUT, DELETE
+and GET endpoints over plain HTTP/1.1 with keep-alive, with configurable latency,
+throttling, server error rate and request quota. Run it standalone with
+``python -m tempo_worklog_automation.benchmarks.stub_server --port 8080``.
+"""
+import argparse
+import json
+import random
+import re
+import time
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+from urllib.parse import parse_qs, urlencode, urlsplit
+
+import anyio
+from anyio.abc import SocketAttribute, SocketStream, TaskStatus
+from anyio.from_thread import start_blocking_portal
+from anyio.streams.buffered import BufferedByteReceiveStream
+
+JIRA_ISSUE_PATH = re.compile(r"^/rest/api/2/issue/(?P<key>[^/]+)$")
+JIRA_SEARCH_PATH = "/rest/api/2/search"
+TEMPO_WORKLOGS_PATH = "/4/worklogs"
+TEMPO_WORKLOG_PATH = re.compile(r"^/4/worklogs/(?P<worklog_id>\d+)$")
+TEMPO_USER_WORKLOGS_PATH = re.compile(r"^/4/worklogs/user/(?P<account_id>[^/]+)$")
+JQL_KEY = re.compile(r'"([^"]+)"')
+
+REASONS = {
+    200: "OK",
+    204: "No Content",
+    400: "Bad Request",
+    404: "Not Found",
+    429: "Too Many Requests",
+    503: "Service Unavailable",
+}
+
+Response = Tuple[int, Optional[Any], Dict[str, str]]
+
+
+class StubServerConfig:
+    """
+    Behaviour of the stand-in server.
+
+    Latency applies to every request, throttling, server errors and the quota only
+    apply to the Tempo worklog endpoints.
+
+    :param latency: seconds added to every response.
+    :param jitter: maximum random seconds added on top of the latency.
+    :param rate_429: probability of answering 429 Too Many Requests.
+    :param rate_5xx: probability of answering 503 Service Unavailable.
+    :param quota: requests per second allowed before answering 429, 0 disables it.
+    :param retry_after: Retry-After seconds sent with 429 responses.
+    :param unknown_issues: issue keys answered as not found.
+    :param fail_methods: http methods subject to throttling and errors, None for all.
+    :param seed: random seed for reproducible runs.
+    """
+
+    def __init__(  # noqa: WPS211
+        self,
+        latency: float = 0,
+        jitter: float = 0,
+        rate_429: float = 0,
+        rate_5xx: float = 0,
+        quota: float = 0,
+        retry_after: float = 1,
+        unknown_issues: Optional[List[str]] = None,
+        fail_methods: Optional[List[str]] = None,
+        seed: int = 0,
+    ):
+        self.latency = latency
+        self.jitter = jitter
+        self.rate_429 = rate_429
+        self.rate_5xx = rate_5xx
+        self.quota = quota
+        self.retry_after = retry_after
+        self.unknown_issues = set(unknown_issues or [])
+        self.fail_methods = fail_methods
+        self.seed = seed
+
+
+class StubServer:
+    """
+    In-memory Jira and Tempo stand-in.
+
+    :param config: StubServerConfig, defaults to an always succeeding server.
+    """
+
+    def __init__(self, config: Optional[StubServerConfig] = None):
+        self.config = config or StubServerConfig()
+        self.worklogs: Dict[int, Dict[str, Any]] = {}
+        self.counters: Dict[str, int] = {"requests": 0, "throttled": 0, "errors": 0}
+        self.port = 0
+        self._random = random.Random(self.config.seed)
+        self._next_worklog_id = 1
+        self._quota_tokens = self.config.quota
+        self._quota_updated_at = time.monotonic()
+
+    @property
+    def base_url(self) -> str:
+        """
+        Root url of the running server.
+
+        :return: url string.
+        """
+        return f"http://127.0.0.1:{self.port}"
+
+    async def serve(
+        self,
+        port: int = 0,
+        task_status: TaskStatus[None] = anyio.TASK_STATUS_IGNORED,
+    ) -> None:
+        """
+        Serve requests until cancelled.
+
+        :param port: tcp port to listen on, 0 picks a free one.
+        :param task_status: anyio task status, started once listening.
+        """
+        listener = await anyio.create_tcp_listener(
+            local_host="127.0.0.1",
+            local_port=port,
+        )
+        self.port = listener.extra(SocketAttribute.local_port)
+        task_status.started()
+        await listener.serve(self._handle_connection)
+
+    def handle(
+        self,
+        method: str,
+        target: str,
+        body: bytes,
+    ) -> Response:
+        """
+        Answer a single request, ignoring latency and failure injection.
+
+        :param method: http method.
+        :param target: request path with query string.
+        :param body: request body.
+        :return: tuple with status code, json payload and extra headers.
+        """
+        url = urlsplit(target)
+        query = {key: values[-1] for key, values in parse_qs(url.query).items()}
+        issue_match = JIRA_ISSUE_PATH.match(url.path)
+        worklog_match = TEMPO_WORKLOG_PATH.match(url.path)
+        user_match = TEMPO_USER_WORKLOGS_PATH.match(url.path)
+        if method == "GET" and issue_match:
+            return self._get_issue(issue_match["key"])
+        if method == "GET" and url.path == JIRA_SEARCH_PATH:
+            return self._search_issues(query)
+        if method == "POST" and url.path == TEMPO_WORKLOGS_PATH:
+            return self._create_worklog(json.loads(body))
+        if worklog_match:
+            return self._handle_worklog(method, int(worklog_match["worklog_id"]), body)
+        if method == "GET" and user_match:
+            return self._list_worklogs(url.path, user_match["account_id"], query)
+        return 404, None, {}
+
+    @contextmanager
+    def run_in_thread(self, port: int = 0) -> Iterator["StubServer"]:
+        """
+        Run the server on its own event loop thread.
+
+        :param port: tcp port to listen on, 0 picks a free one.
+        :yield: the running StubServer.
+        """
+        with start_blocking_portal(backend="asyncio") as portal:
+            future, _ = portal.start_task(self.serve, port)
+            yield self
+            future.cancel()
+
+    async def _handle_connection(self, stream: SocketStream) -> None:
+        receive = BufferedByteReceiveStream(stream)
+        async with stream:
+            while True:  # noqa: WPS457
+                try:
+                    head = await receive.receive_until(b"\r\n\r\n", 65536)
+                except (anyio.EndOfStream, anyio.IncompleteRead):
+                    return
+                request_line, *header_lines = head.decode("latin-1").split("\r\n")
+                method, target, _ = request_line.split(" ", 2)
+                headers = {
+                    name.strip().lower(): value.strip()
+                    for name, value in (line.split(":", 1) for line in header_lines)
+                }
+                content_length = int(headers.get("content-length", 0))
+                body = b""
+                if content_length:
+                    body = await receive.receive_exactly(content_length)
+                status, payload, extra_headers = await self._respond(
+                    method,
+                    target,
+                    body,
+                )
+                await stream.send(_encode_response(status, payload, extra_headers))
+                if headers.get("connection", "").lower() == "close":
+                    return
+
+    async def _respond(self, method: str, target: str, body: bytes) -> Response:
+        self.counters["requests"] += 1
+        delay = self.config.latency + self._random.uniform(0, self.config.jitter)
+        if delay:
+            await anyio.sleep(delay)
+        if method == "HEAD":
+            return 200, None, {}
+        fail_methods = self.config.fail_methods
+        if not target.startswith(TEMPO_WORKLOGS_PATH) or (
+            fail_methods is not None and method not in fail_methods
+        ):
+            return self.handle(method, target, body)
+        retry_after = {"Retry-After": f"{self.config.retry_after:g}"}
+        if not self._take_quota() or self._random.random() < self.config.rate_429:
+            self.counters["throttled"] += 1
+            return 429, {"errors": [{"message": "Rate limit"}]}, retry_after
+        if self._random.random() < self.config.rate_5xx:
+            self.counters["errors"] += 1
+            return 503, {"errors": [{"message": "Unavailable"}]}, {}
+        return self.handle(method, target, body)
+
+    def _take_quota(self) -> bool:
+        if self.config.quota <= 0:
+            return True
+        now = time.monotonic()
+        self._quota_tokens = min(
+            self.config.quota,
+            self._quota_tokens + (now - self._quota_updated_at) * self.config.quota,
+        )
+        self._quota_updated_at = now
+        if self._quota_tokens < 1:
+            return False
+        self._quota_tokens -= 1
+        return True
+
+    def _issue_id(self, issue_name: str) -> Optional[int]:
+        if issue_name in self.config.unknown_issues:
+            return None
+        project, _, number = issue_name.rpartition("-")
+        if not project or not number.isdigit():
+            return None
+        return 10000 + int(number)
+
+    def _get_issue(self, issue_name: str) -> Response:
+        issue_id = self._issue_id(issue_name)
+        if issue_id is None:
+            return 404, {"errorMessages": ["Issue does not exist"]}, {}
+        return 200, {"id": str(issue_id), "key": issue_name}, {}
+
+    def _search_issues(self, query: Dict[str, str]) -> Response:
+        found = []
+        for issue_name in JQL_KEY.findall(query.get("jql", "")):
+            issue_id = self._issue_id(issue_name)
+            if issue_id is not None:
+                found.append({"id": str(issue_id), "key": issue_name})
+        start_at = int(query.get("startAt", 0))
+        max_results = int(query.get("maxResults", 50))
+        page = found[start_at : start_at + max_results]
+        return 200, {"startAt": start_at, "total": len(found), "issues": page}, {}
+
+    def _create_worklog(self, payload: Dict[str, Any]) -> Response:
+        if payload["timeSpentSeconds"] <= 0:
+            return 400, {"errors": [{"message": "Time spent must be positive"}]}, {}
+        worklog_id = self._next_worklog_id
+        self._next_worklog_id += 1
+        worklog = {
+            "tempoWorklogId": worklog_id,
+            "issue": {"id": payload["issueId"]},
+            "timeSpentSeconds": payload["timeSpentSeconds"],
+            "startDate": payload["startDate"],
+            "startTime": payload["startTime"],
+            "description": payload.get("description", ""),
+            "author": {"accountId": payload["authorAccountId"]},
+        }
+        self.worklogs[worklog_id] = worklog
+        return 200, worklog, {}
+
+    def _handle_worklog(self, method: str, worklog_id: int, body: bytes) -> Response:
+        if method == "PUT":
+            return self._update_worklog(worklog_id, json.loads(body))
+        if method == "DELETE":
+            return self._delete_worklog(worklog_id)
+        return 404, None, {}
+
+    def _update_worklog(self, worklog_id: int, payload: Dict[str, Any]) -> Response:
+        worklog = self.worklogs.get(worklog_id)
+        if worklog is None:
+            return 404, {"errors": [{"message": "Worklog not found"}]}, {}
+        if payload["timeSpentSeconds"] <= 0:
+            return 400, {"errors": [{"message": "Time spent must be positive"}]}, {}
+        worklog.update(
+            {
+                "issue": {"id": payload["issueId"]},
+                "timeSpentSeconds": payload["timeSpentSeconds"],
+                "startDate": payload["startDate"],
+                "startTime": payload["startTime"],
+                "description": payload.get("description", ""),
+            },
+        )
+        return 200, worklog, {}
+
+    def _delete_worklog(self, worklog_id: int) -> Response:
+        if self.worklogs.pop(worklog_id, None) is None:
+            return 404, {"errors": [{"message": "Worklog not found"}]}, {}
+        return 204, None, {}
+
+    def _list_worklogs(
+        self,
+        path: str,
+        account_id: str,
+        query: Dict[str, str],
+    ) -> Response:
+        date_from = query.get("from", "0000-00-00")
+        date_to = query.get("to", "9999-99-99")
+        matching = [
+            worklog
+            for worklog in self.worklogs.values()
+            if worklog["author"]["accountId"] == account_id
+            and date_from <= worklog["startDate"] <= date_to
+        ]
+        offset = int(query.get("offset", 0))
+        limit = int(query.get("limit", 50))
+        page = matching[offset : offset + limit]
+        metadata: Dict[str, Any] = {
+            "count": len(page),
+            "offset": offset,
+            "limit": limit,
+        }
+        if offset + limit < len(matching):
+            next_query = urlencode({**query, "offset": offset + limit})
+            metadata["next"] = f"{self.base_url}{path}?{next_query}"
+        return 200, {"metadata": metadata, "results": page}, {}
+
+
+def _encode_response(
+    status: int,
+    payload: Optional[Any],
+    extra_headers: Dict[str, str],
+) -> bytes:
+    body = b"" if payload is None else json.dumps(payload).encode()
+    headers = {
+        "Content-Type": "application/json",
+        "Content-Length": str(len(body)),
+        **extra_headers,
+    }
+    head = [f"HTTP/1.1 {status} {REASONS.get(status, 'Unknown')}"]
+    head.extend(f"{name}: {value}" for name, value in headers.items())
+    return "\r\n".join(head).encode("latin-1") + b"\r\n\r\n" + body
+
+
+def parse_config_args(parser: argparse.ArgumentParser) -> None:
+    """
+    Add the StubServerConfig options to an argument parser.
+
+    :param parser: argparse.ArgumentParser to extend.
+    """
+    parser.add_argument("--latency", type=float, default=0.02, help="Seconds.")
+    parser.add_argument("--jitter", type=float, default=0.01, help="Seconds.")
+    parser.add_argument("--rate-429", type=float, default=0, dest="rate_429")
+    parser.add_argument("--rate-5xx", type=float, default=0, dest="rate_5xx")
+    parser.add_argument("--quota", type=float, default=0, help="Requests/second.")
+    parser.add_argument("--retry-after", type=float, default=1, dest="retry_after")
+    parser.add_argument("--seed", type=int, default=0)
+
+
+def config_from_args(args: argparse.Namespace) -> StubServerConfig:
+    """
+    Create a StubServerConfig from parsed arguments.
+
+    :param args: namespace returned by parse_args().
+    :return: StubServerConfig.
+    """
+    return StubServerConfig(
+        latency=args.latency,
+        jitter=args.jitter,
+        rate_429=args.rate_429,
+        rate_5xx=args.rate_5xx,
+        quota=args.quota,
+        retry_after=args.retry_after,
+        seed=args.seed,
+    )
+
+
+def main() -> None:
+    """Run the stand-in server until interrupted."""
+    parser = argparse.ArgumentParser(description="Jira and Tempo stand-in server.")
+    parser.add_argument("--port", type=int, default=8080)
+    parse_config_args(parser)
+    args = parser.parse_args()
+
+    server = StubServer(config_from_args(args))
+    print(  # noqa: WPS421
+        f"Serving on http://127.0.0.1:{args.port}, Jira issues at "
+        f"/rest/api/2/issue and Tempo worklogs at /4/worklogs",
+    )
+    anyio.run(server.serve, args.port)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,174 @@
+"""
+Compare per-row WorklogModel construction with batched validation.
+
+The baseline builds a copy of the model with its original, un-memoised
+validators, so the speedup covers both the caches and the batching.
+
+Run with ``python -m tempo_worklog_automation.benchmarks.validation``.
+"""
+import argparse
+import random
+import time
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Sequence
+
+from pydantic import BaseModel, field_validator
+
+from tempo_worklog_automation.client.models import (
+    WorklogModel,
+    is_valid_time,
+    normalize_date,
+)
+from tempo_worklog_automation.client.validation import validate_worklogs
+
+
+class BaselineWorklogModel(BaseModel):
+    """WorklogModel as it was before validation was batched and memoised."""
+
+    issue: str
+    time_spent: int
+    start_date: str
+    start_time: str
+
+    @field_validator("time_spent", mode="before")
+    def validate_time_spent(cls, value: str) -> int:  # noqa: N805, WPS111
+        """
+        Pydantic validation for issue field of time_spent.
+
+        :param value: validation string.
+        :raises ValueError: when validator condition fails.
+        :return: validation string.
+        """
+        if not value.endswith("h") and not value.endswith("s"):
+            raise ValueError('Time spent units must be in hours "h" or seconds "s"')
+        try:
+            time_unit_dict = {"s": 1, "m": 60, "h": 3600, "d": 86400, "w": 604800}
+            float_from_string = float(value[:-1])
+            time_unit = value[-1]
+            time_spent_to_seconds = int(
+                float_from_string * time_unit_dict[time_unit],
+            )
+        except ValueError:
+            raise ValueError("Could not transform string to 24h hour string.")
+        return time_spent_to_seconds
+
+    @field_validator("start_date", mode="before")
+    def validate_start_date(cls, value: str) -> str:  # noqa: N805, WPS111
+        """
+        Pydantic validation for issue field of start_date.
+
+        :param value: validation string.
+        :raises ValueError: when validator condition fails.
+        :return: formatted date.
+        """
+        try:
+            datetime.strptime(value, "%Y-%m-%d")
+        except ValueError:
+            raise ValueError("Incorrect date format, should be YYYY-MM-DD")
+        return value
+
+    @field_validator("start_time", mode="before")
+    def validate_start_time(cls, value: str) -> str:  # noqa: N805, WPS111
+        """
+        Pydantic validation for issue field of start_time.
+
+        :param value: validation string.
+        :raises ValueError: when validator condition fails.
+        :return: validation string.
+        """
+        try:
+            datetime.strptime(value, "%H:%M:%S")
+        except ValueError:
+            raise ValueError("Incorrect time format, should be HH:MM:SS")
+        return value
+
+
+def generate_rows(count: int, seed: int = 0) -> List[Dict[str, Any]]:
+    """
+    Generate worklog rows shaped like the output of load_csv_file.
+
+    :param count: number of rows.
+    :param seed: random seed, keeps runs comparable.
+    :return: list of row dictionaries.
+    """
+    randomizer = random.Random(seed)
+    return [
+        {
+            "issue": f"INT-{randomizer.randint(1, 30)}",
+            "time_spent": f"{randomizer.choice((0.5, 1, 1.5, 2, 4))}h",
+            "start_date": f"2024-01-{randomizer.randint(1, 28):02d}",
+            "start_time": "{0}:{1:02d}:00".format(
+                randomizer.randint(8, 17),
+                randomizer.choice((0, 30)),
+            ),
+        }
+        for _ in range(count)
+    ]
+
+
+def validate_per_row(rows: Sequence[Dict[str, Any]]) -> List[BaselineWorklogModel]:
+    """
+    Validate rows with a plain loop over the original model, the baseline.
+
+    :param rows: row dictionaries.
+    :return: list of BaselineWorklogModel objects.
+    """
+    return [BaselineWorklogModel(**row) for row in rows]
+
+
+def validate_batch(rows: Sequence[Dict[str, Any]]) -> List[WorklogModel]:
+    """
+    Validate rows with validate_worklogs.
+
+    :param rows: row dictionaries.
+    :return: list of WorklogModel objects.
+    """
+    return validate_worklogs(rows).worklogs
+
+
+def measure(
+    validate: Callable[[Sequence[Dict[str, Any]]], Sequence[BaseModel]],
+    rows: Sequence[Dict[str, Any]],
+) -> float:
+    """
+    Time a validation function with cold parsing caches.
+
+    :param validate: validation function.
+    :param rows: row dictionaries.
+    :return: elapsed seconds.
+    """
+    normalize_date.cache_clear()
+    is_valid_time.cache_clear()
+    started_at = time.perf_counter()
+    validate(rows)
+    return time.perf_counter() - started_at
+
+
+def main() -> None:
+    """Run the benchmark for each requested row count."""
+    parser = argparse.ArgumentParser(description="Worklog validation benchmark.")
+    parser.add_argument(
+        "--rows",
+        nargs="+",
+        type=int,
+        default=[10000, 100000, 1000000],
+        help="Row counts to benchmark.",
+    )
+    args = parser.parse_args()
+
+    print(  # noqa: WPS421
+        f"{'rows':>10} {'per-row s':>10} {'batch s':>10} {'speedup':>8}",
+    )
+    for count in args.rows:
+        rows = generate_rows(count)
+        per_row_seconds = measure(validate_per_row, rows)
+        batch_seconds = measure(validate_batch, rows)
+        speedup = per_row_seconds / batch_seconds
+        print(  # noqa: WPS421
+            f"{count:>10} {per_row_seconds:>10.3f} {batch_seconds:>10.3f}",
+            f"{speedup:>7.2f}x",
+        )
+
+
+if __name__ == "__main__":
+    main()
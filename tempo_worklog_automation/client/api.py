@@ -0,0 +1,1941 @@
+"""Tempo worklog api client, upload and delete commands."""
+import logging
+import time
+from collections import Counter
+from contextlib import AsyncExitStack, ExitStack, closing
+from functools import partial
+from itertools import chain, islice
+from pathlib import Path
+from types import TracebackType
+from typing import (
+    Any,
+    Awaitable,
+    Callable,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    NamedTuple,
+    Optional,
+    Set,
+    Tuple,
+    Type,
+)
+
+import anyio
+import httpx
+from anyio.streams.memory import MemoryObjectReceiveStream
+
+from tempo_worklog_automation.client.cache import IssueIdCache, create_issue_id_cache
+from tempo_worklog_automation.client.coalesce import WorklogCoalescer
+from tempo_worklog_automation.client.exceptions import (
+    FailureThresholdError,
+    InvalidWorklogsError,
+    ScheduleConflictsError,
+    UnknownIssuesError,
+)
+from tempo_worklog_automation.client.existing import (
+    ExistingWorklogIndex,
+    date_range,
+    fetch_author_worklog_page,
+    iter_author_worklogs,
+)
+from tempo_worklog_automation.client.journal import (
+    PENDING,
+    UploadJournal,
+    open_upload_journal,
+)
+from tempo_worklog_automation.client.manifest import (
+    FairScheduler,
+    TempoAccount,
+    UploadManifest,
+    create_tempo_accounts,
+)
+from tempo_worklog_automation.client.models import WorklogModel, normalize_date
+from tempo_worklog_automation.client.pipeline import WorklogPipeline
+from tempo_worklog_automation.client.reconcile import (
+    ReconcilePlan,
+    SyncJournal,
+    load_worklogs_file,
+    plan_reconciliation,
+)
+from tempo_worklog_automation.client.results import (
+    FAILED,
+    RETRYABLE,
+    FileResultSink,
+    MemoryResultSink,
+    OutcomeRecorder,
+    ResultSink,
+    classify_outcome,
+)
+from tempo_worklog_automation.client.retry import RetryPolicy
+from tempo_worklog_automation.client.schedule import ScheduleChecker, ScheduleReport
+from tempo_worklog_automation.client.session import HttpSession, session_scope
+from tempo_worklog_automation.client.throttle import RateLimiter
+from tempo_worklog_automation.client.utils.readers import iter_worklog_rows
+from tempo_worklog_automation.client.utils.tail import CsvTail
+from tempo_worklog_automation.client.validation import RowError, validate_worklogs
+from tempo_worklog_automation.client.watch import load_watch_state
+from tempo_worklog_automation.settings import OverlapCheck, settings
+
+logger = logging.getLogger(settings.logger_name)
+
+# Errors failing the upload of a single file of a run, the other files carry on.
+UPLOAD_FILE_ERRORS = (
+    httpx.HTTPError,
+    OSError,
+    ScheduleConflictsError,
+    InvalidWorklogsError,
+    FailureThresholdError,
+)
+
+
+def tempo_headers() -> Dict[str, str]:
+    """
+    Return the headers of Tempo api requests.
+
+    :return: dictionary with key value pairs for each header in request.
+    """
+    return {
+        "Content-Type": "application/json",
+        "Authorization": f"Bearer {settings.tempo_oauth_token}",
+    }
+
+
+def _scan_issue_names(file_paths: List[Path]) -> Set[str]:
+    # Rows without a usable issue are left to the validation to report.
+    return {
+        row["issue"]
+        for file_path in file_paths
+        for row in iter_worklog_rows(file_path)
+        if isinstance(row.get("issue"), str) and row["issue"]
+    }
+
+
+class FileScan(NamedTuple):
+    """Distinct issue names and start dates of a worklogs file."""
+
+    issue_names: Set[str]
+    start_dates: Set[str]
+
+
+def scan_worklogs_file(file_path: Path, batch_size: int = 1000) -> FileScan:
+    """
+    Check a worklogs file before its upload and collect its issue names and dates.
+
+    The file is read once, a batch at a time. Each batch is validated, its valid
+    worklogs are fed to a ScheduleChecker and the issue names and start dates of
+    its rows are collected for the issue resolution and the existing worklogs.
+
+    :param file_path: Path object for the worklogs file.
+    :param batch_size: rows read per batch.
+    :raises InvalidWorklogsError: when some row is invalid and invalid rows are not
+        skipped.
+    :raises ScheduleConflictsError: when some conflicts are found and the overlap
+        check is set to fail.
+    :return: FileScan.
+    """
+    check_rows = not settings.skip_invalid_rows
+    check_schedule = settings.overlap_check != OverlapCheck.OFF
+    scan = FileScan(set(), set())
+    errors: List[RowError] = []
+    schedule = ScheduleChecker()
+    first_row = 1
+    with closing(iter_worklog_rows(file_path)) as rows:
+        for batch in iter(partial(_read_batch, rows, batch_size), []):
+            _collect_issue_names_and_dates(batch, scan)
+            if check_rows or check_schedule:
+                report = validate_worklogs(batch, first_row)
+                errors.extend(report.errors)
+                schedule.add_worklogs(zip(report.rows, report.worklogs))
+            first_row += len(batch)
+    if check_rows:
+        _reject_invalid_rows(file_path, errors)
+    if check_schedule:
+        _warn_schedule_conflicts(file_path, schedule.report())
+    return scan
+
+
+def _read_batch(rows: Iterator[Dict[str, Any]], batch_size: int) -> List[Any]:
+    return list(islice(rows, batch_size))
+
+
+def _collect_issue_names_and_dates(batch: List[Any], scan: FileScan) -> None:
+    # Rows without a usable issue or date are left to the validation to report.
+    for row in batch:
+        issue = row.get("issue")
+        if isinstance(issue, str) and issue:
+            scan.issue_names.add(issue)
+        start_date = row.get("start_date")
+        start_date = normalize_date(start_date) if isinstance(start_date, str) else None
+        if start_date:
+            scan.start_dates.add(start_date)
+
+
+def _reject_invalid_rows(file_path: Path, errors: List[RowError]) -> None:
+    for error in errors:
+        logger.error("%s:%s: %s: %s", file_path, error.row, error.field, error.message)
+    if errors:
+        raise InvalidWorklogsError(
+            str(file_path),
+            len({error.row for error in errors}),
+        )
+
+
+def _warn_schedule_conflicts(file_path: Path, report: ScheduleReport) -> None:
+    for line in report.format_lines():
+        logger.warning("%s:%s", file_path, line)
+    if report and settings.overlap_check == OverlapCheck.FAIL:
+        raise ScheduleConflictsError(
+            str(file_path),
+            len(report.overlaps),
+            len(report.overbooked_days),
+        )
+
+
+async def delete_worklog(  # noqa: WPS211
+    worklog_id: int,
+    client: httpx.AsyncClient,
+    url: str,
+    headers: Dict[str, str],
+    limiter: Optional[RateLimiter] = None,
+    on_response: Optional[Callable[[httpx.Response], None]] = None,
+    max_retries: Optional[int] = None,
+    backoff_factor: Optional[float] = None,
+) -> Optional[httpx.Response]:
+    """
+    Perform api call to delete worklog by id, retried according to the RetryPolicy.
+
+    :param worklog_id: specific worklog id to be deleted.
+    :param client: instance of httpx.AsyncClient.
+    :param url: url for Tempo api endpoint.
+    :param headers: dictionary with key value pairs for each header in request.
+    :param limiter: RateLimiter bounding the Tempo requests.
+    :param on_response: callable receiving every response, including retried ones.
+    :param max_retries: int for the number of retries, defaults to the settings.
+    :param backoff_factor: float for the exponential wait period, defaults to the
+        settings.
+    :raises httpx.HTTPStatusError: when request returns an http error code.
+    :raises httpx.HTTPError: when request fails.
+    :return: httpx.Response or None when all retries failed.
+    """
+    response = await RetryPolicy.from_settings(max_retries, backoff_factor).send(
+        partial(client.delete, url=f"{url}/{worklog_id}", headers=headers),
+        limiter or RateLimiter(),
+        on_response,
+    )
+    return response if response.is_success else None
+
+
+async def _delete_and_record(
+    recorder: OutcomeRecorder,
+    client: httpx.AsyncClient,
+    headers: Dict[str, str],
+    limiter: RateLimiter,
+) -> None:
+    try:
+        await delete_worklog(
+            recorder.worklog_id,  # type: ignore
+            client,
+            settings.tempo_base_api_url,
+            headers,
+            limiter,
+            recorder.on_response,
+        )
+    finally:
+        recorder.record()
+
+
+async def run_delete_worklog_requests(
+    worklog_ids: List[int],
+    session: Optional[HttpSession] = None,
+) -> List[int]:
+    """
+    Run api delete requests from list of worklog ids through a TempoClient.
+
+    :param worklog_ids: ints list of worklog ids to delete.
+    :param session: shared HttpSession, a new one is opened when None.
+    :return: list with the final http response code of each deletion.
+    """
+    async with TempoClient(session) as tempo_client:
+        return await tempo_client.delete_many(worklog_ids)
+
+
+def make_async_delete_worklog_requests(worklog_ids: List[int]) -> None:
+    """
+    Run api delete requests from list of worklog ids, run through anyio backend asyncio.
+
+    :param worklog_ids: ints list of worklog ids to delete.
+    :return: None.
+    """
+    logger.info("running make_async_delete_worklog_requests")
+
+    return anyio.run(run_delete_worklog_requests, worklog_ids, backend="asyncio")  # type: ignore # noqa: E501
+
+
+class _WorklogDeletion:
+    """
+    Delete streamed batches of worklog ids with a bounded number of workers.
+
+    Missing worklogs count as removed, other errors are counted as failures and do
+    not stop the remaining deletions. Progress is logged every
+    ``progress_interval`` seconds.
+    """
+
+    def __init__(
+        self,
+        session: HttpSession,
+        workers: int = 10,
+        progress_interval: float = 5,
+    ):
+        self.session = session
+        self.workers = workers
+        self.progress_interval = progress_interval
+        self.headers = tempo_headers()
+        self.limiter = RateLimiter.for_tempo()
+        self.summary: Dict[str, int] = {"deleted": 0, "missing": 0, "failed": 0}
+        self._started_at = time.monotonic()
+        self._logged_at = self._started_at
+
+    async def delete_batch(self, worklog_ids: List[int]) -> List[int]:
+        """
+        Delete a batch of worklogs, returning once every worker is done.
+
+        :param worklog_ids: ints list of worklog ids to delete.
+        :return: ids of the worklogs deleted or already missing.
+        """
+        removed: List[int] = []
+        send, receive = anyio.create_memory_object_stream(len(worklog_ids))
+        async with send:
+            for worklog_id in worklog_ids:
+                send.send_nowait(worklog_id)
+        async with anyio.create_task_group() as tg:
+            async with receive:
+                for _ in range(min(self.workers, len(worklog_ids))):
+                    tg.start_soon(self._delete_worker, receive.clone(), removed)
+        return removed
+
+    def log_progress(self) -> None:
+        """Log the deleted, missing and failed counts with the deletion rate."""
+        self._logged_at = time.monotonic()
+        elapsed = self._logged_at - self._started_at
+        removed = self.summary["deleted"] + self.summary["missing"]
+        logger.info(
+            "Deleted %s worklogs, %s already missing, %s failed (%.1f/s).",
+            self.summary["deleted"],
+            self.summary["missing"],
+            self.summary["failed"],
+            removed / elapsed if elapsed else 0,
+        )
+
+    async def _delete_worker(
+        self,
+        receive: MemoryObjectReceiveStream[int],
+        removed: List[int],
+    ) -> None:
+        async with receive:
+            async for worklog_id in receive:
+                outcome = await self._delete(worklog_id)
+                self.summary[outcome] += 1
+                if outcome != "failed":
+                    removed.append(worklog_id)
+                if time.monotonic() - self._logged_at >= self.progress_interval:
+                    self.log_progress()
+
+    async def _delete(self, worklog_id: int) -> str:
+        try:
+            response = await delete_worklog(
+                worklog_id,
+                self.session.tempo,
+                settings.tempo_base_api_url,
+                self.headers,
+                self.limiter,
+            )
+        except httpx.HTTPStatusError as exc:
+            if exc.response.status_code == 404:  # noqa: WPS432
+                return "missing"
+            logger.warning("Could not delete worklog %s: %r", worklog_id, exc)
+            return "failed"
+        except httpx.HTTPError as exc:
+            logger.warning("Could not delete worklog %s: %r", worklog_id, exc)
+            return "failed"
+        return "failed" if response is None else "deleted"
+
+
+async def run_delete_author_worklogs(
+    author_account_id: str,
+    date_from: str,
+    date_to: str,
+    session: Optional[HttpSession] = None,
+    page_size: int = 1000,
+) -> Dict[str, int]:
+    """
+    Delete every Tempo worklog of an author between two dates, a page at a time.
+
+    Each page is deleted before the next one is fetched. Deleted worklogs leave the
+    search results, so the next page starts after the worklogs that failed to be
+    deleted and memory use stays bounded by the page size.
+
+    :param author_account_id: author account id owning the worklogs.
+    :param date_from: first date as YYYY-MM-DD.
+    :param date_to: last date as YYYY-MM-DD, inclusive.
+    :param session: shared HttpSession, a new one is opened when None.
+    :param page_size: worklogs fetched and deleted per page.
+    :return: dictionary with the deleted, missing and failed counts.
+    """
+    async with session_scope(session) as http_session:
+        deletion = _WorklogDeletion(http_session, settings.delete_workers)
+        while True:  # noqa: WPS457
+            page = await fetch_author_worklog_page(
+                http_session.tempo,
+                deletion.headers,
+                author_account_id,
+                date_from,
+                date_to,
+                offset=deletion.summary["failed"],
+                limit=page_size,
+                limiter=deletion.limiter,
+            )
+            await deletion.delete_batch(
+                [remote_worklog["tempoWorklogId"] for remote_worklog in page],
+            )
+            if len(page) < page_size:
+                break
+    deletion.log_progress()
+    return deletion.summary
+
+
+def make_async_delete_author_worklogs(
+    author_account_id: str,
+    date_from: str,
+    date_to: str,
+) -> Dict[str, int]:
+    """
+    Delete every Tempo worklog of an author between two dates through anyio backend asyncio.
+
+    :param author_account_id: author account id owning the worklogs.
+    :param date_from: first date as YYYY-MM-DD.
+    :param date_to: last date as YYYY-MM-DD, inclusive.
+    :return: dictionary with the deleted, missing and failed counts.
+    """  # noqa: E501
+    logger.info("running make_async_delete_author_worklogs")
+
+    return anyio.run(  # type: ignore
+        run_delete_author_worklogs,  # type: ignore
+        author_account_id,
+        date_from,
+        date_to,
+        backend="asyncio",
+    )
+
+
+async def run_delete_uploaded_worklogs(
+    file_path: Path,
+    session: Optional[HttpSession] = None,
+    batch_size: int = 1000,
+) -> Dict[str, int]:
+    """
+    Delete the worklogs the upload journal records as created from a file.
+
+    Ids are read from the journal a batch at a time and deleted rows are marked in
+    the journal, so uploading the file again with --resume posts them again.
+
+    :param file_path: Path object for the uploaded file.
+    :param session: shared HttpSession, a new one is opened when None.
+    :param batch_size: worklog ids read and deleted per batch.
+    :return: dictionary with the deleted, missing and failed counts.
+    """
+    with open_upload_journal(file_path) as journal:
+        async with session_scope(session) as http_session:
+            deletion = _WorklogDeletion(http_session, settings.delete_workers)
+            for worklog_ids in journal.iter_created_worklog_ids(batch_size):
+                journal.mark_deleted(await deletion.delete_batch(worklog_ids))
+    deletion.log_progress()
+    return deletion.summary
+
+
+def make_async_delete_uploaded_worklogs(file_path: Path) -> Dict[str, int]:
+    """
+    Delete the worklogs uploaded from a file through anyio backend asyncio.
+
+    :param file_path: Path object for the uploaded file.
+    :return: dictionary with the deleted, missing and failed counts.
+    """
+    logger.info("running make_async_delete_uploaded_worklogs")
+
+    return anyio.run(  # type: ignore
+        run_delete_uploaded_worklogs,  # type: ignore
+        file_path,
+        backend="asyncio",
+    )
+
+
+async def get_issue_id(
+    issue_name: str,
+    limiter: Optional[RateLimiter] = None,
+    client: Optional[httpx.AsyncClient] = None,
+) -> int:
+    """
+    Run Jira api request request to get the issue / worklog internal id from the issue_name, run through anyio backend asyncio.
+
+    :param issue_name: string for the issue / worklog name.
+    :param limiter: RateLimiter bounding the Jira requests.
+    :param client: shared instance of httpx.AsyncClient, a new one is used when None.
+    :raises UnknownIssuesError: when the issue does not exist.
+    :raises HTTPStatusError: when all retries failed.
+    :return: Int with the issue / worklog internal id..
+    """  # noqa: E501
+    url = f"{settings.jira_base_api_url}/{issue_name}"
+    auth = (settings.jira_account_email, settings.jira_token)
+    headers = {"Content-Type": "application/json"}
+
+    if client is None:
+        async with httpx.AsyncClient() as new_client:
+            return await get_issue_id(issue_name, limiter, new_client)
+
+    try:
+        response = await RetryPolicy.from_settings().send(
+            partial(client.get, url=url, headers=headers, auth=auth),
+            limiter or RateLimiter(),
+        )
+    except httpx.HTTPStatusError as exc:
+        if exc.response.status_code == 404:  # noqa: WPS432
+            raise UnknownIssuesError([issue_name])
+        raise
+    response.raise_for_status()
+    return int(response.json()["id"])
+
+
+async def search_issue_ids(
+    issue_names: List[str],
+    client: httpx.AsyncClient,
+    limiter: Optional[RateLimiter] = None,
+) -> Dict[str, int]:
+    """
+    Run paginated Jira search requests resolving a chunk of issue names at once.
+
+    Results are keyed by the canonical issue key returned by Jira, which differs
+    from the requested name for moved or renamed issues.
+
+    :param issue_names: strings list of issue / worklog names.
+    :param client: instance of httpx.AsyncClient.
+    :param limiter: RateLimiter bounding the Jira requests.
+    :return: dictionary with the internal id of each issue name found.
+    """
+    auth = (settings.jira_account_email, settings.jira_token)
+    headers = {"Content-Type": "application/json"}
+    quoted_names = ", ".join(
+        f'"{_jql_escape(issue_name)}"' for issue_name in issue_names
+    )
+    params: Dict[str, Any] = {
+        "jql": f"key in ({quoted_names})",
+        "fields": "id",
+        "maxResults": len(issue_names),
+        # Unknown keys are reported as warnings instead of failing the whole query.
+        "validateQuery": "warn",
+    }
+    issue_ids: Dict[str, int] = {}
+    start_at = 0
+    limiter = limiter or RateLimiter()
+    retry_policy = RetryPolicy.from_settings()
+    while True:  # noqa: WPS457
+        response = await retry_policy.send(
+            partial(
+                client.get,
+                url=settings.jira_search_url,
+                headers=headers,
+                auth=auth,
+                params={**params, "startAt": start_at},
+            ),
+            limiter,
+        )
+        response.raise_for_status()
+        page = response.json()
+        for issue in page["issues"]:
+            issue_ids[issue["key"]] = int(issue["id"])
+        start_at += len(page["issues"])
+        if not page["issues"] or start_at >= page["total"]:
+            return issue_ids
+
+
+def _jql_escape(issue_name: str) -> str:
+    return issue_name.replace("\\", "\\\\").replace('"', '\\"')
+
+
+def _normalize_issue_name(issue_name: str) -> str:
+    return issue_name.strip().upper()
+
+
+async def resolve_issue_ids(
+    issue_names: Iterable[str],
+    client: httpx.AsyncClient,
+    limiter: Optional[RateLimiter] = None,
+    chunk_size: int = 100,
+) -> Dict[str, int]:
+    """
+    Resolve the distinct issue names to their internal ids with Jira search requests.
+
+    Names are searched in their normalised form. The names the search does not
+    return, such as the old keys of moved issues, are looked up one at a time with
+    get_issue_id(), which follows the moves.
+
+    :param issue_names: iterable of issue / worklog names, duplicates are allowed.
+    :param client: instance of httpx.AsyncClient.
+    :param limiter: RateLimiter bounding the Jira requests.
+    :param chunk_size: number of issue names per search request.
+    :raises UnknownIssuesError: when some issue names do not exist.
+    :return: dictionary with the internal id of every issue name, keyed by the
+        names as given.
+    """
+    distinct_names = sorted(set(issue_names))
+    found_ids = await _search_issue_chunks(
+        sorted({_normalize_issue_name(name) for name in distinct_names}),
+        client,
+        limiter,
+        chunk_size,
+    )
+    issue_ids = {
+        issue_name: found_ids[_normalize_issue_name(issue_name)]
+        for issue_name in distinct_names
+        if _normalize_issue_name(issue_name) in found_ids
+    }
+    unknown_names = await _get_missing_issue_ids(
+        [issue_name for issue_name in distinct_names if issue_name not in issue_ids],
+        issue_ids,
+        client,
+        limiter,
+    )
+    if unknown_names:
+        raise UnknownIssuesError(unknown_names)
+    return issue_ids
+
+
+async def _search_issue_chunks(
+    issue_names: List[str],
+    client: httpx.AsyncClient,
+    limiter: Optional[RateLimiter],
+    chunk_size: int,
+) -> Dict[str, int]:
+    found_ids: Dict[str, int] = {}
+
+    async def search_chunk(chunk: List[str]) -> None:
+        found_ids.update(await search_issue_ids(chunk, client, limiter))
+
+    async with anyio.create_task_group() as tg:
+        for index in range(0, len(issue_names), chunk_size):
+            tg.start_soon(search_chunk, issue_names[index : index + chunk_size])
+    return found_ids
+
+
+async def _get_missing_issue_ids(
+    issue_names: List[str],
+    issue_ids: Dict[str, int],
+    client: httpx.AsyncClient,
+    limiter: Optional[RateLimiter],
+) -> List[str]:
+    unknown_names: List[str] = []
+
+    async def get_missing(issue_name: str) -> None:
+        try:
+            issue_ids[issue_name] = await get_issue_id(issue_name, limiter, client)
+        except UnknownIssuesError:
+            unknown_names.append(issue_name)
+
+    async with anyio.create_task_group() as tg:
+        for issue_name in issue_names:
+            tg.start_soon(get_missing, issue_name)
+    return unknown_names
+
+
+async def parse_worklog(
+    worklog: WorklogModel,
+    author_account_id: str,
+    issue_id_cache: Optional[IssueIdCache] = None,
+    jira_limiter: Optional[RateLimiter] = None,
+    jira_client: Optional[httpx.AsyncClient] = None,
+) -> Dict[str, Any]:
+    """
+    Parse an worklog name string, get the corresponding issue / worklog internal id int.
+
+    :param worklog: worklog model to parse for internal id.
+    :param author_account_id: author account id to use when creating the worklog.
+    :param issue_id_cache: cache consulted before calling the Jira api.
+    :param jira_limiter: RateLimiter bounding the Jira requests.
+    :param jira_client: shared instance of httpx.AsyncClient for Jira requests.
+    :return: parsed_worklog: new object that contains int of internal issue id.
+    """
+    fetch_issue_id = partial(get_issue_id, limiter=jira_limiter, client=jira_client)
+    if issue_id_cache is None:
+        issue_id = await fetch_issue_id(worklog.issue)
+    else:
+        issue_id = await issue_id_cache.get_or_fetch(worklog.issue, fetch_issue_id)
+    return {
+        "authorAccountId": author_account_id,
+        "description": worklog.issue,
+        "issueId": issue_id,
+        "startDate": worklog.start_date,
+        "startTime": worklog.start_time,
+        "timeSpentSeconds": worklog.time_spent,
+    }
+
+
+async def create_worklog(  # noqa: WPS211
+    client: httpx.AsyncClient,
+    parsed_worklog: Dict[str, Any],
+    url: str,
+    headers: Dict[str, str],
+    limiter: Optional[RateLimiter] = None,
+    on_response: Optional[Callable[[httpx.Response], None]] = None,
+    max_retries: Optional[int] = None,
+    backoff_factor: Optional[float] = None,
+) -> Optional[httpx.Response]:
+    """
+    Perform api call to create a parsed worklog, retried according to the RetryPolicy.
+
+    :param client: instance of httpx.AsyncClient.
+    :param parsed_worklog: worklog payload returned by parse_worklog().
+    :param url: url for Tempo api endpoint.
+    :param headers: dictionary with key value pairs for each header in request.
+    :param limiter: RateLimiter bounding the Tempo requests.
+    :param on_response: callable receiving every response, including retried ones.
+    :param max_retries: int for the number of retries, defaults to the settings.
+    :param backoff_factor: float for the exponential wait period, defaults to the
+        settings.
+    :raises httpx.HTTPStatusError: when request returns an http error code.
+    :raises httpx.HTTPError: when request fails.
+    :return: httpx.Response: response code from post request for issue creation or None.
+    """
+    response = await RetryPolicy.from_settings(max_retries, backoff_factor).send(
+        partial(client.post, url=url, headers=headers, json=parsed_worklog),
+        limiter or RateLimiter(),
+        on_response,
+    )
+    return response if response.is_success else None
+
+
+async def update_worklog(  # noqa: WPS211
+    worklog_id: int,
+    client: httpx.AsyncClient,
+    parsed_worklog: Dict[str, Any],
+    url: str,
+    headers: Dict[str, str],
+    limiter: Optional[RateLimiter] = None,
+    on_response: Optional[Callable[[httpx.Response], None]] = None,
+    max_retries: Optional[int] = None,
+    backoff_factor: Optional[float] = None,
+) -> Optional[httpx.Response]:
+    """
+    Perform api call to rewrite a worklog by id, retried according to the RetryPolicy.
+
+    :param worklog_id: specific worklog id to be updated.
+    :param client: instance of httpx.AsyncClient.
+    :param parsed_worklog: worklog payload returned by parse_worklog().
+    :param url: url for Tempo api endpoint.
+    :param headers: dictionary with key value pairs for each header in request.
+    :param limiter: RateLimiter bounding the Tempo requests.
+    :param on_response: callable receiving every response, including retried ones.
+    :param max_retries: int for the number of retries, defaults to the settings.
+    :param backoff_factor: float for the exponential wait period, defaults to the
+        settings.
+    :raises httpx.HTTPStatusError: when request returns an http error code.
+    :raises httpx.HTTPError: when request fails.
+    :return: httpx.Response or None when all retries failed.
+    """
+    response = await RetryPolicy.from_settings(max_retries, backoff_factor).send(
+        partial(
+            client.put,
+            url=f"{url}/{worklog_id}",
+            headers=headers,
+            json=parsed_worklog,
+        ),
+        limiter or RateLimiter(),
+        on_response,
+    )
+    return response if response.is_success else None
+
+
+async def parse_and_create_worklog(  # noqa: WPS211
+    sink: ResultSink,
+    row: int,
+    client: httpx.AsyncClient,
+    worklog: WorklogModel,
+    url: str,
+    headers: Dict[str, str],
+    author_account_id: str,
+    issue_id_cache: Optional[IssueIdCache] = None,
+    tempo_limiter: Optional[RateLimiter] = None,
+    jira_limiter: Optional[RateLimiter] = None,
+    jira_client: Optional[httpx.AsyncClient] = None,
+    max_retries: Optional[int] = None,
+    backoff_factor: Optional[float] = None,
+) -> Optional[httpx.Response]:
+    """
+    Parse and create worklog.
+
+    Call parse_worklog() for the new worklog object to be created and perform a post
+    request to tempo API endpoint with the object and authentication headers.
+
+    :param sink: ResultSink receiving the outcome of the row.
+    :param row: row number or index of the worklog.
+    :param client: instance of httpx.AsyncClient.
+    :param worklog: instance worklog model inside list_of_worklogs.
+    :param url: url for Tempo api endpoint.
+    :param headers: dictionary with key value pairs for each header in request.
+    :param author_account_id: author account id to use when creating the worklog.
+    :param issue_id_cache: cache consulted before calling the Jira api.
+    :param tempo_limiter: RateLimiter bounding the Tempo requests.
+    :param jira_limiter: RateLimiter bounding the Jira requests.
+    :param jira_client: shared instance of httpx.AsyncClient for Jira requests.
+    :param max_retries: int for the number of retries, defaults to the settings.
+    :param backoff_factor: float for the exponential wait period, defaults to the
+        settings.
+    :return: httpx.Response: response code from post request for issue creation or None.
+    """
+    parsed_worklog = await parse_worklog(
+        worklog,
+        author_account_id,
+        issue_id_cache,
+        jira_limiter,
+        jira_client,
+    )
+
+    recorder = OutcomeRecorder(sink, row)
+    try:
+        response = await create_worklog(
+            client,
+            parsed_worklog,
+            url,
+            headers,
+            tempo_limiter,
+            recorder.on_response,
+            max_retries,
+            backoff_factor,
+        )
+    except httpx.HTTPError:
+        recorder.record()
+        raise
+    recorder.record(None if response is None else response.json()["tempoWorklogId"])
+    return response
+
+
+async def cache_issue_ids(
+    list_of_worklogs: Iterable[WorklogModel],
+    issue_id_cache: IssueIdCache,
+    client: httpx.AsyncClient,
+    limiter: Optional[RateLimiter] = None,
+) -> None:
+    """
+    Resolve every uncached issue of the worklogs in bulk and store it in the cache.
+
+    :param list_of_worklogs: iterable of WorklogModel objects.
+    :param issue_id_cache: cache receiving the resolved issue ids.
+    :param client: instance of httpx.AsyncClient.
+    :param limiter: RateLimiter bounding the Jira requests.
+    """
+    await cache_issue_names(
+        (worklog.issue for worklog in list_of_worklogs),
+        issue_id_cache,
+        client,
+        limiter,
+    )
+
+
+async def cache_issue_names(
+    issue_names: Iterable[str],
+    issue_id_cache: IssueIdCache,
+    client: httpx.AsyncClient,
+    limiter: Optional[RateLimiter] = None,
+) -> None:
+    """
+    Resolve every uncached issue name in bulk and store it in the cache.
+
+    Each distinct name counts as a cache hit or miss, the misses are the names
+    looked up in Jira.
+
+    :param issue_names: iterable of issue / worklog names, duplicates are allowed.
+    :param issue_id_cache: cache receiving the resolved issue ids.
+    :param client: instance of httpx.AsyncClient.
+    :param limiter: RateLimiter bounding the Jira requests.
+    """
+    issue_ids = await resolve_issue_ids(
+        [
+            issue_name
+            for issue_name in dict.fromkeys(issue_names)
+            if issue_id_cache.lookup(issue_name) is None
+        ],
+        client,
+        limiter,
+    )
+    for issue_name, issue_id in issue_ids.items():
+        issue_id_cache.set(issue_name, issue_id)
+
+
+class SharedUploadResources:
+    """
+    Issue id cache, Jira limiter and scheduler shared by the uploads of a run.
+
+    :param scheduler: FairScheduler interleaving the posts of several uploads.
+    """
+
+    def __init__(self, scheduler: Optional[FairScheduler] = None):
+        self.issue_id_cache = create_issue_id_cache()
+        self.jira_limiter = RateLimiter.for_jira()
+        self.scheduler = scheduler
+
+
+class _WorklogUpload:
+    """
+    State shared by the pipeline callbacks of a single upload.
+
+    When row failures are isolated, a failed row is recorded as failed or
+    retryable and the other rows carry on, the upload is only aborted once the
+    failure rate goes over ``max_failure_rate``.
+    """
+
+    def __init__(  # noqa: WPS211
+        self,
+        session: HttpSession,
+        sink: Optional[ResultSink],
+        journal: Optional[UploadJournal],
+        existing: Optional[ExistingWorklogIndex],
+        account: Optional[TempoAccount] = None,
+        shared: Optional[SharedUploadResources] = None,
+        coalescer: Optional[WorklogCoalescer] = None,
+    ):
+        self.session = session
+        self.sink = ResultSink() if sink is None else sink
+        self.journal = journal
+        self.existing = existing
+        self.coalescer = coalescer
+        self.account = account or TempoAccount.from_settings()
+        self.shared = shared or SharedUploadResources()
+        self.headers = self.account.headers
+        self.summary: Dict[str, Any] = {
+            "created": 0,
+            "duplicates": 0,
+            FAILED: 0,
+            RETRYABLE: 0,
+        }
+        self.issue_id_cache = self.shared.issue_id_cache
+        self.tempo_limiter = self.account.limiter
+        self.jira_limiter = self.shared.jira_limiter
+
+    async def resolve_batch(self, list_of_worklogs: List[WorklogModel]) -> None:
+        """
+        Resolve the uncached issues of a batch.
+
+        :param list_of_worklogs: list of WorklogModel objects.
+        """
+        await cache_issue_ids(
+            list_of_worklogs,
+            self.issue_id_cache,
+            self.session.jira,
+            self.jira_limiter,
+        )
+
+    async def post(self, index: int, worklog: WorklogModel) -> None:
+        """
+        Create a single worklog, waiting for the turn of the author when scheduled.
+
+        :param index: row number of the worklog.
+        :param worklog: WorklogModel to create.
+        """
+        scheduler = self.shared.scheduler
+        if scheduler is None:
+            await self._post(index, worklog)
+            return
+        async with scheduler.slot(self.account.author_account_id):
+            await self._post(index, worklog)
+
+    def select(
+        self,
+        batch: List[Tuple[int, WorklogModel]],
+        resume: bool = False,
+    ) -> List[Tuple[int, WorklogModel]]:
+        """
+        Select the rows of a validated batch to post, coalescing them when enabled.
+
+        :param batch: list of row numbers and worklogs, in input order.
+        :param resume: skip the rows the journal already records as created.
+        :return: list of row numbers and worklogs to post.
+        """
+        if self.journal is not None:
+            batch = self.journal.select(batch, resume=resume)
+        if self.coalescer is not None:
+            batch = self.coalescer(batch)
+        return batch
+
+    async def _post(self, index: int, worklog: WorklogModel) -> None:
+        """
+        Create a single worklog unless it already exists and record its outcome.
+
+        :param index: row number of the worklog.
+        :param worklog: WorklogModel to create.
+        :raises httpx.HTTPError: when the request fails and row failures are not
+            isolated.
+        """
+        rows = [index] if self.coalescer is None else self.coalescer.pop_rows(index)
+        recorder = OutcomeRecorder(self.sink, index, rows=rows)
+        self._journal_pending(rows)
+        try:
+            worklog_id, matched = await self._create(worklog, recorder)
+        except httpx.HTTPError as exc:
+            self._journal_failed(rows, repr(exc), recorder.status)
+            recorder.record()
+            if not settings.isolate_row_failures:
+                raise
+            logger.warning("Row %s failed: %r", index, exc)
+            self._count_failure(recorder.status)
+            return
+        if worklog_id is None:
+            self._journal_failed(rows, "All retries failed.", recorder.status)
+            recorder.record()
+            self._count_failure(recorder.status)
+        else:
+            self._journal_created(rows, worklog_id, matched)
+            recorder.record(worklog_id)
+
+    async def _create(
+        self,
+        worklog: WorklogModel,
+        recorder: OutcomeRecorder,
+    ) -> Tuple[Optional[int], bool]:
+        """
+        Create a worklog, or claim an identical existing one.
+
+        :param worklog: WorklogModel to create.
+        :param recorder: OutcomeRecorder of the row.
+        :return: worklog id or None when all retries failed, and whether it is an
+            existing worklog.
+        """
+        parsed_worklog = await parse_worklog(
+            worklog,
+            self.account.author_account_id,
+            self.issue_id_cache,
+            self.jira_limiter,
+            self.session.jira,
+        )
+        if self.existing is not None:
+            existing_id = self.existing.claim(parsed_worklog)
+            if existing_id is not None:
+                self.summary["duplicates"] += 1
+                return existing_id, True
+
+        response = await create_worklog(
+            self.session.tempo,
+            parsed_worklog,
+            settings.tempo_base_api_url,
+            self.headers,
+            self.tempo_limiter,
+            recorder.on_response,
+        )
+        if response is None:
+            return None, False
+        self.summary["created"] += 1
+        return response.json()["tempoWorklogId"], False
+
+    def _count_failure(self, status: int) -> None:
+        """
+        Count a failed row, aborting the upload over the failure threshold.
+
+        :param status: http response code of the last response, 0 when none.
+        :raises FailureThresholdError: when too many rows failed.
+        """
+        self.summary[classify_outcome(status, None)] += 1
+        failures = self.summary[FAILED] + self.summary[RETRYABLE]
+        posted = failures + self.summary["created"] + self.summary["duplicates"]
+        max_failure_rate = settings.max_failure_rate
+        if (
+            max_failure_rate > 0
+            and posted >= settings.failure_rate_min_rows
+            and failures > posted * max_failure_rate
+        ):
+            raise FailureThresholdError(failures, posted)
+
+    def _journal_pending(self, rows: List[int]) -> None:
+        if self.journal is not None:
+            for row_number in rows:
+                self.journal.record_pending(row_number)
+
+    def _journal_created(self, rows: List[int], worklog_id: int, matched: bool) -> None:
+        if self.journal is None:
+            return
+        for row_number in rows:
+            if matched:
+                self.journal.record_matched(row_number, worklog_id)
+            else:
+                self.journal.record_created(row_number, worklog_id)
+
+    def _journal_failed(self, rows: List[int], error: str, status: int) -> None:
+        if self.journal is None:
+            return
+        rejected = classify_outcome(status, None) == FAILED
+        for row_number in rows:
+            self.journal.record_failed(row_number, error, rejected)
+
+
+async def fetch_existing_worklogs(
+    session: HttpSession,
+    start_dates: Iterable[str],
+    account: Optional[TempoAccount] = None,
+) -> Optional[ExistingWorklogIndex]:
+    """
+    Fetch the author worklogs covering the date range of a batch.
+
+    :param session: shared HttpSession.
+    :param start_dates: iterable of the start dates of the batch.
+    :param account: TempoAccount of the author, defaults to the settings.
+    :return: ExistingWorklogIndex or None when there are no dates.
+    """
+    first_and_last_dates = date_range(start_dates)
+    if first_and_last_dates is None:
+        return None
+    account = account or TempoAccount.from_settings()
+    return await ExistingWorklogIndex.fetch(
+        session.tempo,
+        account.headers,
+        account.author_account_id,
+        *first_and_last_dates,
+        limiter=account.limiter,
+    )
+
+
+async def run_create_worklog_pipeline(  # noqa: WPS211
+    rows: Iterable[Any],
+    session: HttpSession,
+    sink: Optional[ResultSink] = None,
+    resolve_upfront: bool = False,
+    journal: Optional[UploadJournal] = None,
+    resume: bool = False,
+    existing: Optional[ExistingWorklogIndex] = None,
+    account: Optional[TempoAccount] = None,
+    shared: Optional[SharedUploadResources] = None,
+    first_row: int = 1,
+    coalesce: bool = False,
+) -> Dict[str, Any]:
+    """
+    Stream rows through validation, issue resolution and concurrent post requests.
+
+    :param rows: row dictionaries or WorklogModel objects, read lazily.
+    :param session: shared HttpSession.
+    :param sink: ResultSink receiving the outcome of each posted row.
+    :param resolve_upfront: resolve every issue before the first post, rows must be
+        a list of WorklogModel objects.
+    :param journal: UploadJournal recording the state of every row.
+    :param resume: skip the rows the journal already records as created.
+    :param existing: index of the remote worklogs, matching rows are not posted.
+    :param account: TempoAccount of the author, defaults to the settings.
+    :param shared: resources shared with concurrent uploads.
+    :param first_row: row number of the first row, used in journal and error reports.
+    :param coalesce: merge the back-to-back worklogs of an issue and day within each
+        validated batch before posting them, ignored with existing as merged
+        worklogs never match the existing ones.
+    :raises UnknownIssuesError: when some issue names do not exist.
+    :return: dictionary with the row, invalid, skipped, duplicate, created, failed
+        and retryable counts, and the coalesced count when coalescing.
+    """
+    if coalesce and existing is not None:
+        logger.warning("Existing worklogs are skipped, rows are not coalesced.")
+        coalesce = False
+    upload = _WorklogUpload(
+        session,
+        sink,
+        journal,
+        existing,
+        account,
+        shared,
+        WorklogCoalescer() if coalesce else None,
+    )
+    select = None
+    if journal is not None or coalesce:
+        select = partial(upload.select, resume=resume)
+    try:
+        if resolve_upfront:
+            await upload.resolve_batch(rows)  # type: ignore
+        pipeline = WorklogPipeline.from_settings(
+            upload.resolve_batch,
+            upload.post,
+            select,
+        )
+        upload.summary.update(await pipeline.run(rows, first_row))
+    finally:
+        upload.issue_id_cache.save()
+        logger.info("Issue id cache stats: %s", upload.issue_id_cache.stats())
+    upload.summary["skipped"] = 0 if journal is None else journal.skipped
+    if upload.coalescer is not None:
+        upload.summary["coalesced"] = upload.coalescer.merged
+    return upload.summary
+
+
+class TempoClient:
+    """
+    Async client keeping its connection pools, issue id cache and limiters alive.
+
+    Meant to be embedded in a long-running service: it runs in the caller's event
+    loop, and successive calls reuse the open connections, the resolved issue ids
+    and the rate limiter, retry budget and circuit breaker state instead of
+    rebuilding them. The ``run_*`` and ``make_async_*`` create and delete functions
+    open one for a single call.
+
+    :param session: HttpSession owned by the caller, a new one is opened on enter
+        and closed on exit when None.
+    :param account: TempoAccount of the author, defaults to the settings.
+    """
+
+    def __init__(
+        self,
+        session: Optional[HttpSession] = None,
+        account: Optional[TempoAccount] = None,
+    ):
+        self.account = account or TempoAccount.from_settings()
+        self.shared = SharedUploadResources()
+        self._given_session = session
+        self._session: Optional[HttpSession] = None
+        self._exit_stack = AsyncExitStack()
+
+    async def __aenter__(self) -> "TempoClient":
+        self._session = await self._exit_stack.enter_async_context(
+            session_scope(self._given_session),
+        )
+        return self
+
+    async def __aexit__(
+        self,
+        exc_type: Optional[Type[BaseException]],
+        exc_value: Optional[BaseException],
+        traceback: Optional[TracebackType],
+    ) -> None:
+        self.shared.issue_id_cache.save()
+        self._session = None
+        await self._exit_stack.aclose()
+
+    @property
+    def session(self) -> HttpSession:
+        """
+        HttpSession of the open client.
+
+        :raises RuntimeError: when the client is used outside of ``async with``.
+        :return: HttpSession.
+        """
+        if self._session is None:
+            raise RuntimeError("TempoClient must be opened with async with.")
+        return self._session
+
+    async def create_many(
+        self,
+        list_of_worklogs: List[WorklogModel],
+        skip_existing: bool = False,
+        coalesce: bool = False,
+    ) -> Dict[str, Any]:
+        """
+        Create worklogs through the upload pipeline.
+
+        :param list_of_worklogs: list of WorklogModel objects.
+        :param skip_existing: skip the worklogs already present in Tempo.
+        :param coalesce: merge the back-to-back worklogs of an issue and day.
+        :raises UnknownIssuesError: when some issue names do not exist.
+        :return: dictionary with the final http response code of each row, the
+            created worklog ids and the number of retries.
+        """
+        outcomes = MemoryResultSink()
+        existing = None
+        if skip_existing:
+            existing = await fetch_existing_worklogs(
+                self.session,
+                (worklog.start_date for worklog in list_of_worklogs),
+                self.account,
+            )
+        await run_create_worklog_pipeline(
+            list_of_worklogs,
+            self.session,
+            outcomes,
+            resolve_upfront=True,
+            existing=existing,
+            account=self.account,
+            shared=self.shared,
+            coalesce=coalesce,
+        )
+        return {
+            "status_codes": outcomes.status_codes,
+            "worklog_ids": outcomes.worklog_ids,
+            "retries": outcomes.retries,
+        }
+
+    async def delete_many(self, worklog_ids: List[int]) -> List[int]:
+        """
+        Delete worklogs by id concurrently.
+
+        Outcomes are kept in a MemoryResultSink instead of the responses.
+
+        :param worklog_ids: ints list of worklog ids to delete.
+        :return: list with the final http response code of each deletion.
+        """
+        outcomes = MemoryResultSink()
+        async with anyio.create_task_group() as tg:
+            for index, worklog_id in enumerate(worklog_ids):
+                tg.start_soon(
+                    _delete_and_record,
+                    OutcomeRecorder(outcomes, index, worklog_id),
+                    self.session.tempo,
+                    self.account.headers,
+                    self.account.limiter,
+                )
+        return outcomes.status_codes
+
+    async def resolve_issues(self, issue_names: Iterable[str]) -> Dict[str, int]:
+        """
+        Resolve issue names to their internal ids, searching only the uncached ones.
+
+        :param issue_names: iterable of issue / worklog names, duplicates are allowed.
+        :raises UnknownIssuesError: when some issue names do not exist.
+        :return: dictionary with the internal id of every issue name.
+        """
+        issue_id_cache = self.shared.issue_id_cache
+        distinct_names = set(issue_names)
+        issue_ids: Dict[str, int] = {}
+        for issue_name in distinct_names:
+            issue_id = issue_id_cache.get(issue_name)
+            if issue_id is not None:
+                issue_ids[issue_name] = issue_id
+        unknown_names = distinct_names - issue_ids.keys()
+        if unknown_names:
+            resolved = await resolve_issue_ids(
+                unknown_names,
+                self.session.jira,
+                self.shared.jira_limiter,
+            )
+            for issue_name, issue_id in resolved.items():
+                issue_id_cache.set(issue_name, issue_id)
+            issue_ids.update(resolved)
+        return issue_ids
+
+    async def plan_sync(
+        self,
+        worklogs: List[Tuple[int, WorklogModel]],
+        owned_worklogs: Dict[int, Optional[str]],
+    ) -> ReconcilePlan:
+        """
+        Plan the requests turning the remote worklogs owned by the rows into the rows.
+
+        The remote worklogs are fetched over the dates of the rows and of the owned
+        worklogs, so removing the first or last day of a file still deletes its
+        worklogs. Only owned worklogs are updated or deleted, the other ones are
+        left alone.
+
+        :param worklogs: list of row numbers and worklogs.
+        :param owned_worklogs: tempoWorklogId and start date of the worklogs uploaded
+            from the rows, as returned by UploadJournal.created_worklogs().
+        :raises UnknownIssuesError: when some issue names do not exist.
+        :return: ReconcilePlan.
+        """
+        window = date_range(
+            chain(
+                (worklog.start_date for _, worklog in worklogs),
+                (date for date in owned_worklogs.values() if date is not None),
+            ),
+        )
+        if window is None:
+            return ReconcilePlan([], [], [], [])
+        await self.resolve_issues(worklog.issue for _, worklog in worklogs)
+        local_worklogs = [
+            (
+                row_number,
+                await parse_worklog(
+                    worklog,
+                    self.account.author_account_id,
+                    self.shared.issue_id_cache,
+                ),
+            )
+            for row_number, worklog in worklogs
+        ]
+        remote_worklogs = [
+            remote_worklog
+            async for remote_worklog in iter_author_worklogs(
+                self.session.tempo,
+                self.account.headers,
+                self.account.author_account_id,
+                *window,
+                limiter=self.account.limiter,
+            )
+        ]
+        return plan_reconciliation(local_worklogs, remote_worklogs, owned_worklogs)
+
+    async def apply_plan(
+        self,
+        plan: ReconcilePlan,
+        journal: Optional[UploadJournal] = None,
+    ) -> Dict[str, int]:
+        """
+        Send the creates, updates and deletes of a plan concurrently.
+
+        A failed request is logged and counted, the other ones carry on.
+
+        :param plan: ReconcilePlan from plan_sync().
+        :param journal: UploadJournal the rows were selected from, records the
+            worklogs each row owns after the requests that succeeded.
+        :return: dictionary with the created, updated, deleted, unchanged and failed
+            counts.
+        """
+        summary = {"created": 0, "updated": 0, "deleted": 0, "failed": 0}
+        url = settings.tempo_base_api_url
+        client = self.session.tempo
+        headers = self.account.headers
+        limiter = self.account.limiter
+        sync_journal = SyncJournal(journal)
+        sync_journal.record_unchanged(plan.unchanged)
+        async with anyio.create_task_group() as tg:
+            for row_number, payload in plan.creates:
+                tg.start_soon(
+                    self._apply,
+                    summary,
+                    "created",
+                    f"Row {row_number}",
+                    partial(create_worklog, client, payload, url, headers, limiter),
+                    partial(sync_journal.record_created, row_number),
+                )
+            for update in plan.updates:
+                tg.start_soon(
+                    self._apply,
+                    summary,
+                    "updated",
+                    f"Row {update.row}",
+                    partial(
+                        update_worklog,
+                        update.worklog_id,
+                        client,
+                        update.payload,
+                        url,
+                        headers,
+                        limiter,
+                    ),
+                    partial(sync_journal.record_updated, update),
+                )
+            for worklog_id in plan.deletes:
+                tg.start_soon(
+                    self._apply,
+                    summary,
+                    "deleted",
+                    f"Worklog {worklog_id}",
+                    partial(delete_worklog, worklog_id, client, url, headers, limiter),
+                    partial(sync_journal.record_deleted, worklog_id),
+                )
+        summary["unchanged"] = len(plan.unchanged)
+        return summary
+
+    async def _apply(  # noqa: WPS211
+        self,
+        summary: Dict[str, int],
+        outcome: str,
+        target: str,
+        send: Callable[[], Awaitable[Optional[httpx.Response]]],
+        on_success: Callable[[httpx.Response], None],
+    ) -> None:
+        try:
+            response = await send()
+        except httpx.HTTPError as exc:
+            logger.warning("%s failed: %r", target, exc)
+            response = None
+        summary["failed" if response is None else outcome] += 1
+        if response is not None:
+            on_success(response)
+
+
+async def run_create_worklog_requests(
+    list_of_worklogs: List[WorklogModel],
+    session: Optional[HttpSession] = None,
+    skip_existing: bool = False,
+    coalesce: bool = False,
+) -> Dict[str, Any]:
+    """
+    Run api post requests from list of WorklogsModels through a TempoClient.
+
+    :param list_of_worklogs: list of WorklogModel objects.
+    :param session: shared HttpSession, a new one is opened when None.
+    :param skip_existing: skip the worklogs already present in Tempo.
+    :param coalesce: merge the back-to-back worklogs of an issue and day.
+    :raises UnknownIssuesError: when some issue names do not exist.
+    :return: dictionary with the final http response code of each row, the created
+        worklog ids and the number of retries.
+    """
+    async with TempoClient(session) as tempo_client:
+        return await tempo_client.create_many(
+            list_of_worklogs,
+            skip_existing,
+            coalesce,
+        )
+
+
+def make_async_create_worklog_requests(list_of_worklogs: List[WorklogModel]) -> None:
+    """
+    Run api post requests from list of WorklogsModels through anyio backend asyncio.
+
+    :param list_of_worklogs: list of WorklogsModels to use in requests.
+    :return: None.
+    """
+    logger.info("running make_async_create_worklog_requests")
+
+    return anyio.run(  # type: ignore
+        run_create_worklog_requests,  # type: ignore
+        list_of_worklogs,
+        backend="asyncio",
+    )
+
+
+async def run_sync_worklogs_file(
+    file_path: Path,
+    session: Optional[HttpSession] = None,
+    account: Optional[TempoAccount] = None,
+) -> Dict[str, int]:
+    """
+    Make the remote worklogs of the author match a worklogs file with minimal requests.
+
+    The remote worklogs within the date window of the file are matched to its rows,
+    changed rows are updated, new rows created and removed rows deleted. Only the
+    worklogs the upload journal records as uploaded from the file are updated or
+    deleted, without the journal rows are only created.
+
+    :param file_path: Path object for the worklogs file.
+    :param session: shared HttpSession, a new one is opened when None.
+    :param account: TempoAccount of the author, defaults to the settings.
+    :raises InvalidWorklogsError: when some row of the file is invalid.
+    :raises UnknownIssuesError: when some issue names do not exist.
+    :return: dictionary with the created, updated, deleted, unchanged and failed
+        counts.
+    """
+    worklogs = await anyio.to_thread.run_sync(load_worklogs_file, file_path)
+    async with AsyncExitStack() as stack:
+        tempo_client = await stack.enter_async_context(TempoClient(session, account))
+        journal = None
+        owned_worklogs: Dict[int, Optional[str]] = {}
+        if settings.upload_journal:
+            journal = stack.enter_context(open_upload_journal(file_path))
+            owned_worklogs = journal.created_worklogs()
+            journal.select(worklogs)
+        else:
+            logger.warning(
+                "Without the upload journal no worklog is updated or deleted.",
+            )
+        plan = await tempo_client.plan_sync(worklogs, owned_worklogs)
+        logger.info("Sync plan of %s: %s.", file_path, plan.summary())
+        return await tempo_client.apply_plan(plan, journal)
+
+
+def make_async_sync_worklogs_file(file_path: Path) -> Dict[str, int]:
+    """
+    Make the remote worklogs match a worklogs file through anyio backend asyncio.
+
+    :param file_path: Path object for the worklogs file.
+    :return: dictionary with the created, updated, deleted, unchanged and failed
+        counts.
+    """
+    logger.info("running make_async_sync_worklogs_file")
+
+    return anyio.run(  # type: ignore
+        run_sync_worklogs_file,  # type: ignore
+        file_path,
+        backend="asyncio",
+    )
+
+
+async def run_upload_worklogs_file(  # noqa: WPS211
+    file_path: Path,
+    resume: bool = False,
+    skip_existing: bool = False,
+    session: Optional[HttpSession] = None,
+    account: Optional[TempoAccount] = None,
+    shared: Optional[SharedUploadResources] = None,
+    sink: Optional[ResultSink] = None,
+    coalesce: bool = False,
+) -> Dict[str, Any]:
+    """
+    Stream a worklogs file to the upload pipeline, pre-warming connections.
+
+    Rows are posted while the file is still being read, so memory use stays flat
+    regardless of the file size. Every row is recorded in the upload journal when
+    it is enabled. The distinct issue names of the file are resolved before the
+    first post, so an unknown issue aborts the upload before anything is created.
+    The file is read once beforehand by scan_worklogs_file() for its issue names,
+    its dates, its invalid rows unless ``skip_invalid_rows`` is enabled, and its
+    overlapping worklogs and days over 24 hours unless the overlap check is off.
+
+    :param file_path: Path object for the csv file.
+    :param resume: skip the rows the journal already records as created.
+    :param skip_existing: skip the worklogs already present in Tempo on the dates
+        of the file.
+    :param session: shared HttpSession, a new pre-warmed one is opened when None.
+    :param account: TempoAccount of the author, defaults to the settings.
+    :param shared: resources shared with concurrent uploads.
+    :param sink: ResultSink receiving the outcome of each posted row.
+    :param coalesce: merge the back-to-back worklogs of an issue and day.
+    :raises ScheduleConflictsError: when the file books overlapping worklogs or
+        more than 24 hours a day and the overlap check is set to fail.
+    :raises InvalidWorklogsError: when some row is invalid and invalid rows are not
+        skipped.
+    :raises UnknownIssuesError: when some issue names do not exist.
+    :raises FailureThresholdError: when more rows failed than the failure rate allows.
+    :return: dictionary with the row, invalid, skipped, duplicate, created, failed
+        and retryable counts.
+    """
+    scan = await anyio.to_thread.run_sync(scan_worklogs_file, file_path)
+    shared = shared or SharedUploadResources()
+    async with AsyncExitStack() as stack:
+        journal = None
+        if settings.upload_journal:
+            journal = stack.enter_context(open_upload_journal(file_path))
+            interrupted = journal.count(PENDING)
+            if resume and interrupted:
+                logger.warning(
+                    "%s rows were interrupted mid-request and will be posted again, "
+                    + "check them for duplicates.",
+                    interrupted,
+                )
+        async with anyio.create_task_group() as tg:
+            if session is None:
+                session = await stack.enter_async_context(HttpSession.from_settings())
+                tg.start_soon(session.prewarm)
+            await cache_issue_names(
+                scan.issue_names,
+                shared.issue_id_cache,
+                session.jira,
+                shared.jira_limiter,
+            )
+            existing = None
+            if skip_existing:
+                existing = await fetch_existing_worklogs(
+                    session,
+                    scan.start_dates,
+                    account,
+                )
+            rows = stack.enter_context(closing(iter_worklog_rows(file_path)))
+            return await run_create_worklog_pipeline(
+                rows,
+                session,
+                sink,
+                journal=journal,
+                resume=resume,
+                existing=existing,
+                account=account,
+                shared=shared,
+                coalesce=coalesce,
+            )
+
+
+def make_async_upload_worklogs_file(
+    file_path: Path,
+    resume: bool = False,
+    skip_existing: bool = False,
+    receipt_path: Optional[Path] = None,
+    coalesce: bool = False,
+) -> Dict[str, Any]:
+    """
+    Stream a worklogs csv file to the upload pipeline through anyio backend asyncio.
+
+    :param file_path: Path object for the csv file.
+    :param resume: skip the rows the journal already records as created.
+    :param skip_existing: skip the worklogs already present in Tempo.
+    :param receipt_path: file receiving the outcome of each posted row, CSV for
+        .csv files and JSON Lines otherwise.
+    :param coalesce: merge the back-to-back worklogs of an issue and day.
+    :return: dictionary with the row, invalid, skipped, duplicate, created, failed
+        and retryable counts.
+    """
+    logger.info("running make_async_upload_worklogs_file")
+
+    with ExitStack() as stack:
+        sink = None
+        if receipt_path is not None:
+            sink = stack.enter_context(FileResultSink(receipt_path))
+        return anyio.run(  # type: ignore
+            partial(
+                run_upload_worklogs_file,
+                file_path,
+                resume,
+                skip_existing,
+                sink=sink,
+                coalesce=coalesce,
+            ),
+            backend="asyncio",
+        )
+
+
+async def run_upload_manifest(
+    manifest: UploadManifest,
+    resume: bool = False,
+    skip_existing: bool = False,
+    coalesce: bool = False,
+) -> Dict[str, Any]:
+    """
+    Upload the files of every manifest author concurrently in one event loop.
+
+    Authors share one pre-warmed HttpSession, issue id cache and Jira limiter, each
+    Tempo token gets its own RateLimiter. Posts take turns through a FairScheduler
+    with one slot per pooled connection, so a large file cannot starve the others.
+    An author failing with an http, file or schedule error does not stop the others.
+
+    :param manifest: UploadManifest mapping authors to tokens and files.
+    :param resume: skip the rows the journal already records as created.
+    :param skip_existing: skip the worklogs already present in Tempo.
+    :param coalesce: merge the back-to-back worklogs of an issue and day.
+    :return: dictionary with the author and upload counts or error of each file.
+    """
+    summaries: Dict[str, Any] = {}
+    shared = SharedUploadResources(FairScheduler(settings.http_max_connections))
+
+    async def upload_author(author_file: Path, account: TempoAccount) -> None:
+        try:
+            summary = await run_upload_worklogs_file(
+                author_file,
+                resume,
+                skip_existing,
+                session,
+                account,
+                shared,
+                coalesce=coalesce,
+            )
+        except UPLOAD_FILE_ERRORS as exc:
+            logger.error("Upload of %s failed: %r", author_file, exc)
+            summary = {"error": str(exc)}
+        summaries[str(author_file)] = {"author": account.author_account_id, **summary}
+
+    async with HttpSession.from_settings() as session:
+        async with anyio.create_task_group() as tg:
+            tg.start_soon(session.prewarm)
+            accounts = create_tempo_accounts(manifest)
+            for author, account in zip(manifest.authors, accounts):
+                tg.start_soon(upload_author, author.file_path, account)
+    return summaries
+
+
+def make_async_upload_manifest(
+    manifest: UploadManifest,
+    resume: bool = False,
+    skip_existing: bool = False,
+    coalesce: bool = False,
+) -> Dict[str, Any]:
+    """
+    Upload the files of every manifest author through anyio backend asyncio.
+
+    :param manifest: UploadManifest mapping authors to tokens and files.
+    :param resume: skip the rows the journal already records as created.
+    :param skip_existing: skip the worklogs already present in Tempo.
+    :param coalesce: merge the back-to-back worklogs of an issue and day.
+    :return: dictionary with the author and upload counts of each file.
+    """
+    logger.info("running make_async_upload_manifest")
+
+    return anyio.run(  # type: ignore
+        run_upload_manifest,  # type: ignore
+        manifest,
+        resume,
+        skip_existing,
+        coalesce,
+        backend="asyncio",
+    )
+
+
+async def _upload_tail_rows(
+    rows: List[Dict[str, str]],
+    first_row: int,
+    source: str,
+    session: HttpSession,
+    shared: SharedUploadResources,
+) -> Dict[str, Any]:
+    with ExitStack() as stack:
+        journal = None
+        if settings.upload_journal:
+            journal = stack.enter_context(
+                UploadJournal(
+                    settings.upload_journal_path,
+                    source,
+                    keyed_by_row=True,
+                    skip_rejected=True,
+                ),
+            )
+        return await run_create_worklog_pipeline(
+            rows,
+            session,
+            journal=journal,
+            resume=True,
+            shared=shared,
+            first_row=first_row,
+        )
+
+
+async def run_watch_worklogs_file(
+    file_path: Path,
+    poll_interval: Optional[float] = None,
+    polls: Optional[int] = None,
+) -> Dict[str, int]:
+    """
+    Follow a csv file and upload the rows appended to it until cancelled.
+
+    Only the bytes after the last checkpoint are read, so each poll costs as much as
+    the new rows regardless of the file size. The checkpoint is saved once no row
+    read before it can still succeed: rows left retryable are read and posted again
+    after poll_interval, rows the api rejected are journaled and not posted again.
+    Rows are journaled by row number per file, rows posted before a crash but after
+    the last checkpoint are not posted again.
+
+    :param file_path: Path object for the csv file.
+    :param poll_interval: seconds between two reads finding no new rows, defaults
+        to the settings.
+    :param polls: number of reads before returning, None follows the file forever.
+    :return: dictionary with the row, invalid, skipped, duplicate, created, failed
+        and retryable counts of every read.
+    """
+    if poll_interval is None:
+        poll_interval = settings.watch_poll_interval
+    watch_state = load_watch_state()
+    totals: Counter[str] = Counter()
+    shared = SharedUploadResources()
+    async with HttpSession.from_settings() as session:
+        with CsvTail(file_path, watch_state.get(file_path)) as tail:
+            logger.info(
+                "Watching %s from row %s.",
+                file_path,
+                tail.checkpoint.row_number,
+            )
+            read_count = 0
+            while polls is None or read_count < polls:
+                read_count += 1
+                first_row, rows = await anyio.to_thread.run_sync(tail.read_rows)
+                if not rows:
+                    await anyio.sleep(poll_interval)
+                    continue
+                summary = await _upload_tail_rows(
+                    rows,
+                    first_row,
+                    f"{file_path.resolve()}#{tail.identity}",
+                    session,
+                    shared,
+                )
+                totals.update(summary)
+                logger.info(
+                    "Uploaded rows %s to %s: %s",
+                    first_row,
+                    tail.checkpoint.row_number,
+                    summary,
+                )
+                if _retry_tail_rows(tail, summary):
+                    await anyio.sleep(poll_interval)
+                    continue
+                watch_state.save(file_path, tail.checkpoint)
+    return dict(totals)
+
+
+def _retry_tail_rows(tail: CsvTail, summary: Dict[str, Any]) -> bool:
+    retryable = summary[RETRYABLE]
+    if not retryable:
+        return False
+    if not settings.upload_journal:
+        logger.warning(
+            "%s watched rows were not created and are not posted again "
+            + "without the upload journal.",
+            retryable,
+        )
+        return False
+    # The journal skips the created and rejected rows, only the retryable are posted.
+    logger.warning("%s watched rows may succeed later, reading them again.", retryable)
+    tail.unread()
+    return True
+
+
+def make_async_watch_worklogs_file(file_path: Path) -> Dict[str, int]:
+    """
+    Follow a csv file and upload the rows appended to it through anyio backend asyncio.
+
+    :param file_path: Path object for the csv file.
+    :return: dictionary with the upload counts.
+    """
+    logger.info("running make_async_watch_worklogs_file")
+
+    return anyio.run(  # type: ignore
+        run_watch_worklogs_file,  # type: ignore
+        file_path,
+        backend="asyncio",
+    )
+
+
+async def run_upload_worklog_files(
+    file_paths: List[Path],
+    resume: bool = False,
+    skip_existing: bool = False,
+    coalesce: bool = False,
+) -> Dict[str, Any]:
+    """
+    Upload many worklogs csv files concurrently in one event loop.
+
+    Files share one pre-warmed HttpSession, one Tempo RateLimiter acting as global
+    request budget and one issue id cache. The issue names of every file are
+    resolved up front in bulk, an unknown issue stops the run before any post.
+    At most ``batch_max_files`` files are uploaded at a time, a file failing with
+    an http, file or schedule error does not stop the others.
+
+    :param file_paths: list of Path objects for the csv files.
+    :param resume: skip the rows the journal already records as created.
+    :param skip_existing: skip the worklogs already present in Tempo.
+    :param coalesce: merge the back-to-back worklogs of an issue and day.
+    :raises UnknownIssuesError: when some issue names do not exist.
+    :return: dictionary with the upload counts or the error of each file.
+    """
+    summaries: Dict[str, Any] = {}
+    shared = SharedUploadResources()
+    account = TempoAccount.from_settings()
+    file_limiter = anyio.CapacityLimiter(settings.batch_max_files)
+
+    async def upload_file(file_path: Path) -> None:
+        async with file_limiter:
+            try:
+                summaries[str(file_path)] = await run_upload_worklogs_file(
+                    file_path,
+                    resume,
+                    skip_existing,
+                    session,
+                    account,
+                    shared,
+                    coalesce=coalesce,
+                )
+            except UPLOAD_FILE_ERRORS as exc:
+                logger.error("Upload of %s failed: %r", file_path, exc)
+                summaries[str(file_path)] = {"error": repr(exc)}
+
+    async with HttpSession.from_settings() as session:
+        async with anyio.create_task_group() as tg:
+            tg.start_soon(session.prewarm)
+            issue_names = await anyio.to_thread.run_sync(_scan_issue_names, file_paths)
+            await cache_issue_names(
+                issue_names,
+                shared.issue_id_cache,
+                session.jira,
+                shared.jira_limiter,
+            )
+            for file_path in file_paths:
+                tg.start_soon(upload_file, file_path)
+    return {str(file_path): summaries[str(file_path)] for file_path in file_paths}
+
+
+def make_async_upload_worklog_files(
+    file_paths: List[Path],
+    resume: bool = False,
+    skip_existing: bool = False,
+    coalesce: bool = False,
+) -> Dict[str, Any]:
+    """
+    Upload many worklogs csv files concurrently through anyio backend asyncio.
+
+    :param file_paths: list of Path objects for the csv files.
+    :param resume: skip the rows the journal already records as created.
+    :param skip_existing: skip the worklogs already present in Tempo.
+    :param coalesce: merge the back-to-back worklogs of an issue and day.
+    :return: dictionary with the upload counts or the error of each file.
+    """
+    logger.info("running make_async_upload_worklog_files")
+
+    return anyio.run(  # type: ignore
+        run_upload_worklog_files,  # type: ignore
+        file_paths,
+        resume,
+        skip_existing,
+        coalesce,
+        backend="asyncio",
+    )
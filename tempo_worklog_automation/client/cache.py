@@ -0,0 +1,191 @@
+"""Two layer issue key to issue id cache."""
+import json
+import logging
+import os
+import time
+from pathlib import Path
+from typing import Awaitable, Callable, Dict, Optional, Tuple
+
+import anyio
+
+from tempo_worklog_automation.settings import settings
+
+logger = logging.getLogger(settings.logger_name)
+
+CacheEntry = Tuple[int, float]
+
+
+class IssueIdCache:
+    """
+    Cache Jira issue ids by issue key.
+
+    The first layer deduplicates lookups inside the running process, concurrent
+    tasks asking for the same key wait on a single in-flight request. The second
+    layer is a JSON file persisted between runs, entries expire after ``ttl``
+    seconds and the oldest ones are evicted once ``max_entries`` is reached.
+
+    :param path: JSON file used as on-disk store, None keeps the cache in memory.
+    :param ttl: seconds an entry stays valid.
+    :param max_entries: maximum number of entries kept.
+    """
+
+    def __init__(
+        self,
+        path: Optional[Path] = None,
+        ttl: float = 604800,
+        max_entries: int = 10000,
+    ):
+        self.path = path
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self.coalesced = 0
+        self._entries: Dict[str, CacheEntry] = {}
+        self._in_flight: Dict[str, anyio.Event] = {}
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, issue_name: str) -> Optional[int]:
+        """
+        Return the cached issue id, does not touch the hit or miss counters.
+
+        :param issue_name: string for the issue / worklog name.
+        :return: issue id or None when missing or expired.
+        """
+        entry = self._entries.get(issue_name)
+        if entry is None:
+            return None
+        issue_id, stored_at = entry
+        if self._is_expired(stored_at):
+            self._entries.pop(issue_name, None)
+            return None
+        return issue_id
+
+    def lookup(self, issue_name: str) -> Optional[int]:
+        """
+        Return the cached issue id, counting a hit or a miss.
+
+        :param issue_name: string for the issue / worklog name.
+        :return: issue id or None when missing or expired.
+        """
+        issue_id = self.get(issue_name)
+        if issue_id is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return issue_id
+
+    def set(self, issue_name: str, issue_id: int) -> None:  # noqa: WPS125
+        """
+        Store an issue id, evict the oldest entries when the cache is full.
+
+        :param issue_name: string for the issue / worklog name.
+        :param issue_id: Jira internal issue id.
+        """
+        self._entries.pop(issue_name, None)
+        self._entries[issue_name] = (issue_id, time.time())
+        self._evict()
+
+    async def get_or_fetch(
+        self,
+        issue_name: str,
+        fetch: Callable[[str], Awaitable[int]],
+    ) -> int:
+        """
+        Return the cached issue id or resolve it once with fetch.
+
+        :param issue_name: string for the issue / worklog name.
+        :param fetch: coroutine function resolving an issue name to its id.
+        :return: Jira internal issue id.
+        """
+        while True:  # noqa: WPS457
+            issue_id = self.get(issue_name)
+            if issue_id is not None:
+                self.hits += 1
+                return issue_id
+
+            in_flight = self._in_flight.get(issue_name)
+            if in_flight is None:
+                break
+            # Another task is already resolving this key, wait for its result and
+            # look it up again, if that lookup failed this task retries it.
+            self.coalesced += 1
+            await in_flight.wait()
+
+        self.misses += 1
+        event = anyio.Event()
+        self._in_flight[issue_name] = event
+        try:
+            issue_id = await fetch(issue_name)
+            self.set(issue_name, issue_id)
+        finally:
+            del self._in_flight[issue_name]  # noqa: WPS420
+            event.set()
+        return issue_id
+
+    def load(self) -> None:
+        """Load non expired entries from the on-disk store if it exists."""
+        if self.path is None or not self.path.exists():
+            return
+        try:
+            with open(self.path, "r") as cache_file:
+                stored_entries = json.load(cache_file)["entries"]
+        except (OSError, ValueError, KeyError, TypeError):
+            logger.warning("Ignoring unreadable issue id cache %s.", self.path)
+            return
+
+        by_age = sorted(stored_entries.items(), key=lambda item: item[1][1])
+        for issue_name, (issue_id, stored_at) in by_age:
+            if not self._is_expired(stored_at):
+                self._entries[issue_name] = (int(issue_id), float(stored_at))
+        self._evict()
+
+    def save(self) -> None:
+        """Write the entries to the on-disk store, replacing it atomically."""
+        if self.path is None:
+            return
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        temporary_path = self.path.with_suffix(f"{self.path.suffix}.tmp")
+        with open(temporary_path, "w") as cache_file:
+            json.dump({"version": 1, "entries": self._entries}, cache_file)
+        os.replace(temporary_path, self.path)
+
+    def stats(self) -> Dict[str, int]:
+        """
+        Return cache counters.
+
+        :return: dictionary with hits, misses, coalesced lookups and size.
+        """
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "coalesced": self.coalesced,
+            "size": len(self._entries),
+        }
+
+    def _is_expired(self, stored_at: float) -> bool:
+        return time.time() - stored_at > self.ttl
+
+    def _evict(self) -> None:
+        # Dicts keep insertion order and set() re-inserts keys, so the first keys
+        # are always the oldest ones.
+        while len(self._entries) > self.max_entries:
+            oldest = next(iter(self._entries))
+            del self._entries[oldest]  # noqa: WPS420
+
+
+def create_issue_id_cache() -> IssueIdCache:
+    """
+    Create an IssueIdCache from settings and load its on-disk store.
+
+    :return: loaded IssueIdCache.
+    """
+    issue_id_cache = IssueIdCache(
+        path=settings.issue_id_cache_path if settings.issue_id_cache_persist else None,
+        ttl=settings.issue_id_cache_ttl,
+        max_entries=settings.issue_id_cache_max_entries,
+    )
+    issue_id_cache.load()
+    return issue_id_cache
@@ -0,0 +1,101 @@
+"""Merge back-to-back worklogs of an issue and day into a single worklog."""
+from typing import Dict, List, Tuple
+
+from tempo_worklog_automation.client.models import WorklogModel
+
+IndexedWorklog = Tuple[int, WorklogModel]
+CoalescedWorklog = Tuple[List[int], WorklogModel]
+
+
+def time_seconds(start_time: str) -> int:
+    """
+    Convert a HH:MM:SS time string, with or without padding, to seconds.
+
+    :param start_time: time string.
+    :return: seconds since midnight.
+    """
+    hours, minutes, seconds = start_time.split(":")
+    return int(hours) * 3600 + int(minutes) * 60 + int(seconds)
+
+
+def _sort_key(item: IndexedWorklog) -> Tuple[str, str, int, int]:
+    row_number, worklog = item
+    return (
+        worklog.issue,
+        worklog.start_date,
+        time_seconds(worklog.start_time),
+        row_number,
+    )
+
+
+def coalesce_worklogs(batch: List[IndexedWorklog]) -> List[CoalescedWorklog]:
+    """
+    Merge the worklogs of an issue and day that start when the previous one ends.
+
+    The worklogs are sorted by issue, date and start time, each merged worklog
+    starts with its first entry and its time spent is the sum of the entries.
+
+    :param batch: list of row numbers and worklogs.
+    :return: list of the merged row numbers and worklog, sorted by issue, date and
+        start time.
+    """
+    coalesced: List[CoalescedWorklog] = []
+    end_seconds = -1
+    for row_number, worklog in sorted(batch, key=_sort_key):
+        start_seconds = time_seconds(worklog.start_time)
+        if coalesced:
+            rows, previous = coalesced[-1]
+            if (
+                previous.issue == worklog.issue
+                and previous.start_date == worklog.start_date
+                and end_seconds == start_seconds
+            ):
+                rows.append(row_number)
+                coalesced[-1] = (
+                    rows,
+                    previous.model_copy(
+                        update={"time_spent": previous.time_spent + worklog.time_spent},
+                    ),
+                )
+                end_seconds += worklog.time_spent
+                continue
+        coalesced.append(([row_number], worklog))
+        end_seconds = start_seconds + worklog.time_spent
+    return coalesced
+
+
+class WorklogCoalescer:
+    """
+    Coalesce each validated batch of an upload, remembering the merged rows.
+
+    A merged worklog keeps the row number of its first entry, ``pop_rows`` maps it
+    back to every row it covers so their outcome can be recorded.
+    """
+
+    def __init__(self) -> None:
+        self.merged = 0
+        self._row_groups: Dict[int, List[int]] = {}
+
+    def __call__(self, batch: List[IndexedWorklog]) -> List[IndexedWorklog]:
+        """
+        Coalesce a batch of rows.
+
+        :param batch: list of row numbers and worklogs.
+        :return: list of row numbers and worklogs to post.
+        """
+        selected = []
+        for rows, worklog in coalesce_worklogs(batch):
+            if len(rows) > 1:
+                self._row_groups[rows[0]] = rows
+                self.merged += len(rows) - 1
+            selected.append((rows[0], worklog))
+        return selected
+
+    def pop_rows(self, row_number: int) -> List[int]:
+        """
+        Return and forget the rows covered by a posted worklog.
+
+        :param row_number: row number the worklog was posted with.
+        :return: list of row numbers, the given one alone when nothing was merged.
+        """
+        return self._row_groups.pop(row_number, [row_number])
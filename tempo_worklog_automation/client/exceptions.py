@@ -0,0 +1,44 @@
+"""Tempo worklog api client exceptions."""
+from typing import Iterable
+
+
+class UnknownIssuesError(ValueError):
+    """Raised when Jira can not resolve some of the requested issue keys."""
+
+    def __init__(self, issue_names: Iterable[str]):
+        self.issue_names = sorted(issue_names)
+        super().__init__(f"Unknown Jira issues: {', '.join(self.issue_names)}")
+
+
+class ScheduleConflictsError(ValueError):
+    """Raised when a file books overlapping worklogs or more than 24 hours a day."""
+
+    def __init__(self, source: str, overlaps: int, overbooked_days: int):
+        self.source = source
+        self.overlaps = overlaps
+        self.overbooked_days = overbooked_days
+        super().__init__(
+            f"{source}: {overlaps} overlapping worklogs and {overbooked_days} days over 24h, nothing was uploaded.",  # noqa: E501
+        )
+
+
+class FailureThresholdError(RuntimeError):
+    """Raised to abort an upload once too many of its rows failed."""
+
+    def __init__(self, failures: int, rows: int):
+        self.failures = failures
+        self.rows = rows
+        super().__init__(
+            f"{failures} of {rows} posted rows failed, over the failure threshold, upload aborted.",  # noqa: E501
+        )
+
+
+class InvalidWorklogsError(ValueError):
+    """Raised when a file that must be valid as a whole has invalid rows."""
+
+    def __init__(self, source: str, invalid_rows: int):
+        self.source = source
+        self.invalid_rows = invalid_rows
+        super().__init__(
+            f"{source}: {invalid_rows} invalid rows, nothing was changed.",
+        )
@@ -0,0 +1,226 @@
+"""Index of the worklogs already present in Tempo."""
+import logging
+from collections import defaultdict
+from datetime import datetime
+from functools import partial
+from typing import Any, AsyncIterator, Dict, Iterable, List, Optional, Tuple
+
+import httpx
+
+from tempo_worklog_automation.client.retry import RetryPolicy
+from tempo_worklog_automation.client.throttle import RateLimiter
+from tempo_worklog_automation.settings import settings
+
+logger = logging.getLogger(settings.logger_name)
+
+WorklogKey = Tuple[int, str, str, int]
+
+
+def worklog_key(
+    issue_id: int,
+    start_date: str,
+    start_time: str,
+    time_spent_seconds: int,
+) -> WorklogKey:
+    """
+    Build the key identifying a worklog, the start date and time are zero padded.
+
+    :param issue_id: Jira internal issue id.
+    :param start_date: date string as YYYY-MM-DD, with or without padding.
+    :param start_time: time string as HH:MM:SS, with or without padding.
+    :param time_spent_seconds: worklog duration in seconds.
+    :return: tuple identifying the worklog.
+    """
+    padded_date = datetime.strptime(start_date, "%Y-%m-%d").strftime("%Y-%m-%d")
+    padded_time = datetime.strptime(start_time, "%H:%M:%S").strftime("%H:%M:%S")
+    return (int(issue_id), padded_date, padded_time, int(time_spent_seconds))
+
+
+def date_range(start_dates: Iterable[str]) -> Optional[Tuple[str, str]]:
+    """
+    Return the first and last date of an iterable of YYYY-MM-DD strings, zero padded.
+
+    :param start_dates: iterable of date strings, with or without padding.
+    :return: tuple with the min and max dates or None when empty.
+    """
+    first_date: Optional[str] = None
+    last_date: Optional[str] = None
+    for date_string in start_dates:
+        start_date = datetime.strptime(date_string, "%Y-%m-%d").strftime("%Y-%m-%d")
+        if first_date is None or start_date < first_date:
+            first_date = start_date
+        if last_date is None or start_date > last_date:
+            last_date = start_date
+    if first_date is None or last_date is None:
+        return None
+    return first_date, last_date
+
+
+async def iter_author_worklogs(  # noqa: WPS211
+    client: httpx.AsyncClient,
+    headers: Dict[str, str],
+    author_account_id: str,
+    date_from: str,
+    date_to: str,
+    limiter: Optional[RateLimiter] = None,
+    page_size: int = 1000,
+) -> AsyncIterator[Dict[str, Any]]:
+    """
+    Page through the Tempo worklogs of an author between two dates.
+
+    Each page is retried according to the RetryPolicy, throttled or failing pages
+    do not abort the listing.
+
+    :param client: instance of httpx.AsyncClient.
+    :param headers: dictionary with key value pairs for each header in request.
+    :param author_account_id: author account id owning the worklogs.
+    :param date_from: first date as YYYY-MM-DD.
+    :param date_to: last date as YYYY-MM-DD, inclusive.
+    :param limiter: RateLimiter bounding the Tempo requests.
+    :param page_size: worklogs requested per page.
+    :yield: worklog objects returned by the api.
+    """
+    url: Optional[str] = f"{settings.tempo_base_api_url}/user/{author_account_id}"
+    params: Optional[Dict[str, Any]] = {
+        "from": date_from,
+        "to": date_to,
+        "offset": 0,
+        "limit": page_size,
+    }
+    limiter = limiter or RateLimiter()
+    retry_policy = RetryPolicy.from_settings()
+    while url is not None:
+        response = await retry_policy.send(
+            partial(client.get, url=url, headers=headers, params=params),
+            limiter,
+        )
+        response.raise_for_status()
+        page = response.json()
+        for worklog in page["results"]:
+            yield worklog
+        # The next page url already carries every query parameter.
+        url = page.get("metadata", {}).get("next")
+        params = None
+
+
+async def fetch_author_worklog_page(  # noqa: WPS211
+    client: httpx.AsyncClient,
+    headers: Dict[str, str],
+    author_account_id: str,
+    date_from: str,
+    date_to: str,
+    offset: int = 0,
+    limit: int = 1000,
+    limiter: Optional[RateLimiter] = None,
+) -> List[Dict[str, Any]]:
+    """
+    Fetch a single page of the Tempo worklogs of an author between two dates.
+
+    :param client: instance of httpx.AsyncClient.
+    :param headers: dictionary with key value pairs for each header in request.
+    :param author_account_id: author account id owning the worklogs.
+    :param date_from: first date as YYYY-MM-DD.
+    :param date_to: last date as YYYY-MM-DD, inclusive.
+    :param offset: number of worklogs skipped.
+    :param limit: worklogs requested.
+    :param limiter: RateLimiter bounding the Tempo requests.
+    :return: list of worklog objects returned by the api.
+    """
+    response = await RetryPolicy.from_settings().send(
+        partial(
+            client.get,
+            url=f"{settings.tempo_base_api_url}/user/{author_account_id}",
+            headers=headers,
+            params={"from": date_from, "to": date_to, "offset": offset, "limit": limit},
+        ),
+        limiter or RateLimiter(),
+    )
+    response.raise_for_status()
+    return response.json()["results"]
+
+
+class ExistingWorklogIndex:
+    """
+    In-memory multiset of the worklogs already present in Tempo.
+
+    Each remote worklog can be claimed once, so a file holding two identical rows
+    for a single remote worklog still creates the second one.
+    """
+
+    def __init__(self) -> None:
+        self._worklog_ids: Dict[WorklogKey, List[int]] = defaultdict(list)
+        self.size = 0
+
+    @classmethod
+    async def fetch(  # noqa: WPS211
+        cls,
+        client: httpx.AsyncClient,
+        headers: Dict[str, str],
+        author_account_id: str,
+        date_from: str,
+        date_to: str,
+        limiter: Optional[RateLimiter] = None,
+    ) -> "ExistingWorklogIndex":
+        """
+        Build the index from the author worklogs between two dates.
+
+        :param client: instance of httpx.AsyncClient.
+        :param headers: dictionary with key value pairs for each header in request.
+        :param author_account_id: author account id owning the worklogs.
+        :param date_from: first date as YYYY-MM-DD.
+        :param date_to: last date as YYYY-MM-DD, inclusive.
+        :param limiter: RateLimiter bounding the Tempo requests.
+        :return: ExistingWorklogIndex.
+        """
+        index = cls()
+        remote_worklogs = iter_author_worklogs(
+            client,
+            headers,
+            author_account_id,
+            date_from,
+            date_to,
+            limiter,
+        )
+        async for remote_worklog in remote_worklogs:
+            index.add(remote_worklog)
+        logger.info(
+            "Found %s existing worklogs between %s and %s.",
+            index.size,
+            date_from,
+            date_to,
+        )
+        return index
+
+    def add(self, remote_worklog: Dict[str, Any]) -> None:
+        """
+        Add a worklog object returned by the Tempo api.
+
+        :param remote_worklog: worklog object with issue, date, time and duration.
+        """
+        key = worklog_key(
+            remote_worklog["issue"]["id"],
+            remote_worklog["startDate"],
+            remote_worklog["startTime"],
+            remote_worklog["timeSpentSeconds"],
+        )
+        self._worklog_ids[key].append(remote_worklog["tempoWorklogId"])
+        self.size += 1
+
+    def claim(self, parsed_worklog: Dict[str, Any]) -> Optional[int]:
+        """
+        Claim the remote worklog matching a parsed worklog.
+
+        :param parsed_worklog: worklog payload returned by parse_worklog().
+        :return: matching tempoWorklogId or None when the worklog does not exist.
+        """
+        key = worklog_key(
+            parsed_worklog["issueId"],
+            parsed_worklog["startDate"],
+            parsed_worklog["startTime"],
+            parsed_worklog["timeSpentSeconds"],
+        )
+        worklog_ids = self._worklog_ids.get(key)
+        if not worklog_ids:
+            return None
+        self.size -= 1
+        return worklog_ids.pop()
@@ -0,0 +1,420 @@
+"""Crash-safe journal of uploaded worklog rows."""
+import hashlib
+import logging
+import sqlite3
+import time
+from collections import Counter
+from pathlib import Path
+from types import TracebackType
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple, Type
+
+from tempo_worklog_automation.client.models import WorklogModel
+from tempo_worklog_automation.settings import settings
+
+logger = logging.getLogger(settings.logger_name)
+
+PENDING = "pending"
+CREATED = "created"
+MATCHED = "matched"
+FAILED = "failed"
+REJECTED = "rejected"
+DELETED = "deleted"
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS worklog_rows (
+    source TEXT NOT NULL,
+    row_key TEXT NOT NULL,
+    row_number INTEGER NOT NULL,
+    state TEXT NOT NULL,
+    tempo_worklog_id INTEGER,
+    error TEXT,
+    updated_at REAL NOT NULL,
+    start_date TEXT,
+    PRIMARY KEY (source, row_key)
+)
+"""
+
+# Journals written before the start dates were recorded.
+ADD_START_DATE = "ALTER TABLE worklog_rows ADD COLUMN start_date TEXT"
+
+WORKLOG_ID_INDEX = """
+CREATE INDEX IF NOT EXISTS worklog_rows_worklog_id
+ON worklog_rows (source, state, tempo_worklog_id)
+"""
+
+RECORD = """
+INSERT INTO worklog_rows VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+ON CONFLICT (source, row_key) DO UPDATE SET
+    row_number = excluded.row_number,
+    state = excluded.state,
+    tempo_worklog_id = excluded.tempo_worklog_id,
+    error = excluded.error,
+    updated_at = excluded.updated_at,
+    start_date = excluded.start_date
+WHERE worklog_rows.state != ? OR excluded.state = ?
+"""
+
+
+class UploadJournal:
+    """
+    Record the upload state of each input row in a SQLite database.
+
+    Rows are keyed by a hash of their content and of how many identical rows came
+    before them in the same source, so the key survives rows being appended or
+    reordered. Every state change is committed right away, a crash or a cancelled
+    upload leaves the created rows recorded and a resumed upload skips them. A
+    created row keeps its state and worklog id when a later upload of the same row
+    is interrupted or fails. Rows matching a worklog already in Tempo are recorded
+    as matched, they are skipped on resume but never deleted as uploaded. The start
+    date of each row is kept, a sync finds the worklogs of the rows removed since.
+
+    Inputs read from the middle, like a tailed file, cannot count the identical
+    rows before them and key their rows by content and row number instead. Rows
+    the api rejected are recorded as rejected, inputs reading their rows again
+    until they are created can skip them as well.
+
+    :param path: SQLite database file.
+    :param source: identifier of the input, usually the resolved file path.
+    :param keyed_by_row: whether to key rows by row number instead of occurrence.
+    :param skip_rejected: whether resuming also skips the rejected rows.
+    """
+
+    def __init__(
+        self,
+        path: Path,
+        source: str,
+        keyed_by_row: bool = False,
+        skip_rejected: bool = False,
+    ):
+        self.path = path
+        self.source = source
+        self.keyed_by_row = keyed_by_row
+        self.resumed_states = {CREATED, MATCHED}
+        if skip_rejected:
+            self.resumed_states.add(REJECTED)
+        self.skipped = 0
+        self._occurrences: Counter[bytes] = Counter()
+        self._row_keys: Dict[int, Tuple[str, str]] = {}
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self._connection = sqlite3.connect(path, isolation_level=None)
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        self._connection.execute("PRAGMA synchronous=NORMAL")
+        self._connection.execute(SCHEMA)
+        columns = {
+            column[1]
+            for column in self._connection.execute("PRAGMA table_info(worklog_rows)")
+        }
+        if "start_date" not in columns:
+            self._connection.execute(ADD_START_DATE)
+        self._connection.execute(WORKLOG_ID_INDEX)
+
+    def __enter__(self) -> "UploadJournal":
+        return self
+
+    def __exit__(
+        self,
+        exc_type: Optional[Type[BaseException]],
+        exc_value: Optional[BaseException],
+        traceback: Optional[TracebackType],
+    ) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """Close the database connection."""
+        self._connection.close()
+
+    def row_key(self, worklog: WorklogModel, row_number: int = 0) -> str:
+        """
+        Return the stable key of the next row with this content.
+
+        Must be called once per row, in input order.
+
+        :param worklog: validated worklog row.
+        :param row_number: row number in the input, used when keyed_by_row.
+        :return: hex digest identifying the row.
+        """
+        content = "\x1f".join(
+            (
+                worklog.issue,
+                str(worklog.time_spent),
+                worklog.start_date,
+                worklog.start_time,
+            ),
+        )
+        content_digest = hashlib.blake2b(content.encode(), digest_size=16).digest()
+        if self.keyed_by_row:
+            return f"{content_digest.hex()}@{row_number}"
+        occurrence = self._occurrences[content_digest]
+        self._occurrences[content_digest] += 1
+        return f"{content_digest.hex()}-{occurrence}"
+
+    def state(self, row_key: str) -> Optional[str]:
+        """
+        Return the recorded state of a row.
+
+        :param row_key: key returned by row_key().
+        :return: pending, created, matched, failed, rejected, deleted or None when
+            never recorded.
+        """
+        recorded = self._connection.execute(
+            "SELECT state FROM worklog_rows WHERE source = ? AND row_key = ?",
+            (self.source, row_key),
+        ).fetchone()
+        return None if recorded is None else recorded[0]
+
+    def mark_pending(
+        self,
+        row_key: str,
+        row_number: int,
+        start_date: Optional[str] = None,
+    ) -> None:
+        """
+        Record a row about to be posted.
+
+        :param row_key: key returned by row_key().
+        :param row_number: row number in the input.
+        :param start_date: start date of the row.
+        """
+        self._record(row_key, row_number, PENDING, start_date=start_date)
+
+    def mark_created(
+        self,
+        row_key: str,
+        row_number: int,
+        worklog_id: int,
+        start_date: Optional[str] = None,
+    ) -> None:
+        """
+        Record a row created in Tempo.
+
+        :param row_key: key returned by row_key().
+        :param row_number: row number in the input.
+        :param worklog_id: tempoWorklogId returned by the api.
+        :param start_date: start date of the row.
+        """
+        self._record(
+            row_key,
+            row_number,
+            CREATED,
+            worklog_id=worklog_id,
+            start_date=start_date,
+        )
+
+    def mark_matched(
+        self,
+        row_key: str,
+        row_number: int,
+        worklog_id: int,
+        start_date: Optional[str] = None,
+    ) -> None:
+        """
+        Record a row matching a worklog already in Tempo.
+
+        :param row_key: key returned by row_key().
+        :param row_number: row number in the input.
+        :param worklog_id: tempoWorklogId of the existing worklog.
+        :param start_date: start date of the row.
+        """
+        self._record(
+            row_key,
+            row_number,
+            MATCHED,
+            worklog_id=worklog_id,
+            start_date=start_date,
+        )
+
+    def mark_failed(
+        self,
+        row_key: str,
+        row_number: int,
+        error: str,
+        start_date: Optional[str] = None,
+        rejected: bool = False,
+    ) -> None:
+        """
+        Record a row that could not be created.
+
+        :param row_key: key returned by row_key().
+        :param row_number: row number in the input.
+        :param error: error description.
+        :param start_date: start date of the row.
+        :param rejected: whether the api rejected the row, rather than failing.
+        """
+        self._record(
+            row_key,
+            row_number,
+            REJECTED if rejected else FAILED,
+            error=error,
+            start_date=start_date,
+        )
+
+    def select(
+        self,
+        batch: List[Tuple[int, WorklogModel]],
+        resume: bool = False,
+    ) -> List[Tuple[int, WorklogModel]]:
+        """
+        Key the rows of a batch, dropping created and matched rows when resuming.
+
+        Must be called with every validated row, in input order.
+
+        :param batch: list of row numbers and worklogs.
+        :param resume: whether to skip the rows already created or matched, and
+            rejected when skip_rejected.
+        :return: list of row numbers and worklogs to post.
+        """
+        selected = []
+        for row_number, worklog in batch:
+            row_key = self.row_key(worklog, row_number)
+            if resume and self.state(row_key) in self.resumed_states:
+                self.skipped += 1
+                continue
+            self._row_keys[row_number] = (row_key, worklog.start_date)
+            selected.append((row_number, worklog))
+        return selected
+
+    def record_pending(self, row_number: int) -> None:
+        """
+        Record a selected row as about to be posted.
+
+        :param row_number: row number in the input.
+        """
+        row_key, start_date = self._row_keys[row_number]
+        self.mark_pending(row_key, row_number, start_date)
+
+    def record_created(self, row_number: int, worklog_id: int) -> None:
+        """
+        Record a selected row as created.
+
+        :param row_number: row number in the input.
+        :param worklog_id: tempoWorklogId returned by the api.
+        """
+        row_key, start_date = self._row_keys.pop(row_number)
+        self.mark_created(row_key, row_number, worklog_id, start_date)
+
+    def record_matched(self, row_number: int, worklog_id: int) -> None:
+        """
+        Record a selected row as matching an existing worklog.
+
+        :param row_number: row number in the input.
+        :param worklog_id: tempoWorklogId of the existing worklog.
+        """
+        row_key, start_date = self._row_keys.pop(row_number)
+        self.mark_matched(row_key, row_number, worklog_id, start_date)
+
+    def record_failed(
+        self,
+        row_number: int,
+        error: str,
+        rejected: bool = False,
+    ) -> None:
+        """
+        Record a selected row as failed.
+
+        :param row_number: row number in the input.
+        :param error: error description.
+        :param rejected: whether the api rejected the row, rather than failing.
+        """
+        row_key, start_date = self._row_keys.pop(row_number)
+        self.mark_failed(row_key, row_number, error, start_date, rejected)
+
+    def iter_created_worklog_ids(self, batch_size: int = 1000) -> Iterator[List[int]]:
+        """
+        Yield the Tempo ids of the created rows of the source, a batch at a time.
+
+        Ids are paged in increasing order, so marking them deleted while iterating
+        is safe, and listed once when coalesced rows share them. Matched rows are
+        left out, their worklogs were not created by an upload.
+
+        :param batch_size: ids per batch.
+        :yield: list of tempoWorklogId.
+        """
+        last_worklog_id = 0
+        while True:  # noqa: WPS457
+            created_rows = self._connection.execute(
+                "SELECT DISTINCT tempo_worklog_id FROM worklog_rows "
+                + "WHERE source = ? AND state = ? AND tempo_worklog_id > ? "
+                + "ORDER BY tempo_worklog_id LIMIT ?",
+                (self.source, CREATED, last_worklog_id, batch_size),
+            ).fetchall()
+            if not created_rows:
+                return
+            last_worklog_id = created_rows[-1][0]
+            yield [worklog_id for (worklog_id,) in created_rows]
+
+    def created_worklogs(self) -> Dict[int, Optional[str]]:
+        """
+        Return the Tempo ids of the created rows of the source with their start date.
+
+        :return: dictionary of tempoWorklogId to start date, None when the row was
+            recorded without one.
+        """
+        return dict(
+            self._connection.execute(
+                "SELECT tempo_worklog_id, MAX(start_date) FROM worklog_rows "
+                + "WHERE source = ? AND state = ? GROUP BY tempo_worklog_id",
+                (self.source, CREATED),
+            ).fetchall(),
+        )
+
+    def mark_deleted(self, worklog_ids: Iterable[int]) -> None:
+        """
+        Record created rows whose worklogs were deleted, a resumed upload posts them.
+
+        :param worklog_ids: tempoWorklogId of the deleted worklogs.
+        """
+        self._connection.executemany(
+            "UPDATE worklog_rows SET state = ?, updated_at = ? "
+            + "WHERE source = ? AND state = ? AND tempo_worklog_id = ?",
+            [
+                (DELETED, time.time(), self.source, CREATED, worklog_id)
+                for worklog_id in worklog_ids
+            ],
+        )
+
+    def count(self, state: str) -> int:
+        """
+        Count the rows of the source in a given state.
+
+        :param state: pending, created, matched, failed, rejected or deleted.
+        :return: number of rows.
+        """
+        return self._connection.execute(
+            "SELECT COUNT(*) FROM worklog_rows WHERE source = ? AND state = ?",
+            (self.source, state),
+        ).fetchone()[0]
+
+    def _record(
+        self,
+        row_key: str,
+        row_number: int,
+        state: str,
+        worklog_id: Optional[int] = None,
+        error: Optional[str] = None,
+        start_date: Optional[str] = None,
+    ) -> None:
+        self._connection.execute(
+            RECORD,
+            (
+                self.source,
+                row_key,
+                row_number,
+                state,
+                worklog_id,
+                error,
+                time.time(),
+                start_date,
+                CREATED,
+                CREATED,
+            ),
+        )
+
+
+def open_upload_journal(file_path: Path) -> UploadJournal:
+    """
+    Open the upload journal from settings for an input file.
+
+    :param file_path: Path object for the input file.
+    :return: UploadJournal.
+    """
+    return UploadJournal(settings.upload_journal_path, str(file_path.resolve()))
@@ -0,0 +1,166 @@
+"""Multi-author upload manifest, per-token accounts and fair scheduling."""
+from collections import OrderedDict, deque
+from contextlib import asynccontextmanager
+from pathlib import Path
+from typing import AsyncIterator, Deque, Dict, List, Optional
+
+import anyio
+from pydantic import BaseModel, FilePath
+
+from tempo_worklog_automation.client.throttle import RateLimiter
+from tempo_worklog_automation.client.utils.yaml import load_yaml_file
+from tempo_worklog_automation.settings import settings
+
+
+class AuthorUpload(BaseModel):
+    """Pydantic model for a manifest entry."""
+
+    author_account_id: str
+    file_path: FilePath
+    tempo_oauth_token: Optional[str] = None
+
+
+class UploadManifest(BaseModel):
+    """Pydantic model for the upload manifest."""
+
+    authors: List[AuthorUpload]
+
+
+def load_upload_manifest(manifest_path: Path) -> UploadManifest:
+    """
+    Load and validate a YAML upload manifest.
+
+    Relative file paths are resolved against the manifest directory.
+
+    :param manifest_path: Path object for the manifest file.
+    :return: UploadManifest.
+    """
+    manifest = load_yaml_file(manifest_path)
+    for author in manifest.get("authors") or []:
+        if "file_path" in author:
+            author["file_path"] = manifest_path.parent / author["file_path"]
+    return UploadManifest(**manifest)
+
+
+class TempoAccount:
+    """
+    Author and token of Tempo requests, each token owns a RateLimiter.
+
+    :param author_account_id: author account id to use when creating worklogs.
+    :param tempo_oauth_token: Tempo token of the requests.
+    :param limiter: RateLimiter bounding the requests made with the token.
+    """
+
+    def __init__(
+        self,
+        author_account_id: str,
+        tempo_oauth_token: str,
+        limiter: Optional[RateLimiter] = None,
+    ):
+        self.author_account_id = author_account_id
+        self.tempo_oauth_token = tempo_oauth_token
+        self.limiter = limiter or RateLimiter.for_tempo()
+
+    @classmethod
+    def from_settings(cls) -> "TempoAccount":
+        """
+        Create the TempoAccount of the settings author and token.
+
+        :return: TempoAccount.
+        """
+        return cls(settings.author_account_id, settings.tempo_oauth_token)
+
+    @property
+    def headers(self) -> Dict[str, str]:
+        """
+        Headers of the Tempo api requests made with the token.
+
+        :return: dictionary with key value pairs for each header in request.
+        """
+        return {
+            "Content-Type": "application/json",
+            "Authorization": f"Bearer {self.tempo_oauth_token}",
+        }
+
+
+def create_tempo_accounts(manifest: UploadManifest) -> List[TempoAccount]:
+    """
+    Create the TempoAccount of each manifest entry, sharing limiters by token.
+
+    Entries without a token use the settings token.
+
+    :param manifest: UploadManifest.
+    :return: list of TempoAccount in manifest order.
+    """
+    limiters: Dict[str, RateLimiter] = {}
+    accounts = []
+    for author in manifest.authors:
+        token = author.tempo_oauth_token or settings.tempo_oauth_token
+        if token not in limiters:
+            limiters[token] = RateLimiter.for_tempo()
+        accounts.append(TempoAccount(author.author_account_id, token, limiters[token]))
+    return accounts
+
+
+class FairScheduler:
+    """
+    Share a fixed number of request slots between clients, round robin.
+
+    A freed slot goes to the next client in turn with a waiting request, so a
+    client with a large backlog only gets its share of the slots while others
+    are waiting.
+
+    :param slots: maximum concurrent holders.
+    """
+
+    def __init__(self, slots: int):
+        self.slots = slots
+        self._available = slots
+        self._waiters: "OrderedDict[str, Deque[anyio.Event]]" = OrderedDict()
+
+    @asynccontextmanager
+    async def slot(self, client: str) -> AsyncIterator[None]:
+        """
+        Hold a slot for the duration of a block.
+
+        :param client: identifier of the client taking turns.
+        :yield: None.
+        """
+        if self._available > 0 and not self._waiters:
+            self._available -= 1
+        else:
+            await self._wait_turn(client)
+        try:
+            yield
+        finally:
+            self._release()
+
+    async def _wait_turn(self, client: str) -> None:
+        turn = anyio.Event()
+        self._waiters.setdefault(client, deque()).append(turn)
+        try:
+            await turn.wait()
+        except BaseException:
+            if turn.is_set():
+                # The slot was handed over while being cancelled, pass it on.
+                self._release()
+            else:
+                self._remove_waiter(client, turn)
+            raise
+
+    def _remove_waiter(self, client: str, turn: anyio.Event) -> None:
+        waiting = self._waiters[client]
+        waiting.remove(turn)
+        if not waiting:
+            del self._waiters[client]  # noqa: WPS420
+
+    def _release(self) -> None:
+        if not self._waiters:
+            self._available += 1
+            return
+        client, waiting = self._waiters.popitem(last=False)
+        turn = waiting.popleft()
+        if waiting:
+            # The client goes back to the end of the line.
+            self._waiters[client] = waiting
+        turn.set()
@@ -0,0 +1,463 @@
+"""Run metrics collected through registered hooks."""
+import json
+import os
+import re
+import time
+from collections import defaultdict
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Tuple, TypeVar
+
+import httpx
+
+STARTED_AT = "metrics_started_at"
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+PROMETHEUS_PREFIX = "tempo_worklog"
+ID_SEGMENT = re.compile(r"/(issue|user|worklogs)/(?!user(?:/|$))[^/]+")
+
+
+class MetricsHook:
+    """
+    Receive the measurements of a run, every method is a no-op by default.
+
+    Hooks are registered with add_hook() or hook_scope() and called from the
+    request event hooks of the shared HttpSession, the retry loops and the upload
+    pipeline stages.
+    """
+
+    def on_request(  # noqa: WPS211
+        self,
+        endpoint: str,
+        status_code: int,
+        seconds: float,
+        bytes_sent: int,
+        bytes_received: int,
+    ) -> None:
+        """
+        Record a completed request.
+
+        :param endpoint: method and path with ids replaced by ``{id}``.
+        :param status_code: http response code.
+        :param seconds: latency until the response body was read.
+        :param bytes_sent: request body size.
+        :param bytes_received: response size as downloaded.
+        """
+
+    def on_retry(self, endpoint: str, status_code: int) -> None:
+        """
+        Record a request about to be retried.
+
+        :param endpoint: method and path with ids replaced by ``{id}``.
+        :param status_code: http response code that caused the retry.
+        """
+
+    def on_backoff(self, seconds: float) -> None:
+        """
+        Record time spent sleeping before a retry.
+
+        :param seconds: sleep duration.
+        """
+
+    def on_phase(self, phase: str, seconds: float) -> None:
+        """
+        Record time spent in a run phase.
+
+        :param phase: phase name, load, validate, resolve, post or total.
+        :param seconds: elapsed seconds.
+        """
+
+
+HookType = TypeVar("HookType", bound=MetricsHook)
+
+_hooks: List[MetricsHook] = []
+
+
+def add_hook(hook: MetricsHook) -> None:
+    """
+    Register a hook receiving every measurement.
+
+    :param hook: MetricsHook.
+    """
+    _hooks.append(hook)
+
+
+def remove_hook(hook: MetricsHook) -> None:
+    """
+    Unregister a hook.
+
+    :param hook: MetricsHook registered with add_hook().
+    """
+    _hooks.remove(hook)
+
+
+@contextmanager
+def hook_scope(hook: HookType) -> Iterator[HookType]:
+    """
+    Register a hook for the duration of a block.
+
+    :param hook: MetricsHook.
+    :yield: the registered hook.
+    """
+    add_hook(hook)
+    try:
+        yield hook
+    finally:
+        remove_hook(hook)
+
+
+def endpoint_name(request: httpx.Request) -> str:
+    """
+    Return the metric label of a request, ids, issue keys and accounts become ``{id}``.
+
+    :param request: httpx.Request.
+    :return: method and normalized path.
+    """
+    path = ID_SEGMENT.sub(r"/\1/{id}", request.url.path)
+    return f"{request.method} {path}"
+
+
+def record_retry(request: httpx.Request, status_code: int) -> None:
+    """
+    Report a retried request to the registered hooks.
+
+    :param request: httpx.Request about to be retried.
+    :param status_code: http response code that caused the retry.
+    """
+    if not _hooks:
+        return
+    endpoint = endpoint_name(request)
+    for hook in _hooks:
+        hook.on_retry(endpoint, status_code)
+
+
+def record_backoff(seconds: float) -> None:
+    """
+    Report a retry sleep to the registered hooks.
+
+    :param seconds: sleep duration.
+    """
+    for hook in _hooks:
+        hook.on_backoff(seconds)
+
+
+@contextmanager
+def phase(name: str) -> Iterator[None]:
+    """
+    Time a block and report it as a run phase to the registered hooks.
+
+    :param name: phase name.
+    :yield: None.
+    """
+    started_at = time.perf_counter()
+    try:
+        yield
+    finally:
+        elapsed = time.perf_counter() - started_at
+        for hook in _hooks:
+            hook.on_phase(name, elapsed)
+
+
+async def on_request_event(request: httpx.Request) -> None:
+    """
+    Httpx request event hook storing the request start time.
+
+    :param request: httpx.Request about to be sent.
+    """
+    request.extensions[STARTED_AT] = time.perf_counter()
+
+
+async def on_response_event(response: httpx.Response) -> None:
+    """
+    Httpx response event hook reporting the request to the registered hooks.
+
+    The body is read here when hooks are registered, so the latency covers the
+    whole download and the received bytes are known.
+
+    :param response: httpx.Response with unread body.
+    """
+    if not _hooks:
+        return
+    await response.aread()
+    request = response.request
+    seconds = time.perf_counter() - request.extensions[STARTED_AT]
+    endpoint = endpoint_name(request)
+    bytes_sent = len(request.content)
+    for hook in _hooks:
+        hook.on_request(
+            endpoint,
+            response.status_code,
+            seconds,
+            bytes_sent,
+            response.num_bytes_downloaded,
+        )
+
+
+class LatencyHistogram:
+    """Cumulative latency histogram with fixed bucket bounds."""
+
+    def __init__(self, bounds: Tuple[float, ...] = LATENCY_BUCKETS):
+        self.bounds = bounds
+        self.counts = [0] * (len(bounds) + 1)
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, seconds: float) -> None:
+        """
+        Add a latency sample.
+
+        :param seconds: latency.
+        """
+        index = 0
+        while index < len(self.bounds) and seconds > self.bounds[index]:
+            index += 1
+        self.counts[index] += 1
+        self.count += 1
+        self.sum += seconds
+
+    def cumulative(self) -> List[Tuple[str, int]]:
+        """
+        Return the cumulative count of every bucket, last one is ``+Inf``.
+
+        :return: list of upper bound labels and counts.
+        """
+        labels = [f"{bound:g}" for bound in self.bounds] + ["+Inf"]
+        total = 0
+        buckets = []
+        for label, count in zip(labels, self.counts):
+            total += count
+            buckets.append((label, total))
+        return buckets
+
+    def quantile(self, fraction: float) -> float:
+        """
+        Estimate a quantile by linear interpolation inside its bucket.
+
+        :param fraction: quantile between 0 and 1.
+        :return: latency in seconds, 0 without samples.
+        """
+        if not self.count:
+            return 0
+        rank = fraction * self.count
+        lower_bound = 0.0
+        seen = 0
+        for bound, count in zip(self.bounds, self.counts):
+            if seen + count >= rank and count:
+                return lower_bound + (bound - lower_bound) * (rank - seen) / count
+            seen += count
+            lower_bound = bound
+        return self.bounds[-1]
+
+
+class EndpointStatistics:
+    """Counters of a single endpoint."""
+
+    def __init__(self) -> None:
+        self.latency = LatencyHistogram()
+        self.status_codes: Dict[int, int] = defaultdict(int)
+        self.retries = 0
+        self.bytes_sent = 0
+        self.bytes_received = 0
+
+    def as_dict(self) -> Dict[str, Any]:
+        """
+        Return the counters as JSON compatible values.
+
+        :return: dictionary of counters and latency quantiles.
+        """
+        return {
+            "requests": self.latency.count,
+            "status_codes": dict(sorted(self.status_codes.items())),
+            "throttled": self.status_codes.get(429, 0),  # noqa: WPS432
+            "retries": self.retries,
+            "bytes_sent": self.bytes_sent,
+            "bytes_received": self.bytes_received,
+            "latency_seconds": {
+                "sum": self.latency.sum,
+                "p50": self.latency.quantile(0.5),
+                "p95": self.latency.quantile(0.95),
+                "p99": self.latency.quantile(0.99),
+                "buckets": dict(self.latency.cumulative()),
+            },
+        }
+
+
+class RunStatistics(MetricsHook):
+    """Aggregate the measurements of a run and export them as JSON or Prometheus."""
+
+    def __init__(self) -> None:
+        self.endpoints: Dict[str, EndpointStatistics] = defaultdict(
+            EndpointStatistics,
+        )
+        self.backoff_seconds = 0.0
+        self.phases: Dict[str, float] = defaultdict(float)
+
+    def on_request(  # noqa: WPS211
+        self,
+        endpoint: str,
+        status_code: int,
+        seconds: float,
+        bytes_sent: int,
+        bytes_received: int,
+    ) -> None:
+        """
+        Record a completed request.
+
+        :param endpoint: method and path with ids replaced by ``{id}``.
+        :param status_code: http response code.
+        :param seconds: latency until the response body was read.
+        :param bytes_sent: request body size.
+        :param bytes_received: response size as downloaded.
+        """
+        statistics = self.endpoints[endpoint]
+        statistics.latency.observe(seconds)
+        statistics.status_codes[status_code] += 1
+        statistics.bytes_sent += bytes_sent
+        statistics.bytes_received += bytes_received
+
+    def on_retry(self, endpoint: str, status_code: int) -> None:
+        """
+        Record a request about to be retried.
+
+        :param endpoint: method and path with ids replaced by ``{id}``.
+        :param status_code: http response code that caused the retry.
+        """
+        self.endpoints[endpoint].retries += 1
+
+    def on_backoff(self, seconds: float) -> None:
+        """
+        Record time spent sleeping before a retry.
+
+        :param seconds: sleep duration.
+        """
+        self.backoff_seconds += seconds
+
+    def on_phase(self, phase: str, seconds: float) -> None:
+        """
+        Record time spent in a run phase, concurrent tasks add up.
+
+        :param phase: phase name.
+        :param seconds: elapsed seconds.
+        """
+        self.phases[phase] += seconds
+
+    def as_dict(self) -> Dict[str, Any]:
+        """
+        Return the statistics as JSON compatible values.
+
+        :return: dictionary with endpoint counters, backoff and phase seconds.
+        """
+        return {
+            "endpoints": {
+                endpoint: statistics.as_dict()
+                for endpoint, statistics in sorted(self.endpoints.items())
+            },
+            "backoff_seconds": self.backoff_seconds,
+            "phase_seconds": dict(self.phases),
+        }
+
+    def to_prometheus(self) -> str:
+        """
+        Render the statistics in the Prometheus text exposition format.
+
+        :return: textfile collector content.
+        """
+        lines = []
+        histogram = f"{PROMETHEUS_PREFIX}_request_duration_seconds"
+        lines.extend(_prometheus_header(histogram, "histogram", "Request latency."))
+        for endpoint, statistics in sorted(self.endpoints.items()):
+            label = _prometheus_label("endpoint", endpoint)
+            for bound, count in statistics.latency.cumulative():
+                lines.append(f'{histogram}_bucket{{{label},le="{bound}"}} {count}')
+            lines.append(f"{histogram}_sum{{{label}}} {statistics.latency.sum}")
+            lines.append(f"{histogram}_count{{{label}}} {statistics.latency.count}")
+
+        counters = (
+            ("requests_total", "Responses by status code."),
+            ("retries_total", "Retried requests."),
+            ("bytes_sent_total", "Request body bytes."),
+            ("bytes_received_total", "Response bytes."),
+        )
+        for name, help_text in counters:
+            lines.extend(
+                _prometheus_header(f"{PROMETHEUS_PREFIX}_{name}", "counter", help_text),
+            )
+            for endpoint, statistics in sorted(self.endpoints.items()):
+                lines.extend(_prometheus_endpoint_counter(name, endpoint, statistics))
+
+        backoff = f"{PROMETHEUS_PREFIX}_backoff_seconds_total"
+        lines.extend(_prometheus_header(backoff, "counter", "Retry sleep time."))
+        lines.append(f"{backoff} {self.backoff_seconds}")
+        phases = f"{PROMETHEUS_PREFIX}_phase_seconds"
+        lines.extend(_prometheus_header(phases, "gauge", "Time spent per phase."))
+        for phase_name, seconds in sorted(self.phases.items()):
+            label = _prometheus_label("phase", phase_name)
+            lines.append(f"{phases}{{{label}}} {seconds}")
+        return "\n".join(lines) + "\n"
+
+    def write(self, path: Path) -> None:
+        """
+        Write the statistics, as a Prometheus textfile for ``.prom`` files or JSON.
+
+        The file is replaced atomically so a collector never reads a partial file.
+
+        :param path: destination file.
+        """
+        if path.suffix == ".prom":
+            content = self.to_prometheus()
+        else:
+            content = json.dumps(self.as_dict(), indent=2)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        temporary_path = path.with_suffix(f"{path.suffix}.tmp")
+        temporary_path.write_text(content)
+        os.replace(temporary_path, path)
+
+    def format_summary(self) -> str:
+        """
+        Format a human readable summary table.
+
+        :return: multi line summary.
+        """
+        lines = [
+            f"{'endpoint':<28} {'requests':>8} {'429':>5} {'retries':>7} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'sent kB':>8} {'recv kB':>8}",  # noqa: E501
+        ]
+        for endpoint, statistics in sorted(self.endpoints.items()):
+            latency = statistics.latency
+            lines.append(
+                f"{endpoint:<28} {latency.count:>8} {statistics.status_codes.get(429, 0):>5} {statistics.retries:>7} {latency.quantile(0.5) * 1000:>8.1f} {latency.quantile(0.95) * 1000:>8.1f} {latency.quantile(0.99) * 1000:>8.1f} {statistics.bytes_sent / 1000:>8.1f} {statistics.bytes_received / 1000:>8.1f}",  # noqa: E501, WPS221, WPS432
+            )
+        lines.append(f"backoff: {self.backoff_seconds:.2f}s")
+        phase_times = ", ".join(
+            f"{phase_name} {seconds:.2f}s"
+            for phase_name, seconds in sorted(self.phases.items())
+        )
+        lines.append(f"phases: {phase_times or 'none'}")
+        return "\n".join(lines)
+
+
+def _prometheus_header(name: str, metric_type: str, help_text: str) -> List[str]:
+    return [f"# HELP {name} {help_text}", f"# TYPE {name} {metric_type}"]
+
+
+def _prometheus_label(name: str, value: str) -> str:
+    escaped = value.replace("\\", "\\\\").replace('"', '\\"')
+    return f'{name}="{escaped}"'
+
+
+def _prometheus_endpoint_counter(
+    name: str,
+    endpoint: str,
+    statistics: EndpointStatistics,
+) -> List[str]:
+    metric = f"{PROMETHEUS_PREFIX}_{name}"
+    label = _prometheus_label("endpoint", endpoint)
+    if name == "requests_total":
+        return [
+            f'{metric}{{{label},status="{status_code}"}} {count}'
+            for status_code, count in sorted(statistics.status_codes.items())
+        ]
+    values: Dict[str, int] = {
+        "retries_total": statistics.retries,
+        "bytes_sent_total": statistics.bytes_sent,
+        "bytes_received_total": statistics.bytes_received,
+    }
+    return [f"{metric}{{{label}}} {values[name]}"]
@@ -1,7 +1,51 @@
 from datetime import datetime
+from functools import lru_cache
+from pathlib import Path
+from typing import List, Optional
 
 from pydantic import BaseModel, FilePath, field_validator
 
+TIME_UNIT_SECONDS = {"s": 1, "m": 60, "h": 3600, "d": 86400, "w": 604800}
+
+
+@lru_cache(maxsize=4096)
+def normalize_date(value: str) -> Optional[str]:
+    """
+    Zero pad a YYYY-MM-DD date string, memoised as worklog files repeat their dates.
+
+    :param value: date string, with or without padding.
+    :return: zero padded date string or None when the date is invalid.
+    """
+    try:
+        return datetime.strptime(value, "%Y-%m-%d").strftime("%Y-%m-%d")
+    except ValueError:
+        return None
+
+
+def is_valid_date(value: str) -> bool:
+    """
+    Check a YYYY-MM-DD date string.
+
+    :param value: date string.
+    :return: whether the date string is valid.
+    """
+    return normalize_date(value) is not None
+
+
+@lru_cache(maxsize=4096)
+def is_valid_time(value: str) -> bool:
+    """
+    Check a HH:MM:SS time string, memoised as worklog files repeat their times.
+
+    :param value: time string.
+    :return: whether the time string is valid.
+    """
+    try:
+        datetime.strptime(value, "%H:%M:%S")
+    except ValueError:
+        return False
+    return True
+
 
 class WorklogModel(BaseModel):
     """Pydantic model for worklog entries."""
@@ -20,14 +64,15 @@ class WorklogModel(BaseModel):
         :raises ValueError: when validator condition fails.
         :return: validation string.
         """
+        if not isinstance(value, str):
+            raise ValueError("Time spent must be a string")
         if not value.endswith("h") and not value.endswith("s"):
             raise ValueError('Time spent units must be in hours "h" or seconds "s"')
         try:
-            time_unit_dict = {"s": 1, "m": 60, "h": 3600, "d": 86400, "w": 604800}
             float_from_string = float(value[:-1])
             time_unit = value[-1]
             time_spent_to_seconds = int(
-                float_from_string * time_unit_dict[time_unit],
+                float_from_string * TIME_UNIT_SECONDS[time_unit],
             )
         except ValueError:
             raise ValueError("Could not transform string to 24h hour string.")
@@ -40,13 +85,14 @@ class WorklogModel(BaseModel):
 
         :param value: validation string.
         :raises ValueError: when validator condition fails.
-        :return: formatted date.
+        :return: zero padded date.
         """
-        try:
-            datetime.strptime(value, "%Y-%m-%d")
-        except ValueError:
+        if not isinstance(value, str):
             raise ValueError("Incorrect date format, should be YYYY-MM-DD")
-        return value
+        normalized_date = normalize_date(value)
+        if normalized_date is None:
+            raise ValueError("Incorrect date format, should be YYYY-MM-DD")
+        return normalized_date
 
     @field_validator("start_time", mode="before")
     def validate_start_time(cls, value: str) -> str:  # noqa: N805, WPS111
@@ -57,9 +103,7 @@ class WorklogModel(BaseModel):
         :raises ValueError: when validator condition fails.
         :return: validation string.
         """
-        try:
-            datetime.strptime(value, "%H:%M:%S")
-        except ValueError:
+        if not isinstance(value, str) or not is_valid_time(value):
             raise ValueError("Incorrect time format, should be HH:MM:SS")
         return value
 
@@ -67,4 +111,41 @@ class WorklogModel(BaseModel):
 class CliArguments(BaseModel):
     """Pydantic model for cli args."""
 
-    file_path: FilePath
+    file_path: Optional[FilePath] = None
+    file_paths: List[FilePath] = []
+    resume: bool = False
+    skip_existing: bool = False
+    coalesce: bool = False
+    sync: bool = False
+    stats: bool = False
+    stats_file: Optional[Path] = None
+    receipt: Optional[Path] = None
+    delete_range: Optional[List[str]] = None
+    delete_uploaded: bool = False
+    author: Optional[str] = None
+    manifest: Optional[FilePath] = None
+    watch: bool = False
+    validate_only: bool = False
+    processes: Optional[int] = None
+
+    @field_validator("delete_range")
+    def validate_delete_range(
+        cls,  # noqa: N805
+        value: Optional[List[str]],
+    ) -> Optional[List[str]]:
+        """
+        Pydantic validation for the dates of delete_range.
+
+        :param value: first and last dates.
+        :raises ValueError: when validator condition fails.
+        :return: zero padded dates.
+        """
+        if value is None:
+            return value
+        normalized_dates = [normalize_date(date) for date in value]
+        if None in normalized_dates:
+            raise ValueError("Incorrect date format, should be YYYY-MM-DD")
+        first_date, last_date = normalized_dates
+        if first_date > last_date:  # type: ignore
+            raise ValueError("The first date must not be after the last date")
+        return normalized_dates  # type: ignore
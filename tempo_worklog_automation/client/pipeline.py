@@ -0,0 +1,204 @@
+"""Streaming producer / consumer pipeline for worklog rows."""
+import logging
+from typing import (
+    Any,
+    Awaitable,
+    Callable,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Tuple,
+)
+
+import anyio
+from anyio.streams.memory import MemoryObjectReceiveStream, MemoryObjectSendStream
+
+from tempo_worklog_automation.client.metrics import phase
+from tempo_worklog_automation.client.models import WorklogModel
+from tempo_worklog_automation.client.validation import validate_worklogs
+from tempo_worklog_automation.settings import settings
+
+logger = logging.getLogger(settings.logger_name)
+
+IndexedBatch = Tuple[int, List[Any]]
+IndexedWorklog = Tuple[int, WorklogModel]
+ResolveBatch = Callable[[List[WorklogModel]], Awaitable[None]]
+PostWorklog = Callable[[int, WorklogModel], Awaitable[None]]
+SelectBatch = Callable[[List[IndexedWorklog]], List[IndexedWorklog]]
+
+
+def _next_batch(rows: Iterator[Any], batch_size: int) -> List[Any]:
+    batch = []
+    for row in rows:
+        batch.append(row)
+        if len(batch) >= batch_size:
+            break
+    return batch
+
+
+def _receive_available(
+    receive: MemoryObjectReceiveStream[IndexedWorklog],
+    limit: int,
+) -> List[IndexedWorklog]:
+    available: List[IndexedWorklog] = []
+    while len(available) < limit:
+        try:
+            available.append(receive.receive_nowait())
+        except (anyio.WouldBlock, anyio.EndOfStream):
+            break
+    return available
+
+
+class WorklogPipeline:
+    """
+    Stream worklog rows through read, validate, resolve and post stages.
+
+    Stages are connected by bounded memory object streams, so posting starts while
+    the input is still being read and memory use does not grow with the input size.
+    Rows are read and validated in batches of ``batch_size``. The busy time of each
+    stage is reported to the metrics hooks as the load, validate, resolve and post
+    phases, the post phase adds up the time of every worker.
+    The resolve stage groups the rows already waiting in its queue, so uncached
+    issue names are resolved a batch at a time instead of once per row.
+
+    :param resolve_batch: coroutine function making sure every issue is resolved.
+    :param post: coroutine function posting a single worklog with its row index.
+    :param select: function called in input order with each validated batch,
+        returns the rows to post.
+    :param workers: number of concurrent post workers.
+    :param queue_size: maximum items buffered between two stages.
+    :param batch_size: rows read per worker thread call and resolved per batch.
+    """
+
+    def __init__(
+        self,
+        resolve_batch: ResolveBatch,
+        post: PostWorklog,
+        select: Optional[SelectBatch] = None,
+        workers: int = 10,
+        queue_size: int = 100,
+        batch_size: int = 100,
+    ):
+        self.resolve_batch = resolve_batch
+        self.post = post
+        self.select = select
+        self.workers = workers
+        self.queue_size = queue_size
+        self.batch_size = batch_size
+        self.rows = 0
+        self.invalid = 0
+
+    @classmethod
+    def from_settings(
+        cls,
+        resolve_batch: ResolveBatch,
+        post: PostWorklog,
+        select: Optional[SelectBatch] = None,
+    ) -> "WorklogPipeline":
+        """
+        Create a WorklogPipeline with the pipeline settings.
+
+        :param resolve_batch: coroutine function making sure every issue is resolved.
+        :param post: coroutine function posting a single worklog with its row index.
+        :param select: function called in input order with each validated batch.
+        :return: WorklogPipeline.
+        """
+        return cls(
+            resolve_batch,
+            post,
+            select,
+            workers=settings.upload_workers,
+            queue_size=settings.pipeline_queue_size,
+            batch_size=settings.pipeline_batch_size,
+        )
+
+    async def run(self, rows: Iterable[Any], first_row: int = 1) -> Dict[str, int]:
+        """
+        Run every stage until the rows are exhausted.
+
+        :param rows: row dictionaries or WorklogModel objects, read lazily.
+        :param first_row: row number of the first row.
+        :return: dictionary with the read and invalid row counts.
+        """
+        # Read batches already hold batch_size rows, one queued batch is enough.
+        read_send, read_receive = anyio.create_memory_object_stream(1)
+        valid_send, valid_receive = anyio.create_memory_object_stream(self.queue_size)
+        post_send, post_receive = anyio.create_memory_object_stream(self.queue_size)
+
+        with phase("total"):
+            async with anyio.create_task_group() as tg:
+                tg.start_soon(self._read, rows, first_row, read_send)
+                tg.start_soon(self._validate, read_receive, valid_send)
+                tg.start_soon(self._resolve, valid_receive, post_send)
+                async with post_receive:
+                    for _ in range(self.workers):
+                        tg.start_soon(self._post, post_receive.clone())
+
+        return {"rows": self.rows, "invalid": self.invalid}
+
+    async def _read(
+        self,
+        rows: Iterable[Any],
+        first_row: int,
+        send: MemoryObjectSendStream[IndexedBatch],
+    ) -> None:
+        row_iterator = iter(rows)
+        async with send:
+            while True:  # noqa: WPS457
+                # Row sources may block on file reads, keep them off the event loop.
+                with phase("load"):
+                    batch = await anyio.to_thread.run_sync(
+                        _next_batch,
+                        row_iterator,
+                        self.batch_size,
+                    )
+                if not batch:
+                    return
+                await send.send((first_row, batch))
+                first_row += len(batch)
+                self.rows += len(batch)
+
+    async def _validate(
+        self,
+        receive: MemoryObjectReceiveStream[IndexedBatch],
+        send: MemoryObjectSendStream[IndexedWorklog],
+    ) -> None:
+        async with receive, send:
+            async for first_row, batch in receive:
+                with phase("validate"):
+                    report = validate_worklogs(batch, first_row)
+                for error in report.errors:
+                    logger.error(
+                        "Skipping invalid row %s, %s: %s",
+                        error.row,
+                        error.field,
+                        error.message,
+                    )
+                self.invalid += len(batch) - len(report.worklogs)
+                selected = list(zip(report.rows, report.worklogs))
+                if self.select is not None:
+                    selected = self.select(selected)
+                for item in selected:
+                    await send.send(item)
+
+    async def _resolve(
+        self,
+        receive: MemoryObjectReceiveStream[IndexedWorklog],
+        send: MemoryObjectSendStream[IndexedWorklog],
+    ) -> None:
+        async with receive, send:
+            async for first_item in receive:
+                batch = [first_item]
+                batch.extend(_receive_available(receive, self.batch_size - 1))
+                with phase("resolve"):
+                    await self.resolve_batch([worklog for _, worklog in batch])
+                for item in batch:
+                    await send.send(item)
+
+    async def _post(self, receive: MemoryObjectReceiveStream[IndexedWorklog]) -> None:
+        async with receive:
+            async for index, worklog in receive:
+                with phase("post"):
+                    await self.post(index, worklog)
@@ -0,0 +1,284 @@
+"""Minimal create, update and delete plan turning the remote worklogs into a file."""
+from collections import defaultdict, deque
+from contextlib import closing
+from itertools import islice
+from pathlib import Path
+from typing import (
+    Any,
+    Container,
+    Deque,
+    Dict,
+    Iterable,
+    List,
+    NamedTuple,
+    Optional,
+    Tuple,
+)
+
+import httpx
+
+from tempo_worklog_automation.client.coalesce import time_seconds
+from tempo_worklog_automation.client.exceptions import InvalidWorklogsError
+from tempo_worklog_automation.client.existing import WorklogKey, worklog_key
+from tempo_worklog_automation.client.journal import UploadJournal
+from tempo_worklog_automation.client.models import WorklogModel
+from tempo_worklog_automation.client.utils.readers import iter_worklog_rows
+from tempo_worklog_automation.client.validation import validate_worklogs
+
+# Row number and parse_worklog() payload of a local worklog.
+LocalWorklog = Tuple[int, Dict[str, Any]]
+# Remote worklogs of each issue id and date, in start time order.
+DayWorklogs = Dict[Tuple[int, str], Deque[Dict[str, Any]]]
+
+
+class WorklogUpdate(NamedTuple):
+    """Remote worklog to rewrite with the payload of a local row."""
+
+    row: int
+    worklog_id: int
+    payload: Dict[str, Any]
+
+
+class WorklogMatch(NamedTuple):
+    """Remote worklog identical to a local row."""
+
+    row: int
+    worklog_id: int
+    owned: bool
+
+
+class ReconcilePlan(NamedTuple):
+    """Requests turning the remote worklogs of a date window into the local rows."""
+
+    creates: List[LocalWorklog]
+    updates: List[WorklogUpdate]
+    deletes: List[int]
+    unchanged: List[WorklogMatch]
+
+    @property
+    def requests(self) -> int:
+        """
+        Number of requests needed to apply the plan.
+
+        :return: count of creates, updates and deletes.
+        """
+        return len(self.creates) + len(self.updates) + len(self.deletes)
+
+    def summary(self) -> Dict[str, int]:
+        """
+        Count the planned requests by kind.
+
+        :return: dictionary with the create, update, delete and unchanged counts.
+        """
+        return {
+            "create": len(self.creates),
+            "update": len(self.updates),
+            "delete": len(self.deletes),
+            "unchanged": len(self.unchanged),
+        }
+
+
+class SyncJournal:
+    """
+    Record in the upload journal the remote worklog each synchronised row owns.
+
+    Deleted worklogs are marked in the journal, so the next sync does not own them.
+
+    :param journal: UploadJournal the rows were selected from, None records nothing.
+    """
+
+    def __init__(self, journal: Optional[UploadJournal]):
+        self.journal = journal
+
+    def record_unchanged(self, matches: Iterable[WorklogMatch]) -> None:
+        """
+        Record the rows identical to a remote worklog, as matched when not owned.
+
+        :param matches: WorklogMatch of the unchanged rows.
+        """
+        if self.journal is None:
+            return
+        for match in matches:
+            if match.owned:
+                self.journal.record_created(match.row, match.worklog_id)
+            else:
+                self.journal.record_matched(match.row, match.worklog_id)
+
+    def record_created(self, row_number: int, response: httpx.Response) -> None:
+        """
+        Record a row created by the sync.
+
+        :param row_number: row number in the file.
+        :param response: response of the create request.
+        """
+        if self.journal is not None:
+            self.journal.record_created(row_number, response.json()["tempoWorklogId"])
+
+    def record_updated(self, update: WorklogUpdate, response: httpx.Response) -> None:
+        """
+        Record a row whose remote worklog was rewritten by the sync.
+
+        :param update: WorklogUpdate of the row.
+        :param response: response of the update request.
+        """
+        if self.journal is not None:
+            self.journal.record_created(update.row, update.worklog_id)
+
+    def record_deleted(self, worklog_id: int, response: httpx.Response) -> None:
+        """
+        Record a remote worklog deleted by the sync.
+
+        :param worklog_id: tempoWorklogId of the deleted worklog.
+        :param response: response of the delete request.
+        """
+        if self.journal is not None:
+            self.journal.mark_deleted([worklog_id])
+
+
+def _payload_key(payload: Dict[str, Any]) -> WorklogKey:
+    return worklog_key(
+        payload["issueId"],
+        payload["startDate"],
+        payload["startTime"],
+        payload["timeSpentSeconds"],
+    )
+
+
+def _remote_key(remote_worklog: Dict[str, Any]) -> WorklogKey:
+    return worklog_key(
+        remote_worklog["issue"]["id"],
+        remote_worklog["startDate"],
+        remote_worklog["startTime"],
+        remote_worklog["timeSpentSeconds"],
+    )
+
+
+def _remote_slot(remote_worklog: Dict[str, Any]) -> Tuple[int, str, int]:
+    return (
+        int(remote_worklog["issue"]["id"]),
+        remote_worklog["startDate"],
+        time_seconds(remote_worklog["startTime"]),
+    )
+
+
+def _local_slot(local_worklog: LocalWorklog) -> Tuple[int, str, int, int]:
+    row_number, payload = local_worklog
+    return (
+        int(payload["issueId"]),
+        payload["startDate"],
+        time_seconds(payload["startTime"]),
+        row_number,
+    )
+
+
+def plan_reconciliation(
+    local_worklogs: Iterable[LocalWorklog],
+    remote_worklogs: Iterable[Dict[str, Any]],
+    owned_ids: Container[int],
+) -> ReconcilePlan:
+    """
+    Match the local rows to the remote worklogs and plan the requests left to send.
+
+    Rows identical to a remote worklog, by issue, date, start time and duration, are
+    left alone. The remaining rows and the remaining owned remote worklogs of an
+    issue and day are then paired in start time order: each pair becomes an update
+    of the remote worklog, the extra rows are created and the extra owned remote
+    worklogs deleted. Editing, adding or removing a single row thus costs a single
+    request. Remote worklogs not owned by the file are never updated nor deleted.
+
+    :param local_worklogs: row numbers and parse_worklog() payloads of the file.
+    :param remote_worklogs: worklog objects of the author returned by the Tempo api,
+        covering the date window of the file.
+    :param owned_ids: tempoWorklogId of the remote worklogs uploaded from the file.
+    :return: ReconcilePlan.
+    """
+    remaining: Dict[WorklogKey, List[Dict[str, Any]]] = defaultdict(list)
+    # Owned worklogs come last and are matched first.
+    for remote_worklog in sorted(
+        remote_worklogs,
+        key=lambda remote: remote["tempoWorklogId"] in owned_ids,
+    ):
+        remaining[_remote_key(remote_worklog)].append(remote_worklog)
+
+    unmatched: List[LocalWorklog] = []
+    unchanged: List[WorklogMatch] = []
+    for row_number, payload in local_worklogs:
+        matches = remaining.get(_payload_key(payload))
+        if matches:
+            worklog_id = matches.pop()["tempoWorklogId"]
+            unchanged.append(
+                WorklogMatch(row_number, worklog_id, worklog_id in owned_ids),
+            )
+        else:
+            unmatched.append((row_number, payload))
+
+    creates, updates, leftovers = _pair_updates(
+        unmatched,
+        (
+            remote
+            for matches in remaining.values()
+            for remote in matches
+            if remote["tempoWorklogId"] in owned_ids
+        ),
+    )
+    deletes = [
+        remote_worklog["tempoWorklogId"]
+        for day_worklogs in leftovers.values()
+        for remote_worklog in day_worklogs
+    ]
+    return ReconcilePlan(creates, updates, deletes, unchanged)
+
+
+def _pair_updates(
+    unmatched: List[LocalWorklog],
+    remote_worklogs: Iterable[Dict[str, Any]],
+) -> Tuple[List[LocalWorklog], List[WorklogUpdate], DayWorklogs]:
+    by_day: DayWorklogs = defaultdict(deque)
+    for remote_worklog in sorted(remote_worklogs, key=_remote_slot):
+        by_day[_remote_slot(remote_worklog)[:2]].append(remote_worklog)
+
+    creates: List[LocalWorklog] = []
+    updates: List[WorklogUpdate] = []
+    for local_worklog in sorted(unmatched, key=_local_slot):
+        row_number, payload = local_worklog
+        day_worklogs = by_day.get(_local_slot(local_worklog)[:2])
+        if day_worklogs:
+            remote_worklog = day_worklogs.popleft()
+            updates.append(
+                WorklogUpdate(row_number, remote_worklog["tempoWorklogId"], payload),
+            )
+        else:
+            creates.append(local_worklog)
+    return creates, updates, by_day
+
+
+def load_worklogs_file(
+    file_path: Path,
+    batch_size: int = 1000,
+) -> List[Tuple[int, WorklogModel]]:
+    """
+    Validate every row of a worklogs file and keep them in memory.
+
+    A file to synchronise must be valid as a whole: a skipped invalid row would
+    otherwise have its remote worklog deleted.
+
+    :param file_path: Path object for the worklogs file.
+    :param batch_size: rows validated per batch.
+    :raises InvalidWorklogsError: when some row is invalid.
+    :return: list of row numbers and worklogs.
+    """
+    worklogs: List[Tuple[int, WorklogModel]] = []
+    first_row = 1
+    invalid_rows = 0
+    with closing(iter_worklog_rows(file_path)) as rows:
+        while True:
+            batch = list(islice(rows, batch_size))
+            if not batch:
+                break
+            report = validate_worklogs(batch, first_row)
+            worklogs.extend(zip(report.rows, report.worklogs))
+            invalid_rows += len(batch) - len(report.rows)
+            first_row += len(batch)
+    if invalid_rows:
+        raise InvalidWorklogsError(str(file_path), invalid_rows)
+    return worklogs
@@ -0,0 +1,271 @@
+"""Compact per-row outcomes of the create and delete requests."""
+import csv
+import json
+import time
+from array import array
+from pathlib import Path
+from types import TracebackType
+from typing import IO, Dict, Iterator, List, NamedTuple, Optional, Type
+
+import httpx
+
+RECEIPT_FIELDS = ("row", "status", "worklog_id", "attempts", "seconds", "outcome")
+
+# Worklog id column value of the rows without a worklog id.
+NO_WORKLOG_ID = -1
+
+SUCCEEDED = "succeeded"
+FAILED = "failed"
+RETRYABLE = "retryable"
+
+
+def classify_outcome(status: int, worklog_id: Optional[int]) -> str:
+    """
+    Sort the outcome of a row into succeeded, failed or retryable.
+
+    Successful responses and rows matched to an existing worklog succeeded. Rows
+    left without a response, throttled or answered with a server error may succeed
+    when sent again, any other error response needs the row to be fixed first.
+
+    :param status: http response code of the last response, 0 when none.
+    :param worklog_id: worklog id of the row, if any.
+    :return: SUCCEEDED, FAILED or RETRYABLE.
+    """
+    if 200 <= status < 300 or (status == 0 and worklog_id is not None):  # noqa: WPS432
+        return SUCCEEDED
+    if status in {0, 429} or status >= 500:  # noqa: WPS432
+        return RETRYABLE
+    return FAILED
+
+
+class RowOutcome(NamedTuple):
+    """
+    Outcome of the requests made for a row.
+
+    The status is the one of the last response, 0 when no request was answered
+    or needed, attempts counts the responses including the throttled ones.
+    """
+
+    row: int
+    status: int
+    worklog_id: Optional[int]
+    attempts: int
+    seconds: float
+
+    @property
+    def outcome(self) -> str:
+        """
+        Whether the row succeeded, failed or can be retried as is.
+
+        :return: SUCCEEDED, FAILED or RETRYABLE.
+        """
+        return classify_outcome(self.status, self.worklog_id)
+
+
+class ResultSink:
+    """
+    Receive the outcome of each row as soon as its requests complete.
+
+    The base sink keeps the number of rows and retries only, subclasses store or
+    stream the outcomes.
+    """
+
+    def __init__(self) -> None:
+        self.rows = 0
+        self.retries = 0
+
+    def __enter__(self) -> "ResultSink":
+        return self
+
+    def __exit__(
+        self,
+        exc_type: Optional[Type[BaseException]],
+        exc_value: Optional[BaseException],
+        traceback: Optional[TracebackType],
+    ) -> None:
+        self.close()
+
+    def record(self, outcome: RowOutcome) -> None:
+        """
+        Record the outcome of a row.
+
+        :param outcome: RowOutcome.
+        """
+        self.rows += 1
+        self.retries += max(outcome.attempts - 1, 0)
+
+    def close(self) -> None:
+        """Release the resources of the sink."""
+
+
+class MemoryResultSink(ResultSink):
+    """Keep the outcomes in typed arrays, a few bytes per row."""
+
+    def __init__(self) -> None:
+        super().__init__()
+        self._rows = array("L")
+        self._statuses = array("H")
+        self._worklog_ids = array("q")
+        self._attempts = array("H")
+        self._seconds = array("f")
+
+    def __len__(self) -> int:
+        return len(self._rows)
+
+    def __iter__(self) -> Iterator[RowOutcome]:
+        columns = zip(
+            self._rows,
+            self._statuses,
+            self._worklog_ids,
+            self._attempts,
+            self._seconds,
+        )
+        for row, status, worklog_id, attempts, seconds in columns:
+            yield RowOutcome(
+                row,
+                status,
+                None if worklog_id == NO_WORKLOG_ID else worklog_id,
+                attempts,
+                seconds,
+            )
+
+    def record(self, outcome: RowOutcome) -> None:
+        """
+        Append the outcome of a row to the arrays.
+
+        :param outcome: RowOutcome.
+        """
+        super().record(outcome)
+        self._rows.append(outcome.row)
+        self._statuses.append(outcome.status)
+        self._worklog_ids.append(
+            NO_WORKLOG_ID if outcome.worklog_id is None else outcome.worklog_id,
+        )
+        self._attempts.append(outcome.attempts)
+        self._seconds.append(outcome.seconds)
+
+    @property
+    def status_codes(self) -> List[int]:
+        """
+        Final status of each row, in completion order.
+
+        :return: list of http response codes.
+        """
+        return self._statuses.tolist()
+
+    @property
+    def worklog_ids(self) -> List[int]:
+        """
+        Worklog id of each successful row, in completion order.
+
+        :return: list of worklog ids.
+        """
+        return [
+            worklog_id
+            for status, worklog_id in zip(self._statuses, self._worklog_ids)
+            if worklog_id != NO_WORKLOG_ID and 200 <= status < 300  # noqa: WPS432
+        ]
+
+    def rows_by_outcome(self) -> Dict[str, List[int]]:
+        """
+        Row numbers of the succeeded, failed and retryable rows.
+
+        :return: dictionary with the sorted row numbers of each outcome.
+        """
+        rows: Dict[str, List[int]] = {SUCCEEDED: [], FAILED: [], RETRYABLE: []}
+        for outcome in self:
+            rows[outcome.outcome].append(outcome.row)
+        return {kind: sorted(row_numbers) for kind, row_numbers in rows.items()}
+
+
+class FileResultSink(ResultSink):
+    """
+    Stream the outcomes to a receipt file, CSV for .csv files and JSON Lines otherwise.
+
+    :param path: receipt file, replaced when it exists.
+    """
+
+    def __init__(self, path: Path):
+        super().__init__()
+        self.path = path
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self._file: IO[str] = open(path, "w", newline="")  # noqa: WPS515
+        self._csv_writer = None
+        if path.suffix == ".csv":
+            self._csv_writer = csv.writer(self._file)
+            self._csv_writer.writerow(RECEIPT_FIELDS)
+
+    def record(self, outcome: RowOutcome) -> None:
+        """
+        Write the outcome of a row to the receipt.
+
+        :param outcome: RowOutcome.
+        """
+        super().record(outcome)
+        rounded = outcome._replace(seconds=round(outcome.seconds, 6))
+        if self._csv_writer is None:
+            entry = {**rounded._asdict(), "outcome": outcome.outcome}
+            self._file.write(f"{json.dumps(entry)}\n")
+        else:
+            self._csv_writer.writerow(
+                ["" if field is None else field for field in rounded]
+                + [outcome.outcome],
+            )
+
+    def close(self) -> None:
+        """Flush and close the receipt file."""
+        self._file.close()
+
+
+class OutcomeRecorder:
+    """
+    Count the responses of a row and time it until its outcome is recorded.
+
+    :param sink: ResultSink receiving the outcome.
+    :param row: row number or index of the request.
+    :param worklog_id: worklog id known before the request, for deletions.
+    :param rows: rows covered by a coalesced request, each gets the outcome,
+        defaults to the row alone.
+    """
+
+    def __init__(
+        self,
+        sink: ResultSink,
+        row: int,
+        worklog_id: Optional[int] = None,
+        rows: Optional[List[int]] = None,
+    ):
+        self.sink = sink
+        self.row = row
+        self.rows = rows or [row]
+        self.worklog_id = worklog_id
+        self.attempts = 0
+        self.status = 0
+        self._started_at = time.monotonic()
+
+    def on_response(self, response: httpx.Response) -> None:
+        """
+        Count a response of the row, throttled ones included.
+
+        :param response: httpx.Response.
+        """
+        self.attempts += 1
+        self.status = response.status_code
+
+    def record(self, worklog_id: Optional[int] = None) -> None:
+        """
+        Send the outcome of the rows to the sink.
+
+        :param worklog_id: worklog id returned by the request, if any.
+        """
+        seconds = time.monotonic() - self._started_at
+        for row in self.rows:
+            self.sink.record(
+                RowOutcome(
+                    row,
+                    self.status,
+                    self.worklog_id if worklog_id is None else worklog_id,
+                    self.attempts,
+                    seconds,
+                ),
+            )
@@ -0,0 +1,198 @@
+"""Retry policy shared by the Jira and Tempo api requests."""
+import logging
+import random
+from typing import Awaitable, Callable, FrozenSet, Iterable, Optional, Tuple, Type
+
+import anyio
+import httpx
+
+from tempo_worklog_automation.client.metrics import record_backoff, record_retry
+from tempo_worklog_automation.client.throttle import (
+    MAX_RETRY_AFTER_SECONDS,
+    RateLimiter,
+    parse_retry_after,
+)
+from tempo_worklog_automation.settings import RetryJitter, settings
+
+logger = logging.getLogger(settings.logger_name)
+
+RequestSender = Callable[[], Awaitable[httpx.Response]]
+
+
+def _discard_response(response: httpx.Response) -> None:
+    """Ignore a response when the caller does not need it."""
+
+
+class RetryPolicy:
+    """
+    Decide which failed requests are retried and how long to wait before each retry.
+
+    Retryable responses and exceptions are retried up to ``max_retries`` times per
+    request, while the retry budget of the RateLimiter has retries left. The wait
+    grows exponentially from ``backoff_factor``, capped at ``max_backoff`` and
+    randomised by the jitter, and is never shorter than the Retry-After header.
+
+    :param max_retries: retries of a single request.
+    :param backoff_factor: seconds of the first wait.
+    :param max_backoff: maximum seconds of a wait, ignored for Retry-After.
+    :param jitter: RetryJitter randomising the waits.
+    :param retry_statuses: http response codes retried.
+    :param retry_exceptions: httpx exception types retried.
+    """
+
+    def __init__(  # noqa: WPS211
+        self,
+        max_retries: int = 5,
+        backoff_factor: float = 0.5,
+        max_backoff: float = 30,
+        jitter: RetryJitter = RetryJitter.FULL,
+        retry_statuses: Iterable[int] = (429, 500, 502, 503, 504),
+        retry_exceptions: Tuple[Type[httpx.HTTPError], ...] = (httpx.TransportError,),
+    ):
+        self.max_retries = max_retries
+        self.backoff_factor = backoff_factor
+        self.max_backoff = max_backoff
+        self.jitter = jitter
+        self.retry_statuses: FrozenSet[int] = frozenset(retry_statuses)
+        self.retry_exceptions = retry_exceptions
+
+    @classmethod
+    def from_settings(
+        cls,
+        max_retries: Optional[int] = None,
+        backoff_factor: Optional[float] = None,
+    ) -> "RetryPolicy":
+        """
+        Create a RetryPolicy with the retry settings.
+
+        :param max_retries: retries of a single request, defaults to the settings.
+        :param backoff_factor: seconds of the first wait, defaults to the settings.
+        :return: RetryPolicy.
+        """
+        return cls(
+            max_retries=(
+                settings.retry_max_retries if max_retries is None else max_retries
+            ),
+            backoff_factor=(
+                settings.retry_backoff_factor
+                if backoff_factor is None
+                else backoff_factor
+            ),
+            max_backoff=settings.retry_max_backoff,
+            jitter=settings.retry_jitter,
+            retry_statuses=settings.retry_statuses,
+            retry_exceptions=(
+                (httpx.TransportError,) if settings.retry_transport_errors else ()
+            ),
+        )
+
+    def wait_time(
+        self,
+        attempt: int,
+        previous_wait: float = 0,
+        retry_after: Optional[float] = None,
+    ) -> float:
+        """
+        Seconds to wait before retrying a request.
+
+        :param attempt: index of the failed attempt, 0 for the first request.
+        :param previous_wait: wait before the failed attempt, for decorrelated jitter.
+        :param retry_after: seconds requested by the api before retrying.
+        :return: seconds.
+        """
+        exponential = self.backoff_factor * 2**attempt
+        if self.jitter == RetryJitter.FULL:
+            wait = random.uniform(0, exponential)  # noqa: S311
+        elif self.jitter == RetryJitter.DECORRELATED:
+            wait = random.uniform(  # noqa: S311
+                self.backoff_factor,
+                max(previous_wait, self.backoff_factor) * 3,
+            )
+        else:
+            wait = exponential
+        return max(
+            min(wait, self.max_backoff),
+            min(retry_after or 0, MAX_RETRY_AFTER_SECONDS),
+        )
+
+    async def send(
+        self,
+        send_request: RequestSender,
+        limiter: RateLimiter,
+        on_response: Optional[Callable[[httpx.Response], None]] = None,
+    ) -> httpx.Response:
+        """
+        Send a request through the limiter, retrying it according to the policy.
+
+        Every response is reported to the limiter, for the adaptive rate and the
+        circuit breaker, and to ``on_response``.
+
+        :param send_request: coroutine function sending the request once.
+        :param limiter: RateLimiter of the api, holding its breaker and retry budget.
+        :param on_response: callable receiving every response, including retried ones.
+        :raises httpx.HTTPStatusError: when the api answers a non retryable error.
+        :raises httpx.HTTPError: when the request fails and can not be retried.
+        :return: successful httpx.Response, or the last one when retries ran out.
+        """
+        wait = 0.0
+        attempt = 0
+        while True:  # noqa: WPS457
+            try:
+                async with limiter:
+                    response = await send_request()
+            except self.retry_exceptions as exc:
+                limiter.on_failure()
+                if not self._may_retry(attempt, limiter):
+                    raise
+                logger.debug("%r while requesting %r.", exc, exc.request.url)
+                record_retry(exc.request, 0)
+                retry_after = None
+            else:
+                (on_response or _discard_response)(response)
+                if not self._retry_response(response, attempt, limiter):
+                    return self._checked(response)
+                retry_after = parse_retry_after(response)
+            wait = self.wait_time(attempt, wait, retry_after)
+            logger.debug("Retrying in %.2f seconds...", wait)
+            record_backoff(wait)
+            await anyio.sleep(wait)
+            attempt += 1
+
+    def _may_retry(self, attempt: int, limiter: RateLimiter) -> bool:
+        return attempt < self.max_retries and limiter.retry_budget.try_spend()
+
+    def _retry_response(
+        self,
+        response: httpx.Response,
+        attempt: int,
+        limiter: RateLimiter,
+    ) -> bool:
+        """Report a response to the limiter and tell whether to retry it."""
+        if response.status_code == 429:  # noqa: WPS432
+            limiter.on_throttled(parse_retry_after(response))
+        elif response.is_server_error:
+            limiter.on_failure()
+        elif response.is_success:
+            limiter.on_success()
+        else:
+            limiter.breaker.record_success()
+        if response.status_code not in self.retry_statuses:
+            return False
+        if not self._may_retry(attempt, limiter):
+            logger.debug("All retries failed for %r.", response.request.url)
+            return False
+        record_retry(response.request, response.status_code)
+        return True
+
+    def _checked(self, response: httpx.Response) -> httpx.Response:
+        if response.is_error and response.status_code not in self.retry_statuses:
+            if logger.isEnabledFor(logging.DEBUG):
+                # Decoding the body is skipped unless it is logged.
+                logger.debug(
+                    "Error response %r while requesting %r.\n\t%s",
+                    response.status_code,
+                    response.request.url,
+                    response.text,
+                )
+            response.raise_for_status()
+        return response
@@ -0,0 +1,212 @@
+"""Detection of overlapping worklogs and overbooked days before an upload."""
+from contextlib import closing
+from itertools import groupby, islice
+from operator import itemgetter
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, NamedTuple, Optional, Tuple
+
+from tempo_worklog_automation.client.coalesce import time_seconds
+from tempo_worklog_automation.client.models import WorklogModel
+from tempo_worklog_automation.client.utils.readers import iter_worklog_rows
+from tempo_worklog_automation.client.validation import validate_worklogs
+
+DAY_SECONDS = 86400
+
+# Start date, start and end seconds and row number of a worklog.
+Interval = Tuple[str, int, int, int]
+
+
+class Overlap(NamedTuple):
+    """Worklog starting before an earlier worklog of the same day ends."""
+
+    start_date: str
+    row: int
+    other_row: int
+    seconds: int
+
+
+class OverbookedDay(NamedTuple):
+    """Day whose worklogs add up to more than 24 hours."""
+
+    start_date: str
+    seconds: int
+
+
+class ScheduleReport(NamedTuple):
+    """Overlaps and overbooked days of a set of worklogs."""
+
+    overlaps: List[Overlap]
+    overbooked_days: List[OverbookedDay]
+
+    def __bool__(self) -> bool:
+        return bool(self.overlaps or self.overbooked_days)
+
+    def format_lines(self) -> Iterator[str]:
+        """
+        Describe each overlap and overbooked day on a line.
+
+        :yield: line strings, prefixed with the row number for the overlaps.
+        """
+        for overlap in self.overlaps:
+            yield f"{overlap.row}: overlaps row {overlap.other_row} on {overlap.start_date} by {overlap.seconds}s"  # noqa: E501
+        for day in self.overbooked_days:
+            yield f"{day.start_date}: {day.seconds / 3600:g}h booked, more than 24h"
+
+
+def worklog_interval(row_number: int, worklog: WorklogModel) -> Interval:
+    """
+    Compute the time slot booked by a worklog.
+
+    :param row_number: row number of the worklog.
+    :param worklog: WorklogModel.
+    :return: tuple with the start date, start and end seconds and row number.
+    """
+    start_seconds = time_seconds(worklog.start_time)
+    return (
+        worklog.start_date,
+        start_seconds,
+        start_seconds + worklog.time_spent,
+        row_number,
+    )
+
+
+def find_schedule_conflicts(intervals: List[Interval]) -> ScheduleReport:
+    """
+    Find the overlapping worklogs and the overbooked days with a sort and sweep.
+
+    Intervals are sorted by date and start, then each day is swept once while
+    keeping the interval ending last, so each worklog starting before it ends is
+    reported against it. The list is sorted in place.
+
+    :param intervals: list of intervals from worklog_interval().
+    :return: ScheduleReport.
+    """
+    intervals.sort()
+    overlaps: List[Overlap] = []
+    overbooked_days: List[OverbookedDay] = []
+    for start_date, day_intervals in groupby(intervals, key=itemgetter(0)):
+        day_list = list(day_intervals)
+        _sweep_day(day_list, overlaps)
+        day_seconds = sum(end - start for _, start, end, _ in day_list)
+        if day_seconds > DAY_SECONDS:
+            overbooked_days.append(OverbookedDay(start_date, day_seconds))
+    return ScheduleReport(overlaps, overbooked_days)
+
+
+def _sweep_day(
+    day_intervals: List[Interval], overlaps: List[Overlap]
+) -> List[Interval]:
+    # Returns the busy slots of the day, touching and overlapping intervals merged
+    # into one slot carrying the row of the interval ending last.
+    busy: List[Interval] = []
+    for interval in sorted(day_intervals):
+        start_date, start, end, row_number = interval
+        if not busy or start > busy[-1][2]:
+            busy.append(interval)
+            continue
+        _, busy_start, busy_end, busy_row = busy[-1]
+        if start < busy_end:
+            overlaps.append(
+                Overlap(start_date, row_number, busy_row, min(end, busy_end) - start),
+            )
+        if end > busy_end:
+            busy[-1] = (start_date, busy_start, end, row_number)
+    return busy
+
+
+class ScheduleChecker:
+    """
+    Find the overlapping worklogs and the overbooked days of streamed worklogs.
+
+    The intervals of the day being read are kept until a worklog of another day
+    comes, then the day is swept and only its busy slots are kept, back-to-back
+    and overlapping worklogs merged into one. Memory grows with the slots of each
+    day rather than with the rows. A day read again later is swept with its slots,
+    so a late worklog overlapping it is reported against the row ending its slot.
+    """
+
+    def __init__(self) -> None:
+        self._overlaps: List[Overlap] = []
+        self._day_seconds: Dict[str, int] = {}
+        self._busy: Dict[str, List[Interval]] = {}
+        self._open_date: Optional[str] = None
+        self._open_intervals: List[Interval] = []
+
+    def add_worklogs(self, worklogs: Iterable[Tuple[int, WorklogModel]]) -> None:
+        """
+        Add validated worklogs, in file order.
+
+        :param worklogs: iterable of row numbers and worklogs.
+        """
+        for row_number, worklog in worklogs:
+            interval = worklog_interval(row_number, worklog)
+            start_date, start, end, _ = interval
+            if start_date != self._open_date:
+                self._close_day()
+                self._open_date = start_date
+                self._open_intervals = self._busy.pop(start_date, [])
+            self._open_intervals.append(interval)
+            self._day_seconds[start_date] = (
+                self._day_seconds.get(start_date, 0) + end - start
+            )
+
+    def report(self) -> ScheduleReport:
+        """
+        Report the conflicts of the worklogs added so far.
+
+        :return: ScheduleReport, the overlaps ordered by date.
+        """
+        self._close_day()
+        return ScheduleReport(
+            sorted(self._overlaps, key=itemgetter(0)),
+            [
+                OverbookedDay(start_date, day_seconds)
+                for start_date, day_seconds in sorted(self._day_seconds.items())
+                if day_seconds > DAY_SECONDS
+            ],
+        )
+
+    def _close_day(self) -> None:
+        if self._open_date is not None:
+            self._busy[self._open_date] = _sweep_day(
+                self._open_intervals,
+                self._overlaps,
+            )
+        self._open_date = None
+        self._open_intervals = []
+
+
+def check_worklogs(worklogs: Iterable[Tuple[int, WorklogModel]]) -> ScheduleReport:
+    """
+    Find the overlapping worklogs and the overbooked days of validated worklogs.
+
+    :param worklogs: iterable of row numbers and worklogs.
+    :return: ScheduleReport.
+    """
+    return find_schedule_conflicts(
+        [worklog_interval(row_number, worklog) for row_number, worklog in worklogs],
+    )
+
+
+def check_worklogs_file(file_path: Path, batch_size: int = 1000) -> ScheduleReport:
+    """
+    Find the overlapping worklogs and the overbooked days of a worklogs file.
+
+    The file is streamed a batch at a time through a ScheduleChecker, invalid rows
+    are left to the validation to report.
+
+    :param file_path: Path object for the worklogs file.
+    :param batch_size: rows validated per batch.
+    :return: ScheduleReport.
+    """
+    schedule = ScheduleChecker()
+    first_row = 1
+    with closing(iter_worklog_rows(file_path)) as rows:
+        while True:
+            batch = list(islice(rows, batch_size))
+            if not batch:
+                break
+            report = validate_worklogs(batch, first_row)
+            schedule.add_worklogs(zip(report.rows, report.worklogs))
+            first_row += len(batch)
+    return schedule.report()
@@ -0,0 +1,144 @@
+"""Shared pooled http clients for the Jira and Tempo apis."""
+import logging
+from contextlib import asynccontextmanager
+from importlib.util import find_spec
+from types import TracebackType
+from typing import AsyncIterator, Optional, Type
+
+import anyio
+import httpx
+
+from tempo_worklog_automation.client.metrics import (
+    on_request_event,
+    on_response_event,
+)
+from tempo_worklog_automation.settings import settings
+
+logger = logging.getLogger(settings.logger_name)
+
+
+class HttpSession:
+    """
+    Hold one pooled httpx.AsyncClient per api host, shared by every request path.
+
+    Jira lookups, Tempo posts and Tempo deletes reuse the same keep-alive
+    connections instead of paying a new TCP and TLS handshake for each request.
+    HTTP/2 needs the optional ``h2`` package, without it HTTP/1.1 is used.
+    Every response is reported to the registered metrics hooks.
+
+    :param http2: whether to negotiate HTTP/2 multiplexing.
+    :param max_connections: maximum open connections per host.
+    :param max_keepalive_connections: maximum idle connections kept per host.
+    :param keepalive_expiry: seconds an idle connection is kept open.
+    :param timeout: seconds before a request times out.
+    :param transport: transport of both clients instead of the pooled ones, for
+        tests.
+    """
+
+    def __init__(  # noqa: WPS211
+        self,
+        http2: bool = False,
+        max_connections: int = 20,
+        max_keepalive_connections: int = 20,
+        keepalive_expiry: float = 30,
+        timeout: float = 5,
+        transport: Optional[httpx.AsyncBaseTransport] = None,
+    ):
+        if http2 and find_spec("h2") is None:
+            logger.warning("HTTP/2 needs the h2 package, falling back to HTTP/1.1.")
+            http2 = False
+        self.http2 = http2
+        self.limits = httpx.Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=max_keepalive_connections,
+            keepalive_expiry=keepalive_expiry,
+        )
+        self.timeout = httpx.Timeout(timeout)
+        self.transport = transport
+        self.jira = self._create_client()
+        self.tempo = self._create_client()
+
+    @classmethod
+    def from_settings(cls) -> "HttpSession":
+        """
+        Create an HttpSession with the connection pool settings.
+
+        :return: HttpSession.
+        """
+        return cls(
+            http2=settings.http2,
+            max_connections=settings.http_max_connections,
+            max_keepalive_connections=settings.http_max_keepalive_connections,
+            keepalive_expiry=settings.http_keepalive_expiry,
+            timeout=settings.http_timeout,
+        )
+
+    async def __aenter__(self) -> "HttpSession":
+        await self.jira.__aenter__()
+        await self.tempo.__aenter__()
+        return self
+
+    async def __aexit__(
+        self,
+        exc_type: Optional[Type[BaseException]],
+        exc_value: Optional[BaseException],
+        traceback: Optional[TracebackType],
+    ) -> None:
+        await self.aclose()
+
+    async def aclose(self) -> None:
+        """Close the connection pools of both clients."""
+        await self.jira.aclose()
+        await self.tempo.aclose()
+
+    async def prewarm(self, connections: Optional[int] = None) -> None:
+        """
+        Open connections to both api hosts ahead of the first real request.
+
+        Each connection is opened with a HEAD request to the host root, the
+        response status is irrelevant, only the established connection is kept.
+
+        :param connections: concurrent connections to open per host.
+        """
+        connections = connections or settings.http_prewarm_connections
+        async with anyio.create_task_group() as tg:
+            for _ in range(connections):
+                tg.start_soon(_open_connection, self.jira, settings.jira_base_api_url)
+                tg.start_soon(_open_connection, self.tempo, settings.tempo_base_api_url)
+
+    def _create_client(self) -> httpx.AsyncClient:
+        return httpx.AsyncClient(
+            http2=self.http2,
+            limits=self.limits,
+            timeout=self.timeout,
+            transport=self.transport,
+            event_hooks={
+                "request": [on_request_event],
+                "response": [on_response_event],
+            },
+        )
+
+
+@asynccontextmanager
+async def session_scope(
+    session: Optional[HttpSession] = None,
+) -> AsyncIterator[HttpSession]:
+    """
+    Yield the given HttpSession or a new one closed on exit.
+
+    :param session: HttpSession owned by the caller, None creates a new one.
+    :yield: HttpSession.
+    """
+    if session is not None:
+        yield session
+        return
+    async with HttpSession.from_settings() as new_session:
+        yield new_session
+
+
+async def _open_connection(client: httpx.AsyncClient, url: str) -> None:
+    origin = httpx.URL(url).join("/")
+    try:
+        await client.head(origin)
+    except httpx.HTTPError as exc:
+        logger.debug("Could not pre-warm connection to %s: %r", origin, exc)
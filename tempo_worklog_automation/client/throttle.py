@@ -0,0 +1,337 @@
+"""Concurrency and request rate limiting for api calls."""
+import logging
+import math
+import time
+from email.utils import parsedate_to_datetime
+from types import TracebackType
+from typing import Optional, Type
+
+import anyio
+import httpx
+
+from tempo_worklog_automation.settings import settings
+
+logger = logging.getLogger(settings.logger_name)
+
+MIN_REQUESTS_PER_SECOND = 0.5
+# Longest Retry-After honoured, longer or broken headers must not stall a run.
+MAX_RETRY_AFTER_SECONDS = 300
+
+
+def parse_retry_after(response: httpx.Response) -> Optional[float]:
+    """
+    Parse the Retry-After header of a response.
+
+    :param response: throttled httpx.Response.
+    :return: seconds to wait, at most MAX_RETRY_AFTER_SECONDS, or None when the
+        header is missing or invalid.
+    """
+    header_value = response.headers.get("Retry-After")
+    if header_value is None:
+        return None
+    seconds = _retry_after_seconds(header_value)
+    if seconds is None or not math.isfinite(seconds):
+        return None
+    return min(max(seconds, 0), MAX_RETRY_AFTER_SECONDS)
+
+
+def _retry_after_seconds(header_value: str) -> Optional[float]:
+    try:
+        return float(header_value)
+    except ValueError:
+        pass  # noqa: WPS420
+    try:
+        retry_at = parsedate_to_datetime(header_value)
+    except (TypeError, ValueError):
+        return None
+    return retry_at.timestamp() - time.time()
+
+
+class TokenBucket:
+    """
+    Token bucket allowing ``rate`` acquisitions per second on average.
+
+    :param rate: tokens added per second, 0 or less disables the bucket.
+    :param capacity: maximum tokens stored, defaults to one second worth of tokens.
+    """
+
+    def __init__(self, rate: float, capacity: Optional[float] = None):
+        self.rate = rate
+        self.capacity = capacity or max(rate, 1)
+        self._tokens = self.capacity
+        self._updated_at = time.monotonic()
+        self._lock: Optional[anyio.Lock] = None
+
+    async def acquire(self) -> None:
+        """Wait until a token is available and take it."""
+        if self.rate <= 0:
+            return
+        if self._lock is None:
+            self._lock = anyio.Lock()
+        # Waiters queue on the lock, so tokens are handed out in arrival order.
+        async with self._lock:
+            self._refill()
+            while self._tokens < 1:
+                await anyio.sleep((1 - self._tokens) / self.rate)
+                self._refill()
+            self._tokens -= 1
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        elapsed = now - self._updated_at
+        self._tokens = min(self.capacity, self._tokens + elapsed * self.rate)
+        self._updated_at = now
+
+
+class CircuitOpenError(httpx.HTTPError):
+    """Raised instead of sending a request while the api circuit breaker is open."""
+
+    def __init__(self, retry_in: float):
+        self.retry_in = retry_in
+        super().__init__(
+            f"Circuit breaker open after repeated failures, retry in {retry_in:.1f}s.",
+        )
+
+
+class CircuitBreaker:
+    """
+    Stop sending requests to an api answering with consecutive failures.
+
+    Server errors and transport errors count as failures, any other response
+    closes the breaker. Once open, requests fail fast with CircuitOpenError for
+    ``reset_timeout`` seconds, then a single probe request is let through and its
+    outcome closes or opens the breaker again. A probe ending without an outcome,
+    cancelled or sent without recording it, lets the next request probe.
+
+    :param failure_threshold: consecutive failures opening the breaker, 0 or less
+        disables it.
+    :param reset_timeout: seconds the breaker stays open before a probe.
+    """
+
+    def __init__(self, failure_threshold: int = 0, reset_timeout: float = 30):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.failures = 0
+        self.opened = 0
+        self._open_until = 0.0
+        self._probe_task: Optional[int] = None
+
+    @property
+    def is_open(self) -> bool:
+        """
+        Whether the consecutive failures reached the threshold.
+
+        :return: bool.
+        """
+        return 0 < self.failure_threshold <= self.failures
+
+    def before_request(self) -> None:
+        """
+        Let a request through or reject it while the breaker is open.
+
+        :raises CircuitOpenError: when the breaker is open or probing.
+        """
+        if not self.is_open:
+            return
+        retry_in = self._open_until - time.monotonic()
+        if retry_in > 0 or self._probe_task is not None:
+            raise CircuitOpenError(max(retry_in, 0))
+        self._probe_task = anyio.get_current_task().id
+
+    def after_request(self) -> None:
+        """End the probe of the current task, whether or not an outcome was recorded."""
+        if self._probe_task == anyio.get_current_task().id:
+            self._probe_task = None
+
+    def record_success(self) -> None:
+        """Record a response from the api, closing the breaker."""
+        if self.is_open:
+            logger.info("Circuit breaker closed, the api answers again.")
+        self.failures = 0
+        self._probe_task = None
+
+    def record_failure(self) -> None:
+        """Record a server or transport error, opening the breaker at the threshold."""
+        self.failures += 1
+        self._probe_task = None
+        if self.is_open:
+            if self._open_until <= time.monotonic():
+                self.opened += 1
+                logger.warning(
+                    "Circuit breaker open after %s consecutive failures, "
+                    + "pausing requests for %ss.",
+                    self.failures,
+                    self.reset_timeout,
+                )
+            self._open_until = time.monotonic() + self.reset_timeout
+
+
+class RetryBudget:
+    """
+    Retries allowed over a run, shared by the requests against a single api.
+
+    :param limit: maximum retries, 0 or less means unlimited.
+    """
+
+    def __init__(self, limit: int = 0):
+        self.limit = limit
+        self.spent = 0
+        self.denied = 0
+
+    def try_spend(self) -> bool:
+        """
+        Take a retry from the budget.
+
+        :return: whether a retry was left.
+        """
+        if 0 < self.limit <= self.spent:
+            if not self.denied:
+                logger.warning(
+                    "Retry budget of %s retries exhausted, failing without retrying.",
+                    self.limit,
+                )
+            self.denied += 1
+            return False
+        self.spent += 1
+        return True
+
+
+class RateLimiter:
+    """
+    Bound the concurrent requests and the request rate against a single api.
+
+    Use it as an async context manager around each request. In adaptive mode the
+    rate grows additively after each success and is halved after each 429, every
+    throttled response also pauses new requests for its Retry-After period. The
+    circuit breaker and the retry budget of the api are kept here too, so every
+    request path sharing the limiter shares them.
+
+    :param max_concurrency: maximum in-flight requests, 0 or less means unbounded.
+    :param requests_per_second: token bucket rate, 0 or less means unbounded.
+    :param adaptive: whether to adapt the rate to the throttling responses.
+    :param breaker: CircuitBreaker of the api, disabled when None.
+    :param retry_budget: RetryBudget of the api, unlimited when None.
+    """
+
+    def __init__(  # noqa: WPS211
+        self,
+        max_concurrency: int = 0,
+        requests_per_second: float = 0,
+        adaptive: bool = False,
+        breaker: Optional[CircuitBreaker] = None,
+        retry_budget: Optional[RetryBudget] = None,
+    ):
+        self.max_concurrency = max_concurrency
+        self.adaptive = adaptive
+        self.breaker = breaker or CircuitBreaker()
+        self.retry_budget = retry_budget or RetryBudget()
+        self.throttled = 0
+        self._bucket = TokenBucket(requests_per_second)
+        self._capacity_limiter: Optional[anyio.CapacityLimiter] = None
+        self._paused_until = 0.0
+
+    @classmethod
+    def for_jira(cls) -> "RateLimiter":
+        """
+        Create a RateLimiter with the Jira settings.
+
+        :return: RateLimiter.
+        """
+        return cls(
+            max_concurrency=settings.jira_max_concurrency,
+            requests_per_second=settings.jira_requests_per_second,
+            adaptive=settings.adaptive_rate_limit,
+            breaker=CircuitBreaker(
+                settings.circuit_breaker_threshold,
+                settings.circuit_breaker_reset_timeout,
+            ),
+            retry_budget=RetryBudget(settings.retry_budget),
+        )
+
+    @classmethod
+    def for_tempo(cls) -> "RateLimiter":
+        """
+        Create a RateLimiter with the Tempo settings.
+
+        :return: RateLimiter.
+        """
+        return cls(
+            max_concurrency=settings.tempo_max_concurrency,
+            requests_per_second=settings.tempo_requests_per_second,
+            adaptive=settings.adaptive_rate_limit,
+            breaker=CircuitBreaker(
+                settings.circuit_breaker_threshold,
+                settings.circuit_breaker_reset_timeout,
+            ),
+            retry_budget=RetryBudget(settings.retry_budget),
+        )
+
+    @property
+    def requests_per_second(self) -> float:
+        """
+        Current token bucket rate.
+
+        :return: requests per second.
+        """
+        return self._bucket.rate
+
+    async def __aenter__(self) -> "RateLimiter":
+        if self.max_concurrency > 0:
+            if self._capacity_limiter is None:
+                self._capacity_limiter = anyio.CapacityLimiter(self.max_concurrency)
+            await self._capacity_limiter.acquire()
+        try:
+            pause = self._paused_until - time.monotonic()
+            if pause > 0:
+                await anyio.sleep(pause)
+            self.breaker.before_request()
+            await self._bucket.acquire()
+        except BaseException:
+            self._release()
+            raise
+        return self
+
+    async def __aexit__(
+        self,
+        exc_type: Optional[Type[BaseException]],
+        exc_value: Optional[BaseException],
+        traceback: Optional[TracebackType],
+    ) -> None:
+        self._release()
+
+    def on_success(self) -> None:
+        """Record a successful request, grows the rate by about 1 rps per second."""
+        self.breaker.record_success()
+        if self.adaptive and self._bucket.rate > 0:
+            self._set_rate(self._bucket.rate + 1 / self._bucket.rate)
+
+    def on_throttled(self, retry_after: Optional[float] = None) -> None:
+        """
+        Record a 429 response, pause new requests and shrink the rate.
+
+        :param retry_after: seconds requested by the api before retrying.
+        """
+        self.throttled += 1
+        # A throttling api is up, only its rate is too high.
+        self.breaker.record_success()
+        if retry_after:
+            self._paused_until = max(
+                self._paused_until,
+                time.monotonic() + retry_after,
+            )
+        if self.adaptive and self._bucket.rate > 0:
+            self._set_rate(max(self._bucket.rate / 2, MIN_REQUESTS_PER_SECOND))
+            logger.debug("Throttled, lowering rate to %.2f rps.", self._bucket.rate)
+
+    def on_failure(self) -> None:
+        """Record a server or transport error for the circuit breaker."""
+        self.breaker.record_failure()
+
+    def _set_rate(self, rate: float) -> None:
+        self._bucket.rate = rate
+        self._bucket.capacity = max(rate, 1)
+
+    def _release(self) -> None:
+        self.breaker.after_request()
+        if self._capacity_limiter is not None:
+            self._capacity_limiter.release()
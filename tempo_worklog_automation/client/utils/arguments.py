@@ -1,6 +1,93 @@
 import argparse
+import glob
+from pathlib import Path
+from typing import Dict, Iterable, List
 
 from tempo_worklog_automation.client.models import CliArguments
+from tempo_worklog_automation.client.utils.readers import READERS
+
+
+def _unique_file_paths(file_paths: Iterable[Path]) -> List[Path]:
+    # A file reached through several paths is kept once, at its first position.
+    unique_paths: Dict[Path, Path] = {}
+    for file_path in file_paths:
+        unique_paths.setdefault(file_path.resolve(), file_path)
+    return list(unique_paths.values())
+
+
+def expand_file_paths(pattern: str) -> List[Path]:
+    """
+    Expand a --file-path value to the worklogs files it designates.
+
+    A directory expands to its files of every extension with a reader, a glob
+    pattern to the files it matches, ``**`` matching nested directories, anything
+    else is kept as a single path. Files reached through several paths, like
+    symbolic links, are kept once.
+
+    :param pattern: file path, directory or glob pattern.
+    :return: sorted list of Path objects, empty when nothing matches.
+    """
+    path = Path(pattern)
+    if path.is_dir():
+        return _unique_file_paths(
+            sorted(
+                child for child in path.iterdir() if child.suffix.lower() in READERS
+            ),
+        )
+    if any(character in pattern for character in "*?["):
+        return _unique_file_paths(
+            sorted(
+                Path(match)
+                for match in glob.glob(pattern, recursive=True)
+                if Path(match).is_file()
+            ),
+        )
+    return [path]
+
+
+def _expand_file_path_args(
+    parser: argparse.ArgumentParser,
+    patterns: List[str],
+) -> List[Path]:
+    file_paths: List[Path] = []
+    for pattern in patterns:
+        expanded = expand_file_paths(pattern)
+        if not expanded:
+            parser.error(f"--file-path {pattern} does not match any file.")
+        file_paths.extend(expanded)
+    return _unique_file_paths(file_paths)
+
+
+def _check_file_path_options(
+    parser: argparse.ArgumentParser,
+    args: argparse.Namespace,
+    file_paths: List[Path],
+) -> None:
+    if args.validate_only and not file_paths:
+        parser.error("--validate-only requires --file-path.")
+    if len(file_paths) > 1 and (args.watch or args.delete_uploaded):
+        parser.error("--watch and --delete-uploaded take a single --file-path.")
+    if args.watch and any(path.suffix.lower() != ".csv" for path in file_paths):
+        parser.error("--watch follows csv files only.")
+    if args.receipt is not None and (len(file_paths) != 1 or args.watch):
+        parser.error("--receipt requires the upload of a single --file-path.")
+    if args.coalesce and (args.watch or args.skip_existing):
+        parser.error("--coalesce can not be used with --watch or --skip-existing.")
+
+
+def _check_sync_options(
+    parser: argparse.ArgumentParser,
+    args: argparse.Namespace,
+    file_paths: List[Path],
+) -> None:
+    if not args.sync:
+        return
+    if len(file_paths) != 1:
+        parser.error("--sync takes a single --file-path.")
+    if args.watch or args.coalesce or args.resume or args.receipt is not None:
+        parser.error(
+            "--sync can not be used with --watch, --coalesce, --resume or --receipt.",
+        )
 
 
 def parse_args() -> CliArguments:
@@ -13,13 +100,142 @@ def parse_args() -> CliArguments:
 
     parser.add_argument(
         "--file-path",
+        nargs="+",
         default=None,
-        required=True,
-        help="Worklogs file path.",
+        help="Worklogs file paths, directories or glob patterns.",
         dest="file_path",
     )
 
+    parser.add_argument(
+        "--resume",
+        action="store_true",
+        help="Skip the rows already created by a previous interrupted upload.",
+        dest="resume",
+    )
+
+    parser.add_argument(
+        "--skip-existing",
+        action="store_true",
+        help="Skip the worklogs already present in Tempo for the file date range.",
+        dest="skip_existing",
+    )
+
+    parser.add_argument(
+        "--coalesce",
+        action="store_true",
+        help="Merge back-to-back worklogs of the same issue and day before posting.",
+        dest="coalesce",
+    )
+
+    parser.add_argument(
+        "--sync",
+        action="store_true",
+        help="Update, create and delete the author worklogs of the file date range to match it.",  # noqa: E501
+        dest="sync",
+    )
+
+    parser.add_argument(
+        "--stats",
+        action="store_true",
+        help="Print request, retry and phase statistics at the end of the run.",
+        dest="stats",
+    )
+
+    parser.add_argument(
+        "--stats-file",
+        default=None,
+        help="Export the run statistics, as a Prometheus textfile for .prom files or JSON.",  # noqa: E501
+        dest="stats_file",
+    )
+
+    parser.add_argument(
+        "--receipt",
+        default=None,
+        help="Write the outcome of each posted row, as CSV for .csv files or JSON Lines.",  # noqa: E501
+        dest="receipt",
+    )
+
+    parser.add_argument(
+        "--delete-range",
+        nargs=2,
+        default=None,
+        metavar=("FROM", "TO"),
+        help="Delete the author worklogs between two YYYY-MM-DD dates, inclusive.",
+        dest="delete_range",
+    )
+
+    parser.add_argument(
+        "--delete-uploaded",
+        action="store_true",
+        help="Delete the worklogs the upload journal records as created from the file.",  # noqa: E501
+        dest="delete_uploaded",
+    )
+
+    parser.add_argument(
+        "--author",
+        default=None,
+        help="Author account id used by --delete-range, defaults to the settings.",
+        dest="author",
+    )
+
+    parser.add_argument(
+        "--watch",
+        action="store_true",
+        help="Keep following the file and upload the rows appended to it.",
+        dest="watch",
+    )
+
+    parser.add_argument(
+        "--validate-only",
+        "--dry-run",
+        action="store_true",
+        help="Validate the files and print a report, without credentials or api calls.",  # noqa: E501
+        dest="validate_only",
+    )
+
+    parser.add_argument(
+        "--processes",
+        type=int,
+        default=None,
+        help="Processes validating byte ranges of the files, 0 for one per core.",
+        dest="processes",
+    )
+
+    parser.add_argument(
+        "--manifest",
+        default=None,
+        help="YAML manifest mapping authors to Tempo tokens and worklog files.",
+        dest="manifest",
+    )
+
     args = parser.parse_args()
-    unvalidated_file_path = args.file_path
+    if args.file_path is None and args.delete_range is None and args.manifest is None:
+        parser.error(
+            "--file-path is required unless --delete-range or --manifest is used.",
+        )
+    if args.delete_range is not None and args.file_path is not None:
+        parser.error("--delete-range can not be used with --file-path.")
+    if args.manifest is not None and args.file_path is not None:
+        parser.error("--manifest can not be used with --file-path.")
+    unvalidated_file_paths = _expand_file_path_args(parser, args.file_path or [])
+    _check_file_path_options(parser, args, unvalidated_file_paths)
+    _check_sync_options(parser, args, unvalidated_file_paths)
 
-    return CliArguments(file_path=unvalidated_file_path)
+    return CliArguments(
+        file_path=next(iter(unvalidated_file_paths), None),
+        file_paths=unvalidated_file_paths,
+        resume=args.resume,
+        skip_existing=args.skip_existing,
+        coalesce=args.coalesce,
+        sync=args.sync,
+        stats=args.stats,
+        stats_file=args.stats_file,
+        receipt=args.receipt,
+        delete_range=args.delete_range,
+        delete_uploaded=args.delete_uploaded,
+        author=args.author,
+        manifest=args.manifest,
+        watch=args.watch,
+        validate_only=args.validate_only,
+        processes=args.processes,
+    )
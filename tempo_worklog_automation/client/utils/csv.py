@@ -1,31 +1,114 @@
 import csv
+import io
+import locale
+import mmap
+import os
 from pathlib import Path
-from typing import Any, Dict, List
+from typing import Any, Dict, Generator, List, NamedTuple
 
+# Encoding of the csv files, the one open() defaults to in text mode.
+CSV_ENCODING = locale.getpreferredencoding(False)
 
-def load_csv_file(csv_file_path: Path) -> Dict[str, Any]:
+
+def worklog_fields(row: Dict[str, str]) -> Dict[str, str]:
     """
-    Load parsed csv file then return as dictionary.
+    Keep the worklog fields of a csv row, the fields missing from a short row empty.
 
-    :param csv_file_path: Path object for the csv file.
-    :return: dictionary_data with parsed csv file.
+    :param row: dictionary of a csv row.
+    :return: dictionary with the worklog fields.
     """
-    dictionary_data_init = Dict[str, List[Any]]
-    dictionary_data: dictionary_data_init = {"worklogs": []}
+    return {
+        "issue": row["issue"] or "",
+        "time_spent": row["time_spent"] or "",
+        "start_date": row["start_date"] or "",
+        "start_time": row["start_time"] or "",
+    }
+
+
+def iter_csv_rows(csv_file_path: Path) -> Generator[Dict[str, str], None, None]:
+    """
+    Lazily yield the worklog rows of a csv file.
 
+    :param csv_file_path: Path object for the csv file.
+    :yield: dictionary with the worklog fields of each row.
+    """
     with open(
         csv_file_path,
         mode="r",
+        encoding=CSV_ENCODING,
     ) as csv_file:
         reader = csv.DictReader(csv_file)
         for row in reader:
-            worklog = {
-                "issue": row["issue"],
-                "time_spent": row["time_spent"],
-                "start_date": row["start_date"],
-                "start_time": row["start_time"],
-            }
+            yield worklog_fields(row)
+
 
-            dictionary_data["worklogs"].append(worklog)
+def load_csv_file(csv_file_path: Path) -> Dict[str, Any]:
+    """
+    Load parsed csv file then return as dictionary.
+
+    :param csv_file_path: Path object for the csv file.
+    :return: dictionary_data with parsed csv file.
+    """
+    dictionary_data_init = Dict[str, List[Any]]
+    dictionary_data: dictionary_data_init = {"worklogs": []}
+
+    for worklog in iter_csv_rows(csv_file_path):
+        dictionary_data["worklogs"].append(worklog)
 
     return dictionary_data
+
+
+class CsvShard(NamedTuple):
+    """Byte range of a csv file holding complete rows, with the file header."""
+
+    csv_file_path: Path
+    header: List[str]
+    start: int
+    end: int
+
+
+def split_csv_shards(csv_file_path: Path, shards: int) -> List[CsvShard]:
+    """
+    Split the rows of a csv file in byte ranges aligned to line boundaries.
+
+    The file is memory mapped, so only the bytes around each boundary are read.
+    Rows must not hold quoted line breaks, which worklog files never do.
+
+    :param csv_file_path: Path object for the csv file.
+    :param shards: number of ranges wanted, fewer are returned for small files.
+    :return: list of CsvShard in file order.
+    """
+    with open(csv_file_path, "rb") as csv_file:
+        if os.fstat(csv_file.fileno()).st_size == 0:
+            return []
+        with mmap.mmap(csv_file.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            size = len(mapped)
+            header_end = mapped.find(b"\n")
+            start = size if header_end == -1 else header_end + 1
+            header = next(csv.reader([mapped[:start].decode(CSV_ENCODING)]))
+            step = max((size - start) // max(shards, 1), 1)
+            ranges = []
+            while start < size:
+                line_end = mapped.find(b"\n", start + step)
+                end = size if line_end == -1 else line_end + 1
+                ranges.append(CsvShard(csv_file_path, header, start, end))
+                start = end
+    return ranges
+
+
+def iter_csv_shard_rows(shard: CsvShard) -> Generator[Dict[str, str], None, None]:
+    """
+    Lazily yield the worklog rows of a csv shard.
+
+    The shard is parsed by the csv module like the whole file, so only line breaks
+    end a record, not quoted ones nor other unicode line separators.
+
+    :param shard: CsvShard returned by split_csv_shards().
+    :yield: dictionary with the worklog fields of each row.
+    """
+    with open(shard.csv_file_path, "rb") as csv_file:
+        with mmap.mmap(csv_file.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            text = mapped[shard.start : shard.end].decode(CSV_ENCODING)
+    csv_records = io.StringIO(text, newline="")
+    for row in csv.DictReader(csv_records, fieldnames=shard.header):
+        yield worklog_fields(row)
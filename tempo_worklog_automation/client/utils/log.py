@@ -1,6 +1,10 @@
+import atexit
+import json
 import logging
 import sys
-from typing import Dict
+from logging.handlers import QueueHandler, QueueListener
+from queue import SimpleQueue
+from typing import Any, Dict, Optional, Union
 
 
 class DispatchingFormatter:
@@ -25,52 +29,107 @@ class DispatchingFormatter:
         return formatter.format(record)
 
 
+class JsonFormatter(logging.Formatter):
+    """Format each log record as a JSON object on a single line."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        """
+        Get log record and serialise it with its level, origin and message.
+
+        :param record: record to format.
+        :return: JSON string of the log record.
+        """
+        entry: Dict[str, Any] = {
+            "time": self.formatTime(record),
+            "level": record.levelname,
+            "logger": record.name,
+            "thread": record.threadName,
+            "location": f"{record.filename}:{record.lineno}",
+            "function": record.funcName,
+            "message": record.getMessage(),
+        }
+        if record.exc_info:
+            entry["exception"] = self.formatException(record.exc_info)
+        return json.dumps(entry, default=str)
+
+
 class LoggingClass:
     """
     Create logging.Logger and set format and log levels.
 
+    Records are handed to a queue and written by a QueueListener thread, so
+    formatting and writing them does not block the event loop.
+
     :param name: Logger name.
-    :param level: default Logger name.
-    :param handler: Logger Handler class.
+    :param level: Logger level.
+    :param handler: Logger Handler class, writes to stdout when None.
+    :param json_format: format each record as a JSON line.
+    :param use_queue: write the records from a background thread.
     """
 
     def __init__(
         self,
         name: str = __name__,
         level: int = logging.INFO,
-        handler: logging.Handler = logging.StreamHandler(sys.stdout),
+        handler: Optional[logging.Handler] = None,
+        json_format: bool = False,
+        use_queue: bool = True,
     ):
-        self.logger_formats = DispatchingFormatter(
-            formatters={
-                "ERROR": logging.Formatter(
-                    "%(levelname)s[%(asctime)s] - %(threadName)s -"
-                    " %(filename)s:%(lineno)s - %(funcName)s() -- %(message)s",
-                ),
-                "DEBUG": logging.Formatter(
-                    "%(levelname)s[%(asctime)s] - %(threadName)s -"
-                    " %(filename)s:%(lineno)s - %(funcName)s() -- %(message)s",
-                ),
-                "INFO": logging.Formatter("%(asctime)s -- %(message)s"),
-            },
-            default_formatter=logging.Formatter("%(message)s"),
-        )
+        self.logger_formats: Union[DispatchingFormatter, JsonFormatter]
+        if json_format:
+            self.logger_formats = JsonFormatter()
+        else:
+            self.logger_formats = DispatchingFormatter(
+                formatters={
+                    "ERROR": logging.Formatter(
+                        "%(levelname)s[%(asctime)s] - %(threadName)s -"
+                        " %(filename)s:%(lineno)s - %(funcName)s() -- %(message)s",
+                    ),
+                    "DEBUG": logging.Formatter(
+                        "%(levelname)s[%(asctime)s] - %(threadName)s -"
+                        " %(filename)s:%(lineno)s - %(funcName)s() -- %(message)s",
+                    ),
+                    "INFO": logging.Formatter("%(asctime)s -- %(message)s"),
+                },
+                default_formatter=logging.Formatter("%(message)s"),
+            )
 
         self.name = name
         self.level = level
         self.new_logger: logging.Logger
-        self.level = level
-        self.handler = handler
+        self.handler = handler or logging.StreamHandler(sys.stdout)
+        self.use_queue = use_queue
+        self.listener: Optional[QueueListener] = None
 
     def create_logger(self) -> logging.Logger:
         """
         Instantiate Logger and return it.
 
+        With the queue, the listener is stopped at exit, after the queued records
+        are written.
+
         :return: logging.Logger object.
         """
         self.new_logger = logging.getLogger(self.name)
         self.new_logger.setLevel(self.level)
-        self.new_logger.addHandler(self.handler)
-        new_handler = self.handler
-        new_handler.setFormatter(self.logger_formats)  # type: ignore
-        self.new_logger.addHandler(new_handler)
+        self.handler.setFormatter(self.logger_formats)  # type: ignore
+        if not self.use_queue:
+            self.new_logger.addHandler(self.handler)
+            return self.new_logger
+
+        log_queue: SimpleQueue[logging.LogRecord] = SimpleQueue()
+        self.listener = QueueListener(
+            log_queue,
+            self.handler,
+            respect_handler_level=True,
+        )
+        self.listener.start()
+        atexit.register(self.stop)
+        self.new_logger.addHandler(QueueHandler(log_queue))
         return self.new_logger
+
+    def stop(self) -> None:
+        """Write the queued records and stop the listener thread."""
+        if self.listener is not None:
+            self.listener.stop()
+            self.listener = None
@@ -0,0 +1,156 @@
+"""Streaming worklog file readers, selected by file extension."""
+import json
+from pathlib import Path
+from typing import Any, Callable, Dict, Generator, Iterator, Mapping
+
+import yaml
+from yaml.events import (
+    AliasEvent,
+    Event,
+    MappingEndEvent,
+    MappingStartEvent,
+    ScalarEvent,
+    SequenceEndEvent,
+    SequenceStartEvent,
+)
+
+from tempo_worklog_automation.client.utils.csv import iter_csv_rows
+from tempo_worklog_automation.client.utils.yaml import YamlLoader
+
+WORKLOG_FIELDS = ("issue", "time_spent", "start_date", "start_time")
+
+Rows = Generator[Dict[str, str], None, None]
+RowReader = Callable[[Path], Rows]
+
+READERS: Dict[str, RowReader] = {}
+
+
+def register_reader(*suffixes: str) -> Callable[[RowReader], RowReader]:
+    """
+    Register a row reader for file extensions.
+
+    :param suffixes: lower case file extensions with the leading dot.
+    :return: decorator registering the reader.
+    """
+
+    def decorator(reader: RowReader) -> RowReader:
+        for suffix in suffixes:
+            READERS[suffix] = reader
+        return reader
+
+    return decorator
+
+
+def get_reader(file_path: Path) -> RowReader:
+    """
+    Return the reader registered for the extension of a file.
+
+    :param file_path: Path object for the worklogs file.
+    :raises ValueError: when no reader handles the extension.
+    :return: reader yielding the worklog rows of the file.
+    """
+    try:
+        return READERS[file_path.suffix.lower()]
+    except KeyError:
+        supported = ", ".join(sorted(READERS))
+        raise ValueError(
+            f"Unsupported worklogs file {file_path}, extensions are: {supported}.",
+        )
+
+
+def iter_worklog_rows(file_path: Path) -> Rows:
+    """
+    Lazily yield the worklog rows of a file with the reader of its extension.
+
+    Every reader yields the same row dictionaries, with string values.
+
+    :param file_path: Path object for the worklogs file.
+    :return: generator of dictionaries with the worklog fields of each row.
+    """
+    return get_reader(file_path)(file_path)
+
+
+def _mapping_fields(row: Mapping[str, Any]) -> Dict[str, str]:
+    # Missing fields are left empty for the validation to report them.
+    return {
+        field: "" if row.get(field) is None else str(row[field])
+        for field in WORKLOG_FIELDS
+    }
+
+
+register_reader(".csv")(iter_csv_rows)
+
+
+@register_reader(".jsonl", ".ndjson")
+def iter_jsonl_rows(jsonl_file_path: Path) -> Rows:
+    """
+    Lazily yield the worklog rows of a JSON Lines file, one object per line.
+
+    :param jsonl_file_path: Path object for the JSON Lines file.
+    :yield: dictionary with the worklog fields of each row.
+    """
+    with open(jsonl_file_path, "r") as jsonl_file:
+        for line in jsonl_file:
+            if line.strip():
+                yield _mapping_fields(json.loads(line))
+
+
+@register_reader(".yaml", ".yml")
+def iter_yaml_rows(yaml_file_path: Path) -> Rows:
+    """
+    Lazily yield the entries of the ``worklogs`` list of a YAML file.
+
+    The file is read as a stream of parser events, so a single entry is built at a
+    time. Scalars are kept as written, ``8:00:00`` stays a string instead of the
+    YAML 1.1 sexagesimal integer.
+
+    :param yaml_file_path: Path object for the YAML file.
+    :yield: dictionary with the worklog fields of each row.
+    """
+    with open(yaml_file_path, "rb") as yaml_file:
+        events = yaml.parse(yaml_file, Loader=YamlLoader)
+        if not any(isinstance(event, MappingStartEvent) for event in events):
+            return
+        for key_event in events:
+            if isinstance(key_event, MappingEndEvent):
+                return
+            value_event = next(events)
+            if _scalar_value(key_event) == "worklogs" and isinstance(
+                value_event,
+                SequenceStartEvent,
+            ):
+                for entry in _iter_sequence(events):
+                    yield _mapping_fields(entry)
+            else:
+                _build_value(value_event, events)
+
+
+def _scalar_value(event: Event) -> Any:
+    return event.value if isinstance(event, ScalarEvent) else None
+
+
+def _iter_sequence(events: Iterator[Event]) -> Iterator[Any]:
+    for item_event in events:
+        if isinstance(item_event, SequenceEndEvent):
+            return
+        yield _build_value(item_event, events)
+
+
+def _build_mapping(events: Iterator[Event]) -> Dict[Any, Any]:
+    mapping: Dict[Any, Any] = {}
+    for key_event in events:
+        if isinstance(key_event, MappingEndEvent):
+            break
+        key = _build_value(key_event, events)
+        mapping[key] = _build_value(next(events), events)
+    return mapping
+
+
+def _build_value(event: Event, events: Iterator[Event]) -> Any:
+    if isinstance(event, AliasEvent):
+        raise ValueError("YAML aliases are not supported in worklogs files.")
+    if isinstance(event, SequenceStartEvent):
+        return list(_iter_sequence(events))
+    if isinstance(event, MappingStartEvent):
+        return _build_mapping(events)
+    return _scalar_value(event)
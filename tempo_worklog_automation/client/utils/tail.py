@@ -0,0 +1,189 @@
+"""Follow the rows appended to a csv file."""
+import csv
+import logging
+import os
+from pathlib import Path
+from types import TracebackType
+from typing import IO, Dict, List, NamedTuple, Optional, Tuple, Type
+
+from tempo_worklog_automation.client.utils.csv import worklog_fields
+from tempo_worklog_automation.settings import settings
+
+logger = logging.getLogger(settings.logger_name)
+
+
+class TailCheckpoint(NamedTuple):
+    """Position of a CsvTail after the last rows it returned."""
+
+    device: int
+    inode: int
+    offset: int
+    row_number: int
+    header: List[str]
+
+
+class CsvTail:
+    """
+    Read the rows appended to a csv file since the last read, like ``tail -F``.
+
+    Only complete lines are returned, a partially written last line is left for
+    the next read. When the path is rotated to a new file the remaining rows of
+    the old file are read first, its unterminated last line included, when the
+    file is truncated it is read again from its header.
+
+    :param csv_file_path: Path object for the csv file.
+    :param checkpoint: position to resume from, ignored when the file was replaced
+        or truncated since.
+    :param chunk_size: bytes read per call, more when a line is longer.
+    """
+
+    def __init__(
+        self,
+        csv_file_path: Path,
+        checkpoint: Optional[TailCheckpoint] = None,
+        chunk_size: int = 1048576,
+    ):
+        self.csv_file_path = csv_file_path
+        self.chunk_size = chunk_size
+        self._file: Optional[IO[bytes]] = None
+        self._device = 0
+        self._inode = 0
+        self._offset = 0
+        self._row_number = 0
+        self._header: List[str] = []
+        self._rotated = False
+        self._last_read: Tuple[int, int, List[str]] = (0, 0, [])
+        self._checkpoint = checkpoint
+
+    def __enter__(self) -> "CsvTail":
+        return self
+
+    def __exit__(
+        self,
+        exc_type: Optional[Type[BaseException]],
+        exc_value: Optional[BaseException],
+        traceback: Optional[TracebackType],
+    ) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """Close the file handle."""
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    @property
+    def checkpoint(self) -> TailCheckpoint:
+        """
+        Position after the last returned rows.
+
+        :return: TailCheckpoint.
+        """
+        return TailCheckpoint(
+            self._device,
+            self._inode,
+            self._offset,
+            self._row_number,
+            self._header,
+        )
+
+    @property
+    def identity(self) -> str:
+        """
+        Identifier of the file being read, changes when the path is rotated.
+
+        :return: device and inode string.
+        """
+        return f"{self._device}:{self._inode}"
+
+    def read_rows(self) -> Tuple[int, List[Dict[str, str]]]:
+        """
+        Read the complete rows appended since the last call, about chunk_size bytes.
+
+        :return: row number of the first row and the worklog rows.
+        """
+        if self._file is None and not self._open():
+            return self._row_number + 1, []
+        self._follow_path()
+        self._last_read = (self._offset, self._row_number, list(self._header))
+        first_row = self._row_number + 1
+        return first_row, self._read_chunk()
+
+    def unread(self) -> None:
+        """Move back before the last read, the next read returns its rows again."""
+        self._offset, self._row_number, self._header = self._last_read
+
+    def _open(self) -> bool:
+        try:
+            self._file = open(self.csv_file_path, "rb")  # noqa: WPS515
+        except FileNotFoundError:
+            return False
+        file_stat = os.fstat(self._file.fileno())
+        self._device, self._inode = file_stat.st_dev, file_stat.st_ino
+        self._rotated = False
+        checkpoint = self._checkpoint
+        self._checkpoint = None
+        if (
+            checkpoint is not None
+            and (checkpoint.device, checkpoint.inode) == (self._device, self._inode)
+            and checkpoint.offset <= file_stat.st_size
+        ):
+            self._offset = checkpoint.offset
+            self._row_number = checkpoint.row_number
+            self._header = list(checkpoint.header)
+            return True
+        if checkpoint is not None:
+            logger.warning("%s was replaced, reading it again.", self.csv_file_path)
+        self._rewind()
+        return True
+
+    def _rewind(self) -> None:
+        self._offset = 0
+        self._row_number = 0
+        self._header = []
+
+    def _follow_path(self) -> None:
+        if self._file is None:
+            return
+        try:
+            path_stat = os.stat(self.csv_file_path)
+        except FileNotFoundError:
+            return
+        if (path_stat.st_dev, path_stat.st_ino) != (self._device, self._inode):
+            self._rotated = True
+            self._follow_rotation()
+        elif path_stat.st_size < self._offset:
+            logger.warning("%s was truncated, reading it again.", self.csv_file_path)
+            self._rewind()
+
+    def _follow_rotation(self) -> None:
+        # Rows still unread in the rotated file are read before switching.
+        if self._file is None or self._offset < os.fstat(self._file.fileno()).st_size:
+            return
+        logger.info("%s was rotated, following the new file.", self.csv_file_path)
+        self.close()
+        self._open()
+
+    def _read_chunk(self) -> List[Dict[str, str]]:
+        if self._file is None:
+            return []
+        self._file.seek(self._offset)
+        # A line longer than chunk_size is read whole rather than never.
+        chunks = [self._file.read(self.chunk_size)]
+        while len(chunks[-1]) == self.chunk_size and b"\n" not in chunks[-1]:
+            chunks.append(self._file.read(self.chunk_size))
+        chunk = b"".join(chunks)
+        complete_length = chunk.rfind(b"\n") + 1
+        if self._rotated and len(chunks[-1]) < self.chunk_size:
+            # Nothing is appended to a rotated file any more, its last line is done.
+            complete_length = len(chunk)
+        lines = chunk[:complete_length].decode("utf-8").splitlines()
+        self._offset += complete_length
+        if not self._header and lines:
+            self._header = next(csv.reader([lines.pop(0)]))
+        rows = [
+            worklog_fields(row)
+            for row in csv.DictReader(lines, fieldnames=self._header)
+        ]
+        self._row_number += len(rows)
+        return rows
@@ -3,6 +3,9 @@ from typing import Any, Dict
 
 import yaml
 
+# libyaml parser when PyYAML was built with it, the pure Python one otherwise.
+YamlLoader = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+
 
 def load_yaml_file(yaml_file_path: Path) -> Dict[str, Any]:
     """
@@ -12,4 +15,4 @@ def load_yaml_file(yaml_file_path: Path) -> Dict[str, Any]:
     :return: python object with loaded YAML file.
     """
     with open(yaml_file_path, "r") as yaml_file:
-        return yaml.safe_load(yaml_file)
+        return yaml.load(yaml_file, Loader=YamlLoader)  # noqa: S506
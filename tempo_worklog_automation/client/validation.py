@@ -0,0 +1,174 @@
+"""Batched validation of worklog rows."""
+import os
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, NamedTuple, Optional, Sequence
+
+from pydantic import TypeAdapter, ValidationError
+
+from tempo_worklog_automation.client.models import WorklogModel
+from tempo_worklog_automation.client.utils.csv import (
+    CsvShard,
+    iter_csv_shard_rows,
+    split_csv_shards,
+)
+from tempo_worklog_automation.client.utils.readers import iter_worklog_rows
+from tempo_worklog_automation.settings import load_settings
+
+# Shards per process, smaller shards even out the load of the processes.
+SHARDS_PER_PROCESS = 4
+
+worklog_list_adapter = TypeAdapter(List[WorklogModel])
+
+
+class RowError(NamedTuple):
+    """Validation error of a single row field."""
+
+    row: int
+    field: str
+    message: str
+
+
+class ValidationReport(NamedTuple):
+    """Valid worklogs and row numbered errors of a batch."""
+
+    worklogs: List[WorklogModel]
+    rows: List[int]
+    errors: List[RowError]
+
+
+def validate_worklogs(
+    rows: Sequence[Any],
+    first_row: int = 1,
+) -> ValidationReport:
+    """
+    Validate a batch of rows in one pass through a list TypeAdapter.
+
+    Valid batches are validated once. When some rows fail, their errors are
+    collected and the remaining rows are validated again to return their models.
+
+    :param rows: row dictionaries from load_csv_file or load_yaml_file, or models.
+    :param first_row: row number of the first row, used in error reports.
+    :return: ValidationReport with the valid worklogs, their row numbers and errors.
+    """
+    try:
+        worklogs = worklog_list_adapter.validate_python(rows)
+    except ValidationError as exc:
+        errors = [
+            RowError(
+                row=int(error["loc"][0]) + first_row,
+                field=".".join(str(loc) for loc in error["loc"][1:]),
+                message=error["msg"],
+            )
+            for error in exc.errors()
+        ]
+    else:
+        return ValidationReport(
+            worklogs,
+            list(range(first_row, first_row + len(rows))),
+            [],
+        )
+
+    invalid_rows = {error.row for error in errors}
+    valid_rows = [
+        row_number
+        for row_number in range(first_row, first_row + len(rows))
+        if row_number not in invalid_rows
+    ]
+    worklogs = worklog_list_adapter.validate_python(
+        [rows[row_number - first_row] for row_number in valid_rows],
+    )
+    return ValidationReport(worklogs, valid_rows, errors)
+
+
+class FileValidationReport(NamedTuple):
+    """Row count and row numbered errors of a worklogs file."""
+
+    rows: int
+    invalid_rows: int
+    errors: List[RowError]
+
+
+def validate_worklogs_file(
+    file_path: Path,
+    batch_size: int = 1000,
+) -> FileValidationReport:
+    """
+    Validate every row of a worklogs file without calling the apis.
+
+    The file is streamed a batch at a time, so memory use does not grow with it.
+
+    :param file_path: Path object for the worklogs file.
+    :param batch_size: rows validated per batch.
+    :return: FileValidationReport with the row count and the errors of the file.
+    """
+    return _validate_rows(iter_worklog_rows(file_path), batch_size)
+
+
+def validate_worklogs_file_sharded(
+    file_path: Path,
+    processes: Optional[int] = None,
+    batch_size: int = 1000,
+) -> FileValidationReport:
+    """
+    Validate a worklogs csv file in a process pool, one byte range per task.
+
+    Each shard is parsed and validated by a worker process with rows numbered
+    from the shard start. Shard reports are merged back in file order, their row
+    numbers shifted by the rows of the previous shards, so the report is the same
+    as the one of validate_worklogs_file(). Files other than csv are validated in
+    the main process.
+
+    :param file_path: Path object for the worklogs file.
+    :param processes: worker processes, one per core when None.
+    :param batch_size: rows validated per batch.
+    :return: FileValidationReport with the row count and the errors of the file.
+    """
+    if file_path.suffix.lower() != ".csv":
+        return validate_worklogs_file(file_path, batch_size)
+    processes = processes or os.cpu_count() or 1
+    shards = split_csv_shards(file_path, processes * SHARDS_PER_PROCESS)
+    row_count = 0
+    invalid_rows = 0
+    errors: List[RowError] = []
+    with ProcessPoolExecutor(
+        max_workers=processes,
+        initializer=load_settings,
+        initargs=(False,),
+    ) as executor:
+        shard_reports = executor.map(
+            _validate_shard,
+            shards,
+            [batch_size] * len(shards),
+        )
+        for shard_report in shard_reports:
+            errors.extend(
+                error._replace(row=error.row + row_count)
+                for error in shard_report.errors
+            )
+            row_count += shard_report.rows
+            invalid_rows += shard_report.invalid_rows
+    return FileValidationReport(row_count, invalid_rows, errors)
+
+
+def _validate_shard(shard: CsvShard, batch_size: int) -> FileValidationReport:
+    return _validate_rows(iter_csv_shard_rows(shard), batch_size)
+
+
+def _validate_rows(
+    rows: Iterator[Dict[str, str]],
+    batch_size: int,
+) -> FileValidationReport:
+    row_count = 0
+    invalid_rows = 0
+    errors: List[RowError] = []
+    while True:
+        batch = list(islice(rows, batch_size))
+        if not batch:
+            break
+        report = validate_worklogs(batch, first_row=row_count + 1)
+        row_count += len(batch)
+        invalid_rows += len(batch) - len(report.rows)
+        errors.extend(report.errors)
+    return FileValidationReport(row_count, invalid_rows, errors)
@@ -0,0 +1,75 @@
+"""Persisted positions of the files followed by the watch mode."""
+import json
+import logging
+import os
+from pathlib import Path
+from typing import Dict, Optional
+
+from tempo_worklog_automation.client.utils.tail import TailCheckpoint
+from tempo_worklog_automation.settings import settings
+
+logger = logging.getLogger(settings.logger_name)
+
+
+class WatchState:
+    """
+    JSON file holding the TailCheckpoint of each watched file.
+
+    A checkpoint is saved once the rows read before it were posted, so a restarted
+    watch resumes after the last posted rows instead of reading the file again.
+
+    :param path: JSON file used as on-disk store.
+    """
+
+    def __init__(self, path: Path):
+        self.path = path
+        self._checkpoints: Dict[str, TailCheckpoint] = {}
+
+    def load(self) -> None:
+        """Read the checkpoints from the on-disk store, ignoring unreadable files."""
+        try:
+            with open(self.path) as state_file:
+                stored = json.load(state_file)
+        except FileNotFoundError:
+            return
+        except (OSError, ValueError) as exc:
+            logger.warning("Ignoring unreadable watch state %s: %r", self.path, exc)
+            return
+        self._checkpoints = {
+            source: TailCheckpoint(*checkpoint)
+            for source, checkpoint in stored.get("checkpoints", {}).items()
+        }
+
+    def get(self, csv_file_path: Path) -> Optional[TailCheckpoint]:
+        """
+        Return the checkpoint of a file.
+
+        :param csv_file_path: Path object for the watched file.
+        :return: TailCheckpoint or None when the file was never watched.
+        """
+        return self._checkpoints.get(str(csv_file_path.resolve()))
+
+    def save(self, csv_file_path: Path, checkpoint: TailCheckpoint) -> None:
+        """
+        Store the checkpoint of a file, replacing the on-disk store atomically.
+
+        :param csv_file_path: Path object for the watched file.
+        :param checkpoint: TailCheckpoint after the posted rows.
+        """
+        self._checkpoints[str(csv_file_path.resolve())] = checkpoint
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        temporary_path = self.path.with_suffix(f"{self.path.suffix}.tmp")
+        with open(temporary_path, "w") as state_file:
+            json.dump({"version": 1, "checkpoints": self._checkpoints}, state_file)
+        os.replace(temporary_path, self.path)
+
+
+def load_watch_state() -> WatchState:
+    """
+    Load the watch state from settings.
+
+    :return: WatchState.
+    """
+    watch_state = WatchState(settings.watch_state_path)
+    watch_state.load()
+    return watch_state
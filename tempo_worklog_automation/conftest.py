@@ -1,11 +1,23 @@
+from contextlib import ExitStack
 from os.path import dirname
 from pathlib import Path
-from typing import Any, Dict
+from typing import Any, AsyncIterator, Callable, Dict, Iterator, List, Optional
 
+import anyio
 import pytest
 
+from tempo_worklog_automation.benchmarks.stub_server import (
+    StubServer,
+    StubServerConfig,
+)
+from tempo_worklog_automation.client.models import WorklogModel
 from tempo_worklog_automation.client.utils.csv import load_csv_file
 from tempo_worklog_automation.client.utils.yaml import load_yaml_file
+from tempo_worklog_automation.tests.stub_server import (
+    StartStubServer,
+    StartStubServerInThread,
+    use_stub_server,
+)
 
 
 @pytest.fixture(scope="session")
@@ -68,3 +80,78 @@ def load_csv_file_with_valid_values() -> Dict[str, Any]:
     project_root = dirname(__file__)
     load_csv_file_path = Path(f"{project_root}/tests/resources/valid_worklogs.csv")
     return load_csv_file(load_csv_file_path)
+
+
+@pytest.fixture
+async def start_stub_server(
+    monkeypatch: pytest.MonkeyPatch,
+) -> AsyncIterator[StartStubServer]:
+    """
+    Start stand-in servers the settings point at, stopped after the test.
+
+    The yielded coroutine function takes an optional StubServerConfig and settings
+    to override on top of the api urls, the issue id cache is not persisted.
+
+    :param monkeypatch: pytest monkeypatch fixture.
+    :yield: coroutine function starting a StubServer.
+    """
+    async with anyio.create_task_group() as tg:
+
+        async def start(
+            config: Optional[StubServerConfig] = None,
+            **overrides: Any,
+        ) -> StubServer:
+            server = StubServer(config)
+            await tg.start(server.serve)
+            use_stub_server(monkeypatch, server, overrides)
+            return server
+
+        yield start
+        tg.cancel_scope.cancel()
+
+
+@pytest.fixture
+def start_stub_server_in_thread(
+    monkeypatch: pytest.MonkeyPatch,
+) -> Iterator[StartStubServerInThread]:
+    """
+    Start stand-in servers on their own event loop thread, for synchronous tests.
+
+    Takes the same arguments as start_stub_server.
+
+    :param monkeypatch: pytest monkeypatch fixture.
+    :yield: function starting a StubServer.
+    """
+    with ExitStack() as stack:
+
+        def start(
+            config: Optional[StubServerConfig] = None,
+            **overrides: Any,
+        ) -> StubServer:
+            server = stack.enter_context(StubServer(config).run_in_thread())
+            use_stub_server(monkeypatch, server, overrides)
+            return server
+
+        yield start
+
+
+@pytest.fixture(scope="session")
+def create_worklogs() -> Callable[[int], List[WorklogModel]]:
+    """
+    Worklog factory spreading worklogs over a few issues of a single day.
+
+    :return: function taking the number of worklogs and returning them.
+    """
+
+    def create(count: int) -> List[WorklogModel]:
+        return [
+            WorklogModel(
+                issue=f"INT-{index % 3 + 1}",
+                time_spent="1h",  # type: ignore
+                start_date="2024-02-05",
+                start_time=f"{8 + index % 8}:00:00",
+            )
+            for index in range(count)
+        ]
+
+    return create
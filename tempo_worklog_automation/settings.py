@@ -1,5 +1,7 @@
 import enum
 from logging import DEBUG, ERROR, INFO, WARNING
+from pathlib import Path
+from typing import Any, List, Optional, Union
 
 from pydantic import field_validator
 from pydantic_settings import BaseSettings, SettingsConfigDict
@@ -14,11 +16,34 @@ class LogLevel(enum.Enum):
     ERROR = ERROR
 
 
+class LogFormat(str, enum.Enum):  # noqa: WPS600
+    """Format of the log lines."""
+
+    TEXT = "text"
+    JSON = "json"
+
+
+class RetryJitter(str, enum.Enum):  # noqa: WPS600
+    """Randomisation of the wait between two attempts of a request."""
+
+    NONE = "none"
+    FULL = "full"
+    DECORRELATED = "decorrelated"
+
+
+class OverlapCheck(str, enum.Enum):  # noqa: WPS600
+    """Handling of overlapping worklogs and overbooked days found before an upload."""
+
+    OFF = "off"
+    WARN = "warn"
+    FAIL = "fail"
+
+
 class Settings(BaseSettings):
     """Application settings."""
 
     @field_validator("log_level", mode="before")
-    def validate_log_level(cls, value: str) -> LogLevel:  # noqa: N805
+    def validate_log_level(cls, value: Union[str, LogLevel]) -> LogLevel:  # noqa: N805
         """
         Validate that the log level is a valid LogLevel enum member.
 
@@ -26,6 +51,8 @@ class Settings(BaseSettings):
         :raises ValueError: when field_validator condition fails.
         :return: enum log level.
         """
+        if isinstance(value, LogLevel):
+            return value
         try:
             return LogLevel[value.upper()]
         except KeyError:
@@ -35,6 +62,10 @@ class Settings(BaseSettings):
 
     log_level: LogLevel = LogLevel.INFO
     logger_name: str = "main_logger"
+    # Text lines or one JSON object per line, written by a background thread
+    # unless the log queue is disabled
+    log_format: LogFormat = LogFormat.TEXT
+    log_queue: bool = True
 
     # Current environment
     environment: str = "dev"
@@ -46,11 +77,94 @@ class Settings(BaseSettings):
     jira_account_email: str
     jira_token: str
     jira_base_api_url: str
+    jira_search_api_url: Optional[str] = None
 
     tempo_oauth_token: str
     author_account_id: str
     tempo_base_api_url: str
 
+    # Request throttling, 0 disables the concurrency limit or the token bucket
+    jira_max_concurrency: int = 10
+    jira_requests_per_second: float = 0
+    tempo_max_concurrency: int = 10
+    tempo_requests_per_second: float = 0
+    adaptive_rate_limit: bool = False
+
+    # Retries of the api requests, 0 budget means unlimited retries over a run
+    retry_max_retries: int = 5
+    retry_backoff_factor: float = 0.5
+    retry_max_backoff: float = 30
+    retry_jitter: RetryJitter = RetryJitter.FULL
+    retry_statuses: List[int] = [429, 500, 502, 503, 504]
+    retry_transport_errors: bool = True
+    retry_budget: int = 0
+
+    # Circuit breaker of each api, opens after consecutive failures, 0 disables it
+    circuit_breaker_threshold: int = 10
+    circuit_breaker_reset_timeout: float = 30
+
+    # Upload pipeline
+    upload_workers: int = 10
+    pipeline_queue_size: int = 100
+    pipeline_batch_size: int = 100
+    # Invalid rows are logged and skipped, False aborts the upload before any post
+    skip_invalid_rows: bool = True
+
+    # Failed rows are reported instead of stopping the upload, which is aborted
+    # once more than max_failure_rate of its rows failed, 0 never aborts
+    isolate_row_failures: bool = True
+    max_failure_rate: float = 0
+    failure_rate_min_rows: int = 100
+
+    # Processes of --validate-only, 1 validates in the main process, 0 one per core
+    validation_processes: int = 1
+
+    # Overlapping worklogs and days over 24h found before an upload: off, warn, fail
+    overlap_check: OverlapCheck = OverlapCheck.WARN
+
+    # Files uploaded at a time by directory and glob inputs
+    batch_max_files: int = 8
+
+    # Bulk delete workers
+    delete_workers: int = 10
+
+    # Upload journal, records created rows so interrupted uploads can be resumed
+    upload_journal: bool = True
+    upload_journal_path: Path = Path("data/upload_journal.sqlite3")
+
+    # HTTP connection pool, the limits apply to each api host
+    http2: bool = False
+    http_max_connections: int = 20
+    http_max_keepalive_connections: int = 20
+    http_keepalive_expiry: float = 30
+    http_timeout: float = 5
+    http_prewarm_connections: int = 4
+
+    # Issue key to issue id cache
+    issue_id_cache_persist: bool = True
+    issue_id_cache_path: Path = Path("data/issue_id_cache.json")
+    issue_id_cache_ttl: int = 604800
+    issue_id_cache_max_entries: int = 10000
+
+    # Watch mode, checkpoints of the followed files
+    watch_poll_interval: float = 5
+    watch_state_path: Path = Path("data/watch_state.json")
+
+    # Run statistics export, Prometheus textfile for .prom files, JSON otherwise
+    stats_file: Optional[Path] = None
+
+    @property
+    def jira_search_url(self) -> str:
+        """
+        Jira search endpoint, derived from the issue endpoint when not set.
+
+        :return: url for Jira search api endpoint.
+        """
+        if self.jira_search_api_url:
+            return self.jira_search_api_url
+        issue_url = self.jira_base_api_url.rstrip("/")
+        return f"{issue_url.rsplit('/', 1)[0]}/search"
+
     model_config = SettingsConfigDict(
         env_prefix="TEMPO_WORKLOG_AUTOMATION_",
         env_file=".env",
@@ -58,4 +172,73 @@ class Settings(BaseSettings):
     )
 
 
-settings = Settings()  # type: ignore
+class OfflineSettings(Settings):
+    """Settings of the commands that do not call the apis, credentials are optional."""
+
+    jira_account_email: str = ""
+    jira_token: str = ""
+    jira_base_api_url: str = ""
+
+    tempo_oauth_token: str = ""
+    author_account_id: str = ""
+    tempo_base_api_url: str = ""
+
+
+class LazySettings:
+    """
+    Settings proxy reading the environment and .env file on first attribute access.
+
+    Importing a module that holds the proxy does not require the api credentials,
+    commands that do not call the apis load ``OfflineSettings`` beforehand.
+    """
+
+    def __init__(self) -> None:
+        object.__setattr__(self, "_settings", None)  # noqa: WPS609
+
+    def load(self, require_credentials: bool = True) -> Settings:
+        """
+        Load the settings once, later calls return the loaded settings.
+
+        :param require_credentials: fail when the api credentials are missing.
+        :return: Settings.
+        """
+        if self._settings is None:
+            settings_class = Settings if require_credentials else OfflineSettings
+            object.__setattr__(  # noqa: WPS609
+                self,
+                "_settings",
+                settings_class(),  # type: ignore
+            )
+        return self._settings  # type: ignore
+
+    def __getattr__(self, name: str) -> Any:
+        """
+        Read a setting, loading the settings when needed.
+
+        :param name: setting name.
+        :return: setting value.
+        """
+        return getattr(self.load(), name)
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        """
+        Override a setting, loading the settings when needed.
+
+        :param name: setting name.
+        :param value: new setting value.
+        """
+        setattr(self.load(), name, value)
+
+
+_lazy_settings = LazySettings()
+settings: Settings = _lazy_settings  # type: ignore
+
+
+def load_settings(require_credentials: bool = True) -> Settings:
+    """
+    Load the settings ahead of their first use.
+
+    :param require_credentials: fail when the api credentials are missing.
+    :return: Settings.
+    """
+    return _lazy_settings.load(require_credentials)
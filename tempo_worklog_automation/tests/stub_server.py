@@ -0,0 +1,36 @@
+"""Helpers pointing the settings at a stand-in StubServer in tests."""
+from typing import Any, Awaitable, Callable, Dict
+
+import pytest
+
+from tempo_worklog_automation.benchmarks.stub_server import StubServer
+from tempo_worklog_automation.settings import settings
+
+# Coroutine function yielded by the start_stub_server fixture.
+StartStubServer = Callable[..., Awaitable[StubServer]]
+# Function yielded by the start_stub_server_in_thread fixture.
+StartStubServerInThread = Callable[..., StubServer]
+
+
+def use_stub_server(
+    monkeypatch: pytest.MonkeyPatch,
+    server: StubServer,
+    overrides: Dict[str, Any],
+) -> None:
+    """
+    Point the api urls of the settings at a StubServer for the current test.
+
+    :param monkeypatch: pytest monkeypatch fixture.
+    :param server: running StubServer.
+    :param overrides: other settings to override, the issue id cache is not
+        persisted unless overridden.
+    """
+    server_overrides: Dict[str, Any] = {
+        "jira_base_api_url": f"{server.base_url}/rest/api/2/issue",
+        "jira_search_api_url": f"{server.base_url}/rest/api/2/search",
+        "tempo_base_api_url": f"{server.base_url}/4/worklogs",
+        "issue_id_cache_persist": False,
+        **overrides,
+    }
+    for name, value in server_overrides.items():
+        monkeypatch.setattr(settings, name, value)
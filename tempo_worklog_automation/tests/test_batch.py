@@ -0,0 +1,109 @@
+import sys
+from pathlib import Path
+from typing import Any, Dict, List, Tuple
+
+import pytest
+
+from tempo_worklog_automation.benchmarks.stub_server import StubServerConfig
+from tempo_worklog_automation.client import run_upload_worklog_files
+from tempo_worklog_automation.client.utils.arguments import (
+    expand_file_paths,
+    parse_args,
+)
+from tempo_worklog_automation.tests.stub_server import StartStubServer
+
+
+def write_worklog_files(directory: Path, counts: Dict[str, int]) -> None:
+    """
+    Write a worklogs csv file for each name.
+
+    :param directory: directory receiving the files.
+    :param counts: dictionary with the number of rows of each file name.
+    """
+    directory.mkdir(parents=True, exist_ok=True)
+    for name, count in counts.items():
+        rows = [
+            f"INT-{index % 4 + 1},1800s,2024-03-{index + 1:02d},10:00:00"
+            for index in range(count)
+        ]
+        (directory / name).write_text(
+            "\n".join(["issue,time_spent,start_date,start_time", *rows]),
+        )
+
+
+def test_expand_file_paths(tmp_path: Path) -> None:
+    """
+    Test expand_file_paths.
+
+    GIVEN a directory with csv files, a nested directory and another file type
+    WHEN directories, glob patterns and plain paths are expanded
+    THEN directories must give their csv files and globs their sorted matches
+    """
+    write_worklog_files(tmp_path, {"b.csv": 1, "a.csv": 1, "notes.txt": 1})
+    write_worklog_files(tmp_path / "nested", {"c.csv": 1})
+
+    assert expand_file_paths(str(tmp_path)) == [tmp_path / "a.csv", tmp_path / "b.csv"]
+    assert expand_file_paths(f"{tmp_path}/**/*.csv") == [
+        tmp_path / "a.csv",
+        tmp_path / "b.csv",
+        tmp_path / "nested" / "c.csv",
+    ]
+    assert expand_file_paths(f"{tmp_path}/*.json") == []
+    assert expand_file_paths("missing.csv") == [Path("missing.csv")]
+
+
+def test_parse_args_deduplicates_file_paths(
+    monkeypatch: pytest.MonkeyPatch,
+    tmp_path: Path,
+) -> None:
+    """
+    Test parse_args with overlapping --file-path values.
+
+    GIVEN a directory, a glob and a relative path designating the same files
+    WHEN the arguments are parsed
+    THEN every file must be listed once, in the order it was first designated
+    """
+    write_worklog_files(tmp_path, {"b.csv": 1, "a.csv": 1})
+    monkeypatch.chdir(tmp_path)
+    file_path_args = ["b.csv", str(tmp_path), f"{tmp_path}/*.csv", "./a.csv"]
+    monkeypatch.setattr(sys, "argv", ["main", "--file-path", *file_path_args])
+
+    assert parse_args().file_paths == [Path("b.csv"), tmp_path / "a.csv"]
+
+
+@pytest.mark.anyio
+async def test_upload_worklog_files(
+    start_stub_server: StartStubServer,
+    monkeypatch: pytest.MonkeyPatch,
+    tmp_path: Path,
+) -> None:
+    """
+    Test run_upload_worklog_files against the stand-in server.
+
+    GIVEN a directory of csv files sharing issue names and a throttling server
+    WHEN the files are uploaded concurrently, two at a time
+    THEN each issue must be resolved once and every file must get its summary
+    """
+    server = await start_stub_server(
+        StubServerConfig(rate_429=0.1, retry_after=0.01, seed=5),
+        upload_journal_path=tmp_path / "journal.sqlite3",
+        batch_max_files=2,
+    )
+    jira_targets: List[str] = []
+    handle = server.handle
+
+    def record_jira_target(method: str, target: str, body: bytes) -> Tuple[Any, ...]:
+        if target.startswith("/rest/api/2/"):
+            jira_targets.append(target)
+        return handle(method, target, body)
+
+    monkeypatch.setattr(server, "handle", record_jira_target)
+    write_worklog_files(tmp_path / "batch", {"a.csv": 9, "b.csv": 4, "c.csv": 6})
+    file_paths = expand_file_paths(str(tmp_path / "batch"))
+    summaries = await run_upload_worklog_files(file_paths)
+
+    assert list(summaries) == [str(file_path) for file_path in file_paths]
+    created = [summary["created"] for summary in summaries.values()]
+    assert created == [9, 4, 6]
+    assert len(server.worklogs) == 19
+    assert len(jira_targets) == 1
@@ -0,0 +1,162 @@
+import os
+import subprocess
+import sys
+from os.path import dirname
+from pathlib import Path
+
+from tempo_worklog_automation.client.utils.csv import split_csv_shards
+from tempo_worklog_automation.client.validation import (
+    validate_worklogs,
+    validate_worklogs_file,
+    validate_worklogs_file_sharded,
+)
+
+
+def test_validate_worklogs(load_csv_file_with_random_values) -> None:  # type: ignore # noqa: E501
+    """
+    Test validate_worklogs function.
+
+    GIVEN rows loaded from a csv file where the fourth row is invalid
+    WHEN validate_worklogs is called
+    THEN the valid models and a row numbered error must be returned
+
+    :param load_csv_file_with_random_values: fixture to test csv files operations.
+    """
+    rows = load_csv_file_with_random_values["worklogs"]
+
+    report = validate_worklogs(rows, first_row=2)
+
+    assert [worklog.time_spent for worklog in report.worklogs] == [21600, 19800, 3]
+    assert report.rows == [2, 3, 4]
+    assert len(report.errors) == 1
+    assert report.errors[0].row == 5
+    assert report.errors[0].field == "time_spent"
+    assert 'hours "h" or seconds "s"' in report.errors[0].message
+
+
+def test_validate_worklogs_yaml(load_yaml_file_with_valid_values) -> None:  # type: ignore # noqa: E501
+    """
+    Test validate_worklogs function with yaml rows.
+
+    GIVEN rows loaded from a valid yaml file
+    WHEN validate_worklogs is called
+    THEN every row must be returned as a model without errors
+
+    :param load_yaml_file_with_valid_values: fixture to test yaml files operations.
+    """
+    rows = load_yaml_file_with_valid_values["worklogs"]
+
+    report = validate_worklogs(rows)
+
+    assert len(report.worklogs) == len(rows)
+    assert report.errors == []
+
+
+def test_validate_worklogs_file() -> None:
+    """
+    Test validate_worklogs_file function.
+
+    GIVEN a csv file where the fourth row is invalid
+    WHEN the file is validated two rows at a time
+    THEN the row count and the error numbered from the file start must be returned
+    """
+    file_path = Path(dirname(__file__)) / "resources" / "random_sample_worklogs.csv"
+
+    report = validate_worklogs_file(file_path, batch_size=2)
+
+    assert report.rows == 4
+    assert report.invalid_rows == 1
+    assert [(error.row, error.field) for error in report.errors] == [(4, "time_spent")]
+
+
+def test_validate_only_does_not_import_network_stack() -> None:
+    """
+    Test the --validate-only command.
+
+    GIVEN an environment without api credentials
+    WHEN a file is validated through the cli
+    THEN the report must be printed without importing httpx or anyio
+    """
+    file_path = Path(dirname(__file__)) / "resources" / "random_sample_worklogs.csv"
+    script = (
+        "import sys\n"
+        + f"sys.argv = ['main', '--validate-only', '--file-path', {str(file_path)!r}]\n"
+        + "from tempo_worklog_automation.__main__ import main\n"
+        + "try:\n"
+        + "    main()\n"
+        + "except SystemExit as exc:\n"
+        + "    loaded = [name in sys.modules for name in ('httpx', 'anyio')]\n"
+        + "    print('exit', exc.code, *loaded)\n"
+    )
+    environment = {
+        name: value
+        for name, value in os.environ.items()
+        if not name.startswith("TEMPO_WORKLOG_AUTOMATION_")
+    }
+
+    completed = subprocess.run(
+        [sys.executable, "-c", script],
+        capture_output=True,
+        text=True,
+        env=environment,
+        cwd=Path(dirname(__file__)).parent.parent,
+        check=True,
+    )
+
+    assert "4 rows, 1 invalid" in completed.stdout
+    assert completed.stdout.splitlines()[-1] == "exit 1 False False"
+
+
+def test_validate_worklogs_file_sharded(tmp_path: Path) -> None:
+    """
+    Test validate_worklogs_file_sharded function.
+
+    GIVEN a csv file with invalid rows spread over many shards
+    WHEN the file is validated by two processes
+    THEN the report must match the single process one, with file row numbers
+    """
+    rows = [
+        f"INT-{index},{'1h' if index % 7 else '1x'},2024-01-01,9:00:00"
+        for index in range(1, 501)
+    ]
+    file_path = tmp_path / "worklogs.csv"
+    file_path.write_text("\n".join(["issue,time_spent,start_date,start_time", *rows]))
+
+    shards = split_csv_shards(file_path, 8)
+    sharded_report = validate_worklogs_file_sharded(file_path, 2, batch_size=16)
+
+    assert len(shards) == 8
+    assert shards[-1].end == file_path.stat().st_size
+    assert sharded_report == validate_worklogs_file(file_path)
+    assert sharded_report.rows == 500
+    assert [error.row for error in sharded_report.errors] == list(range(7, 501, 7))
+
+
+def test_validate_worklogs_file_with_short_rows(tmp_path: Path) -> None:
+    """
+    Test validate_worklogs_file with rows missing their last fields.
+
+    GIVEN a csv file with a row missing its dates and a yaml-like row of wrong types
+    WHEN the rows are validated
+    THEN row errors must be reported instead of raising
+    """
+    file_path = tmp_path / "worklogs.csv"
+    file_path.write_text(
+        "issue,time_spent,start_date,start_time\nINT-1,1h,2024-01-01,9:00:00\nINT-2,2h",
+    )
+
+    file_report = validate_worklogs_file(file_path)
+    report = validate_worklogs(
+        [{"issue": "INT-3", "time_spent": 2, "start_date": None, "start_time": 9}],
+    )
+
+    assert file_report.rows == 2
+    assert [(error.row, error.field) for error in file_report.errors] == [
+        (2, "start_date"),
+        (2, "start_time"),
+    ]
+    assert {error.field for error in report.errors} == {
+        "time_spent",
+        "start_date",
+        "start_time",
+    }
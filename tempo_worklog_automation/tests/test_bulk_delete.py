@@ -0,0 +1,122 @@
+from pathlib import Path
+from typing import Callable, List
+
+import pytest
+
+from tempo_worklog_automation.benchmarks.stub_server import (
+    StubServer,
+    StubServerConfig,
+)
+from tempo_worklog_automation.client import (
+    run_delete_author_worklogs,
+    run_delete_uploaded_worklogs,
+)
+from tempo_worklog_automation.client.journal import (
+    CREATED,
+    DELETED,
+    open_upload_journal,
+)
+from tempo_worklog_automation.client.models import WorklogModel
+from tempo_worklog_automation.settings import settings
+from tempo_worklog_automation.tests.stub_server import StartStubServer
+
+
+def add_remote_worklog(server: StubServer, start_date: str, author: str) -> int:
+    """
+    Store a worklog directly in the stand-in server.
+
+    :param server: StubServer.
+    :param start_date: date string.
+    :param author: author account id.
+    :return: tempoWorklogId.
+    """
+    _, worklog, _ = server.handle(
+        "POST",
+        "/4/worklogs",
+        (
+            b'{"issueId": 10001, "timeSpentSeconds": 3600, "startTime": "08:00:00", '
+            + f'"startDate": "{start_date}", "authorAccountId": "{author}"}}'.encode()
+        ),
+    )
+    return worklog["tempoWorklogId"]  # type: ignore
+
+
+@pytest.fixture
+async def stub_server(start_stub_server: StartStubServer) -> StubServer:
+    """
+    Run a stand-in server failing some Tempo requests, settings point at it.
+
+    :param start_stub_server: fixture starting a stand-in server.
+    :return: running StubServer.
+    """
+    return await start_stub_server(
+        StubServerConfig(
+            rate_429=0.2,
+            rate_5xx=0.1,
+            retry_after=0.01,
+            fail_methods=["DELETE"],
+            seed=3,
+        ),
+    )
+
+
+@pytest.mark.anyio
+async def test_delete_author_worklogs_by_date_range(stub_server: StubServer) -> None:
+    """
+    Test run_delete_author_worklogs.
+
+    GIVEN worklogs of two authors inside and outside a date range
+    WHEN the first author worklogs of the range are deleted a page at a time
+    THEN only the worklogs that failed to be deleted must remain in the range
+    """
+    for day in range(1, 26):
+        add_remote_worklog(stub_server, f"2024-02-{day:02d}", "author")
+    kept_ids = {
+        add_remote_worklog(stub_server, "2024-03-01", "author"),
+        add_remote_worklog(stub_server, "2024-02-10", "other"),
+    }
+
+    summary = await run_delete_author_worklogs(
+        "author",
+        "2024-02-01",
+        "2024-02-29",
+        page_size=4,
+    )
+
+    remaining_ids = set(stub_server.worklogs) - kept_ids
+    assert summary["deleted"] + summary["failed"] == 25
+    assert len(remaining_ids) == summary["failed"]
+    assert kept_ids <= set(stub_server.worklogs)
+
+
+@pytest.mark.anyio
+async def test_delete_uploaded_worklogs(
+    stub_server: StubServer,
+    create_worklogs: Callable[[int], List[WorklogModel]],
+    monkeypatch: pytest.MonkeyPatch,
+    tmp_path: Path,
+) -> None:
+    """
+    Test run_delete_uploaded_worklogs.
+
+    GIVEN a journal recording uploaded rows, one of them already gone from Tempo
+    WHEN the uploaded worklogs are deleted
+    THEN every removed row must be marked deleted in the journal
+    """
+    monkeypatch.setattr(settings, "upload_journal_path", tmp_path / "journal.db")
+    file_path = tmp_path / "worklogs.csv"
+    file_path.touch()
+    with open_upload_journal(file_path) as journal:
+        selected = journal.select(list(enumerate(create_worklogs(7), start=1)))
+        for row_number, _ in selected:
+            worklog_id = add_remote_worklog(stub_server, "2024-02-05", "author")
+            journal.record_created(row_number, worklog_id)
+    stub_server.worklogs.pop(1)
+
+    summary = await run_delete_uploaded_worklogs(file_path, batch_size=3)
+
+    assert summary["deleted"] + summary["missing"] + summary["failed"] == 7
+    with open_upload_journal(file_path) as reopened_journal:
+        assert reopened_journal.count(CREATED) == summary["failed"]
+        assert reopened_journal.count(DELETED) == 7 - summary["failed"]
+    assert len(stub_server.worklogs) == summary["failed"]
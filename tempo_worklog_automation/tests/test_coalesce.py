@@ -0,0 +1,101 @@
+from typing import List
+
+import pytest
+
+from tempo_worklog_automation.client import run_create_worklog_requests
+from tempo_worklog_automation.client.coalesce import (
+    WorklogCoalescer,
+    coalesce_worklogs,
+)
+from tempo_worklog_automation.client.models import WorklogModel
+from tempo_worklog_automation.tests.stub_server import StartStubServer
+
+
+def create_worklog(issue: str, start_date: str, start_time: str) -> WorklogModel:
+    """
+    Create a half-hour worklog.
+
+    :param issue: issue name.
+    :param start_date: date string as YYYY-MM-DD.
+    :param start_time: time string as HH:MM:SS.
+    :return: WorklogModel.
+    """
+    return WorklogModel(
+        issue=issue,
+        time_spent="0.5h",  # type: ignore
+        start_date=start_date,
+        start_time=start_time,
+    )
+
+
+def test_coalesce_worklogs() -> None:
+    """
+    Test coalesce_worklogs function.
+
+    GIVEN unsorted half-hour worklogs, some of them back-to-back
+    WHEN coalesce_worklogs is called
+    THEN only the back-to-back worklogs of an issue and day must be merged
+    """
+    batch = [
+        (1, create_worklog("INT-1", "2024-02-05", "9:00:00")),
+        (2, create_worklog("INT-2", "2024-02-05", "08:30:00")),
+        (3, create_worklog("INT-1", "2024-02-05", "08:00:00")),
+        (4, create_worklog("INT-1", "2024-02-05", "08:30:00")),
+        (5, create_worklog("INT-1", "2024-02-05", "11:00:00")),
+        (6, create_worklog("INT-1", "2024-02-06", "09:30:00")),
+    ]
+
+    coalesced = coalesce_worklogs(batch)
+
+    assert [rows for rows, _ in coalesced] == [[3, 4, 1], [5], [6], [2]]
+    assert coalesced[0][1].start_time == "08:00:00"
+    assert coalesced[0][1].time_spent == 5400
+    assert coalesced[1][1].time_spent == 1800
+
+
+def test_coalescer_maps_back_to_rows() -> None:
+    """
+    Test WorklogCoalescer.
+
+    GIVEN a batch of back-to-back worklogs
+    WHEN it is coalesced
+    THEN the merged worklog must keep its first row and map back to every row
+    """
+    coalescer = WorklogCoalescer()
+    selected = coalescer(
+        [
+            (10, create_worklog("INT-1", "2024-02-05", "08:00:00")),
+            (11, create_worklog("INT-1", "2024-02-05", "08:30:00")),
+        ],
+    )
+
+    assert [row for row, _ in selected] == [10]
+    assert coalescer.merged == 1
+    assert coalescer.pop_rows(10) == [10, 11]
+    assert coalescer.pop_rows(12) == [12]
+
+
+@pytest.mark.anyio
+async def test_create_coalesced_worklogs_against_stub_server(
+    start_stub_server: StartStubServer,
+) -> None:
+    """
+    Test run_create_worklog_requests with coalescing.
+
+    GIVEN eight back-to-back half-hour worklogs of one issue and day
+    WHEN they are created with coalescing
+    THEN a single four hour worklog must be posted and every row must get its id
+    """
+    server = await start_stub_server()
+
+    start_times = [f"{8 + index // 2}:{index % 2 * 30:02}:00" for index in range(8)]
+    worklogs: List[WorklogModel] = [
+        create_worklog("INT-1", "2024-02-05", start_time) for start_time in start_times
+    ]
+    results = await run_create_worklog_requests(worklogs, coalesce=True)
+
+    assert [worklog["timeSpentSeconds"] for worklog in server.worklogs.values()] == [
+        14400,
+    ]
+    assert results["status_codes"] == [200] * 8
+    assert results["worklog_ids"] == [1] * 8
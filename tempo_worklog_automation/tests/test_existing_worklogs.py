@@ -0,0 +1,143 @@
+from typing import List
+
+import httpx
+import pytest
+
+from tempo_worklog_automation.client.existing import (
+    ExistingWorklogIndex,
+    date_range,
+    iter_author_worklogs,
+)
+from tempo_worklog_automation.settings import settings
+
+
+def create_remote_worklog(worklog_id: int, start_time: str) -> dict:  # type: ignore
+    """
+    Create a worklog object shaped like the Tempo api results.
+
+    :param worklog_id: tempoWorklogId.
+    :param start_time: start time string.
+    :return: worklog object.
+    """
+    return {
+        "tempoWorklogId": worklog_id,
+        "issue": {"id": 10010},
+        "startDate": "2024-02-05",
+        "startTime": start_time,
+        "timeSpentSeconds": 7200,
+    }
+
+
+@pytest.mark.anyio
+async def test_fetch_and_claim_existing_worklogs() -> None:
+    """
+    Test ExistingWorklogIndex.
+
+    GIVEN two pages of remote worklogs
+    WHEN the index is fetched and parsed worklogs are claimed
+    THEN each remote worklog must be claimed once, ignoring the time padding
+    """
+    requests: List[httpx.Request] = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        requests.append(request)
+        if request.url.params.get("offset") == "0":
+            return httpx.Response(
+                200,
+                json={
+                    "metadata": {
+                        "next": "https://tempo.test/4/worklogs/user/a?offset=1"
+                    },
+                    "results": [create_remote_worklog(1, "08:00:00")],
+                },
+            )
+        return httpx.Response(
+            200,
+            json={"metadata": {}, "results": [create_remote_worklog(2, "10:00:00")]},
+        )
+
+    async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as client:
+        index = await ExistingWorklogIndex.fetch(
+            client,
+            {},
+            "a",
+            "2024-02-05",
+            "2024-02-05",
+        )
+
+    parsed_worklog = {
+        "issueId": 10010,
+        "startDate": "2024-02-05",
+        "startTime": "8:00:00",
+        "timeSpentSeconds": 7200,
+    }
+    assert len(requests) == 2
+    assert index.claim(parsed_worklog) == 1
+    assert index.claim(parsed_worklog) is None
+
+
+def test_date_range() -> None:
+    """
+    Test date_range function.
+
+    GIVEN unordered start dates
+    WHEN date_range is called
+    THEN the first and last dates must be returned
+    """
+    assert date_range(["2024-02-07", "2024-02-05", "2024-02-06"]) == (
+        "2024-02-05",
+        "2024-02-07",
+    )
+    assert date_range(["2024-2-10", "2024-02-09"]) == ("2024-02-09", "2024-02-10")
+    assert date_range([]) is None
+
+
+@pytest.mark.anyio
+async def test_iter_author_worklogs_retries_pages(monkeypatch) -> None:  # type: ignore
+    """
+    Test iter_author_worklogs with throttled and failing pages.
+
+    GIVEN a server answering 429 then 503 before each page
+    WHEN the worklogs of an author are listed
+    THEN every page must be retried and every worklog returned
+
+    :param monkeypatch: pytest monkeypatch fixture.
+    """
+    monkeypatch.setattr(settings, "retry_backoff_factor", 0)
+    requests: List[httpx.Request] = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        requests.append(request)
+        if len(requests) % 3 == 1:
+            return httpx.Response(429, headers={"Retry-After": "0"})
+        if len(requests) % 3 == 2:
+            return httpx.Response(503)
+        if request.url.params.get("offset") == "0":
+            return httpx.Response(
+                200,
+                json={
+                    "metadata": {
+                        "next": "https://tempo.test/4/worklogs/user/a?offset=1"
+                    },
+                    "results": [create_remote_worklog(1, "08:00:00")],
+                },
+            )
+        return httpx.Response(
+            200,
+            json={"metadata": {}, "results": [create_remote_worklog(2, "10:00:00")]},
+        )
+
+    async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as client:
+        worklogs = [
+            worklog
+            async for worklog in iter_author_worklogs(
+                client,
+                {},
+                "a",
+                "2024-02-05",
+                "2024-02-05",
+            )
+        ]
+
+    assert [worklog["tempoWorklogId"] for worklog in worklogs] == [1, 2]
+    assert len(requests) == 6
@@ -0,0 +1,92 @@
+import anyio
+import pytest
+
+from tempo_worklog_automation.client.cache import IssueIdCache
+
+
+@pytest.mark.anyio
+async def test_concurrent_lookups_share_one_fetch() -> None:
+    """
+    Test IssueIdCache.get_or_fetch in-process deduplication.
+
+    GIVEN an empty IssueIdCache
+    WHEN several tasks ask for the same issue key at the same time
+    THEN the fetch coroutine must run only once and every task gets its result
+    """
+    issue_id_cache = IssueIdCache()
+    fetched_keys = []
+    results = []
+
+    async def fetch(issue_name: str) -> int:
+        fetched_keys.append(issue_name)
+        await anyio.sleep(0.01)
+        return 10010
+
+    async def lookup() -> None:
+        results.append(await issue_id_cache.get_or_fetch("INT-10", fetch))
+
+    async with anyio.create_task_group() as tg:
+        for _ in range(5):
+            tg.start_soon(lookup)
+
+    assert fetched_keys == ["INT-10"]
+    assert results == [10010] * 5
+    assert issue_id_cache.misses == 1
+    assert issue_id_cache.hits == 4
+
+
+def test_disk_store_round_trip(tmp_path) -> None:  # type: ignore
+    """
+    Test IssueIdCache save and load.
+
+    GIVEN an IssueIdCache with entries and an on-disk path
+    WHEN it is saved and loaded into a new IssueIdCache
+    THEN the new cache must return the same issue ids
+
+    :param tmp_path: pytest temporary directory fixture.
+    """
+    cache_path = tmp_path / "issue_id_cache.json"
+    issue_id_cache = IssueIdCache(path=cache_path)
+    issue_id_cache.set("INT-10", 10010)
+    issue_id_cache.set("INT-15", 10015)
+    issue_id_cache.save()
+
+    reloaded_cache = IssueIdCache(path=cache_path)
+    reloaded_cache.load()
+
+    assert reloaded_cache.get("INT-10") == 10010
+    assert reloaded_cache.get("INT-15") == 10015
+
+
+def test_expired_entries_are_dropped(tmp_path) -> None:  # type: ignore
+    """
+    Test IssueIdCache ttl.
+
+    GIVEN an IssueIdCache with a negative ttl
+    WHEN an entry is read back
+    THEN the entry must be treated as missing
+
+    :param tmp_path: pytest temporary directory fixture.
+    """
+    issue_id_cache = IssueIdCache(path=tmp_path / "issue_id_cache.json", ttl=-1)
+    issue_id_cache.set("INT-10", 10010)
+
+    assert issue_id_cache.get("INT-10") is None
+
+
+def test_oldest_entries_are_evicted() -> None:
+    """
+    Test IssueIdCache size bound.
+
+    GIVEN an IssueIdCache limited to two entries
+    WHEN a third entry is stored
+    THEN the oldest entry must be evicted
+    """
+    issue_id_cache = IssueIdCache(max_entries=2)
+    issue_id_cache.set("INT-10", 10010)
+    issue_id_cache.set("INT-15", 10015)
+    issue_id_cache.set("INT-17", 10017)
+
+    assert len(issue_id_cache) == 2
+    assert issue_id_cache.get("INT-10") is None
+    assert issue_id_cache.get("INT-17") == 10017
@@ -0,0 +1,128 @@
+from typing import List
+
+import httpx
+import pytest
+
+from tempo_worklog_automation.client import cache_issue_names, resolve_issue_ids
+from tempo_worklog_automation.client.cache import IssueIdCache
+from tempo_worklog_automation.client.exceptions import UnknownIssuesError
+
+JIRA_ISSUES = {"INT-10": 10010, "INT-15": 10015, "INT-17": 10017}
+# Old keys of moved issues, only resolved by the issue endpoint.
+MOVED_ISSUES = {"OLD-3": 10017}
+
+
+def create_jira_search_client(requests: List[httpx.Request]) -> httpx.AsyncClient:
+    """
+    Create an httpx.AsyncClient answering Jira search requests with two issues a page.
+
+    Requests without a query are answered as issue requests, resolving the moved
+    issues only.
+
+    :param requests: list to store the received requests.
+    :return: httpx.AsyncClient with a mock transport.
+    """
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        requests.append(request)
+        if "jql" not in request.url.params:
+            issue_id = MOVED_ISSUES.get(request.url.path.rsplit("/", 1)[-1])
+            if issue_id is None:
+                return httpx.Response(404, json={"errorMessages": ["Not found"]})
+            return httpx.Response(200, json={"id": str(issue_id)})
+        jql = request.url.params["jql"]
+        start_at = int(request.url.params["startAt"])
+        found = [
+            {"id": str(issue_id), "key": issue_name}
+            for issue_name, issue_id in JIRA_ISSUES.items()
+            if f'"{issue_name}"' in jql
+        ]
+        return httpx.Response(
+            200,
+            json={"total": len(found), "issues": found[start_at : start_at + 2]},
+        )
+
+    return httpx.AsyncClient(transport=httpx.MockTransport(handler))
+
+
+@pytest.mark.anyio
+async def test_resolve_issue_ids() -> None:
+    """
+    Test resolve_issue_ids function.
+
+    GIVEN a list of issue names with duplicates
+    WHEN resolve_issue_ids is called
+    THEN every distinct issue must be resolved through paginated search requests
+    """
+    requests: List[httpx.Request] = []
+    async with create_jira_search_client(requests) as client:
+        issue_ids = await resolve_issue_ids(
+            ["INT-10", "INT-15", "INT-10", "INT-17", "INT-15"],
+            client,
+        )
+
+    assert issue_ids == JIRA_ISSUES
+    assert len(requests) == 2
+
+
+@pytest.mark.anyio
+async def test_resolve_issue_ids_reports_unknown_issues() -> None:
+    """
+    Test resolve_issue_ids function with unknown issues.
+
+    GIVEN a list of issue names where some do not exist
+    WHEN resolve_issue_ids is called
+    THEN a single UnknownIssuesError listing all the unknown issues must be raised
+    """
+    requests: List[httpx.Request] = []
+    async with create_jira_search_client(requests) as client:
+        with pytest.raises(UnknownIssuesError, match="INT-98, INT-99"):
+            await resolve_issue_ids(["INT-10", "INT-99", "INT-98"], client)
+
+
+@pytest.mark.anyio
+async def test_resolve_issue_ids_normalizes_and_follows_moved_issues() -> None:
+    """
+    Test resolve_issue_ids function with lower case and moved issue keys.
+
+    GIVEN a lower case issue key, a moved issue key and a key with a double quote
+    WHEN resolve_issue_ids is called
+    THEN the ids must be keyed by the given names, the moved key resolved by the
+    issue endpoint and the quote escaped in the search
+    """
+    requests: List[httpx.Request] = []
+    async with create_jira_search_client(requests) as client:
+        with pytest.raises(UnknownIssuesError, match='INT-"1'):
+            await resolve_issue_ids(['INT-"1'], client)
+        issue_ids = await resolve_issue_ids([" int-10", "OLD-3"], client)
+
+    assert '"INT-\\"1"' in requests[0].url.params["jql"]
+    assert issue_ids == {" int-10": 10010, "OLD-3": 10017}
+
+
+@pytest.mark.anyio
+async def test_cache_issue_names_counts_hits_and_misses() -> None:
+    """
+    Test cache_issue_names function with a partly filled cache.
+
+    GIVEN a cache holding one of three issue names
+    WHEN the names are resolved in bulk, with duplicates
+    THEN one hit and two misses must be counted and only the misses searched
+    """
+    requests: List[httpx.Request] = []
+    issue_id_cache = IssueIdCache()
+    issue_id_cache.set("INT-10", 10010)
+    async with create_jira_search_client(requests) as client:
+        await cache_issue_names(
+            ["INT-10", "INT-15", "INT-17", "INT-15", "INT-10"],
+            issue_id_cache,
+            client,
+        )
+
+    assert issue_id_cache.stats() == {
+        **issue_id_cache.stats(),
+        "hits": 1,
+        "misses": 2,
+    }
+    assert issue_id_cache.get("INT-17") == 10017
+    assert '"INT-10"' not in requests[0].url.params["jql"]
@@ -0,0 +1,60 @@
+import io
+import json
+import logging
+
+from tempo_worklog_automation.client.utils.log import LoggingClass
+
+
+def test_queued_logger_writes_each_record_once() -> None:
+    """
+    Test LoggingClass with the log queue.
+
+    GIVEN a queued logger writing to a stream
+    WHEN records are logged, one of them below the logger level
+    THEN each enabled record must be written once, by the time the listener stops
+    """
+    stream = io.StringIO()
+    logging_class = LoggingClass(
+        name="test_queued_logger",
+        handler=logging.StreamHandler(stream),
+    )
+    logger = logging_class.create_logger()
+
+    logger.info("Created %s worklogs.", 3)
+    logger.debug("Retrying in %.2f seconds...", 0.5)
+    logging_class.stop()
+
+    lines = stream.getvalue().splitlines()
+    assert len(lines) == 1
+    assert lines[0].endswith(" -- Created 3 worklogs.")
+    assert logging_class.listener is None
+
+
+def test_json_formatter() -> None:
+    """
+    Test LoggingClass with the JSON format.
+
+    GIVEN a logger formatting records as JSON lines, without the queue
+    WHEN an error is logged with an exception
+    THEN a single JSON object with the level, message and exception must be written
+    """
+    stream = io.StringIO()
+    logger = LoggingClass(
+        name="test_json_logger",
+        handler=logging.StreamHandler(stream),
+        json_format=True,
+        use_queue=False,
+    ).create_logger()
+
+    try:
+        raise ValueError("bad row")
+    except ValueError:
+        logger.exception("Row %s failed", 7)
+
+    lines = stream.getvalue().splitlines()
+    assert len(lines) == 1
+    entry = json.loads(lines[0])
+    assert entry["level"] == "ERROR"
+    assert entry["message"] == "Row 7 failed"
+    assert "ValueError: bad row" in entry["exception"]
+    assert entry["function"] == "test_json_formatter"
@@ -0,0 +1,171 @@
+import sys
+from pathlib import Path
+from typing import List
+
+import anyio
+import pytest
+
+from tempo_worklog_automation.benchmarks.stub_server import StubServerConfig
+from tempo_worklog_automation.client import run_upload_manifest
+from tempo_worklog_automation.client.manifest import (
+    FairScheduler,
+    create_tempo_accounts,
+    load_upload_manifest,
+)
+from tempo_worklog_automation.client.utils.arguments import parse_args
+from tempo_worklog_automation.settings import settings
+from tempo_worklog_automation.tests.stub_server import StartStubServer
+
+
+@pytest.mark.anyio
+async def test_fair_scheduler_interleaves_clients() -> None:
+    """
+    Test FairScheduler.
+
+    GIVEN a single slot and a client queueing many requests before another one
+    WHEN the slot is released after each request
+    THEN the clients must take turns until the smaller one is done
+    """
+    scheduler = FairScheduler(1)
+    granted: List[str] = []
+    queued = anyio.Event()
+
+    async def request(client: str) -> None:
+        async with scheduler.slot(client):
+            granted.append(client)
+            await queued.wait()
+
+    async with anyio.create_task_group() as tg:
+        for _ in range(4):
+            tg.start_soon(request, "large")
+        await anyio.wait_all_tasks_blocked()
+        for _ in range(2):
+            tg.start_soon(request, "small")
+        await anyio.wait_all_tasks_blocked()
+        queued.set()
+
+    assert granted == ["large", "large", "small", "large", "small", "large"]
+
+
+def write_manifest(tmp_path: Path) -> Path:
+    """
+    Write a manifest with three authors, two of them sharing the settings token.
+
+    :param tmp_path: directory receiving the manifest and the csv files.
+    :return: manifest path.
+    """
+    authors = {"alice": 12, "bob": 3, "carol": 5}
+    for author, count in authors.items():
+        rows = [
+            f"INT-{index % 3 + 1},1h,2024-02-{index + 1:02d},9:00:00"
+            for index in range(count)
+        ]
+        (tmp_path / f"{author}.csv").write_text(
+            "\n".join(["issue,time_spent,start_date,start_time", *rows]),
+        )
+    manifest_path = tmp_path / "manifest.yaml"
+    manifest_path.write_text(
+        "authors:\n"
+        + "  - {author_account_id: alice, file_path: alice.csv,"
+        + " tempo_oauth_token: t1}\n"
+        + "  - {author_account_id: bob, file_path: bob.csv}\n"
+        + "  - {author_account_id: carol, file_path: carol.csv}\n",
+    )
+    return manifest_path
+
+
+def test_accounts_share_limiters_by_token(tmp_path: Path) -> None:
+    """
+    Test create_tempo_accounts.
+
+    GIVEN a manifest where two authors fall back to the settings token
+    WHEN the accounts are created
+    THEN authors must share a limiter only when they share a token
+    """
+    manifest = load_upload_manifest(write_manifest(tmp_path))
+    alice, bob, carol = create_tempo_accounts(manifest)
+
+    assert manifest.authors[0].file_path == tmp_path / "alice.csv"
+    assert alice.headers["Authorization"] == "Bearer t1"
+    assert bob.tempo_oauth_token == settings.tempo_oauth_token
+    assert bob.limiter is carol.limiter
+    assert alice.limiter is not bob.limiter
+
+
+def test_parse_args_rejects_manifest_with_file_path(
+    monkeypatch: pytest.MonkeyPatch,
+    capsys: pytest.CaptureFixture[str],
+    tmp_path: Path,
+) -> None:
+    """
+    Test parse_args with both --manifest and --file-path.
+
+    GIVEN a manifest and a worklogs file
+    WHEN both are passed on the command line
+    THEN the arguments must be rejected rather than the file ignored
+    """
+    manifest_path = write_manifest(tmp_path)
+    monkeypatch.setattr(
+        sys,
+        "argv",
+        ["main", "--manifest", str(manifest_path), "--file-path", "worklogs.csv"],
+    )
+
+    with pytest.raises(SystemExit):
+        parse_args()
+
+    assert "--manifest can not be used with --file-path." in capsys.readouterr().err
+
+
+@pytest.mark.anyio
+async def test_upload_manifest(
+    start_stub_server: StartStubServer,
+    tmp_path: Path,
+) -> None:
+    """
+    Test run_upload_manifest against the stand-in server.
+
+    GIVEN a manifest with three authors and files of different sizes
+    WHEN the manifest is uploaded
+    THEN every author worklog must be created under its own account
+    """
+    server = await start_stub_server(
+        StubServerConfig(rate_429=0.1, retry_after=0.01, seed=4),
+        upload_journal_path=tmp_path / "journal.sqlite3",
+    )
+
+    summaries = await run_upload_manifest(
+        load_upload_manifest(write_manifest(tmp_path)),
+    )
+
+    created = {summary["author"]: summary["created"] for summary in summaries.values()}
+    assert created == {"alice": 12, "bob": 3, "carol": 5}
+    authors = [worklog["author"]["accountId"] for worklog in server.worklogs.values()]
+    assert authors.count("alice") == 12
+    assert authors.count("carol") == 5
+
+
+@pytest.mark.anyio
+async def test_upload_manifest_isolates_failing_authors(
+    start_stub_server: StartStubServer,
+    tmp_path: Path,
+) -> None:
+    """
+    Test run_upload_manifest with the file of an author missing.
+
+    GIVEN a manifest whose second author file was removed
+    WHEN the manifest is uploaded
+    THEN the error of that author must be reported and the others uploaded
+    """
+    server = await start_stub_server(upload_journal_path=tmp_path / "journal.sqlite3")
+    manifest = load_upload_manifest(write_manifest(tmp_path))
+    (tmp_path / "bob.csv").unlink()
+
+    summaries = await run_upload_manifest(manifest)
+
+    bob_summary = summaries[str(tmp_path / "bob.csv")]
+    assert bob_summary["author"] == "bob"
+    assert "bob.csv" in bob_summary["error"]
+    assert summaries[str(tmp_path / "alice.csv")]["created"] == 12
+    assert summaries[str(tmp_path / "carol.csv")]["created"] == 5
+    assert len(server.worklogs) == 17
@@ -0,0 +1,71 @@
+import json
+from pathlib import Path
+from typing import Callable, List
+
+import pytest
+
+from tempo_worklog_automation.benchmarks.stub_server import StubServerConfig
+from tempo_worklog_automation.client import run_create_worklog_requests
+from tempo_worklog_automation.client.metrics import (
+    LatencyHistogram,
+    RunStatistics,
+    hook_scope,
+)
+from tempo_worklog_automation.client.models import WorklogModel
+from tempo_worklog_automation.tests.stub_server import StartStubServer
+
+
+def test_latency_histogram_quantiles() -> None:
+    """
+    Test LatencyHistogram.
+
+    GIVEN latency samples spread over two buckets
+    WHEN quantiles are estimated
+    THEN they must fall inside the bucket holding their rank
+    """
+    histogram = LatencyHistogram((0.1, 1))
+    for seconds in (0.05, 0.05, 0.5, 0.5):
+        histogram.observe(seconds)
+
+    assert histogram.cumulative() == [("0.1", 2), ("1", 4), ("+Inf", 4)]
+    assert histogram.quantile(0.5) == pytest.approx(0.1)
+    assert 0.1 < histogram.quantile(0.99) <= 1
+
+
+@pytest.mark.anyio
+async def test_run_statistics_export(
+    start_stub_server: StartStubServer,
+    create_worklogs: Callable[[int], List[WorklogModel]],
+    tmp_path: Path,
+) -> None:
+    """
+    Test RunStatistics collected during an upload.
+
+    GIVEN a stand-in server throttling some Tempo requests
+    WHEN worklogs are created with a RunStatistics hook registered
+    THEN requests, retries, bytes and phases must be recorded and exported
+    """
+    server = await start_stub_server(
+        StubServerConfig(rate_429=0.3, retry_after=0.01, seed=2),
+    )
+
+    with hook_scope(RunStatistics()) as statistics:
+        await run_create_worklog_requests(create_worklogs(10))
+
+    posts = statistics.endpoints["POST /4/worklogs"]
+    assert posts.status_codes[200] == 10
+    assert posts.retries == posts.status_codes[429] == server.counters["throttled"]
+    assert posts.bytes_sent > 0 and posts.bytes_received > 0
+    assert "GET /rest/api/2/search" in statistics.endpoints
+    assert {"validate", "resolve", "post", "total"} <= statistics.phases.keys()
+    assert statistics.backoff_seconds > 0
+
+    statistics.write(tmp_path / "stats.json")
+    exported = json.loads((tmp_path / "stats.json").read_text())
+    assert exported["endpoints"]["POST /4/worklogs"]["requests"] == posts.latency.count
+
+    statistics.write(tmp_path / "stats.prom")
+    textfile = (tmp_path / "stats.prom").read_text()
+    posts_sample = 'endpoint="POST /4/worklogs",status="200"} 10'
+    assert f"tempo_worklog_requests_total{{{posts_sample}" in textfile
+    assert "# TYPE tempo_worklog_request_duration_seconds histogram" in textfile
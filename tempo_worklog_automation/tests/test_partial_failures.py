@@ -0,0 +1,108 @@
+from pathlib import Path
+
+import pytest
+
+from tempo_worklog_automation.__main__ import count_failures
+from tempo_worklog_automation.benchmarks.stub_server import StubServerConfig
+from tempo_worklog_automation.client import run_upload_worklogs_file
+from tempo_worklog_automation.client.exceptions import FailureThresholdError
+from tempo_worklog_automation.client.results import (
+    FAILED,
+    RETRYABLE,
+    SUCCEEDED,
+    MemoryResultSink,
+)
+from tempo_worklog_automation.tests.stub_server import StartStubServer
+
+
+def write_worklogs(file_path: Path, count: int, rejected_rows: int) -> None:
+    """
+    Write a worklogs file whose first rows have no time spent.
+
+    :param file_path: Path object for the csv file.
+    :param count: number of rows.
+    :param rejected_rows: number of rows the api rejects.
+    """
+    lines = ["issue,time_spent,start_date,start_time"]
+    for index in range(count):
+        time_spent = "0h" if index < rejected_rows else "1h"
+        lines.append(f"INT-1,{time_spent},2024-02-{index + 1:02},9:00:00")
+    file_path.write_text("\n".join(lines))
+
+
+@pytest.mark.anyio
+async def test_failed_rows_do_not_stop_the_upload(
+    tmp_path: Path,
+    start_stub_server: StartStubServer,
+) -> None:
+    """
+    Test run_upload_worklogs_file with rejected and unavailable rows.
+
+    GIVEN a file with rows the api rejects and a server answering 503 at times
+    WHEN the file is uploaded
+    THEN every other row must be created and the rejected rows must not stop it
+    """
+    file_path = tmp_path / "worklogs.csv"
+    write_worklogs(file_path, 20, rejected_rows=3)
+    sink = MemoryResultSink()
+    server = await start_stub_server(
+        StubServerConfig(rate_5xx=0.3, fail_methods=["POST"], seed=4),
+        upload_journal=False,
+        retry_max_retries=0,
+    )
+
+    summary = await run_upload_worklogs_file(file_path, sink=sink)
+
+    rows = sink.rows_by_outcome()
+    assert server.counters["errors"]
+    assert summary["created"] == len(server.worklogs) == len(rows[SUCCEEDED])
+    assert summary[RETRYABLE] == len(rows[RETRYABLE]) == server.counters["errors"]
+    assert rows[FAILED]
+    assert set(rows[FAILED]) <= {1, 2, 3}
+    assert not {1, 2, 3} & set(rows[SUCCEEDED])
+    assert summary["created"] + summary[FAILED] + summary[RETRYABLE] == 20
+
+
+@pytest.mark.anyio
+async def test_upload_aborts_over_the_failure_threshold(
+    tmp_path: Path,
+    start_stub_server: StartStubServer,
+) -> None:
+    """
+    Test run_upload_worklogs_file with a failure threshold.
+
+    GIVEN a file whose rows are mostly rejected and a 25% failure threshold
+    WHEN the file is uploaded
+    THEN FailureThresholdError must be raised before every row is posted
+    """
+    file_path = tmp_path / "worklogs.csv"
+    write_worklogs(file_path, 28, rejected_rows=20)
+    server = await start_stub_server(
+        upload_journal=False,
+        retry_max_retries=0,
+        max_failure_rate=0.25,
+        failure_rate_min_rows=4,
+        upload_workers=1,
+    )
+
+    with pytest.raises(FailureThresholdError):
+        await run_upload_worklogs_file(file_path)
+
+    assert server.counters["requests"] < 28
+
+
+def test_count_failures() -> None:
+    """
+    Test count_failures function.
+
+    GIVEN summaries of a single file, of several files and of a failed file
+    WHEN their failures are counted
+    THEN failed and retryable rows and failed files must be counted
+    """
+    assert count_failures({"created": 3, FAILED: 0, RETRYABLE: 0}) == 0
+    assert count_failures({"created": 1, FAILED: 1, RETRYABLE: 2}) == 3
+    summaries = {
+        "a.csv": {"created": 2, FAILED: 1, RETRYABLE: 0},
+        "b.csv": {"error": "OSError()"},
+    }
+    assert count_failures(summaries) == 2
@@ -0,0 +1,107 @@
+from pathlib import Path
+from typing import List
+
+import pytest
+
+from tempo_worklog_automation.benchmarks.stub_server import StubServerConfig
+from tempo_worklog_automation.client import run_upload_worklogs_file
+from tempo_worklog_automation.client.exceptions import (
+    InvalidWorklogsError,
+    UnknownIssuesError,
+)
+from tempo_worklog_automation.client.models import WorklogModel
+from tempo_worklog_automation.client.pipeline import WorklogPipeline
+from tempo_worklog_automation.settings import settings
+from tempo_worklog_automation.tests.stub_server import StartStubServer
+
+
+@pytest.mark.anyio
+async def test_pipeline_streams_rows(load_csv_file_with_random_values) -> None:  # type: ignore # noqa: E501
+    """
+    Test WorklogPipeline.run.
+
+    GIVEN rows from a csv file where one row is invalid
+    WHEN the rows go through a WorklogPipeline
+    THEN every valid row must be resolved and posted once and the invalid one skipped
+
+    :param load_csv_file_with_random_values: fixture to test csv files operations.
+    """
+    rows = load_csv_file_with_random_values["worklogs"]
+    resolved_batches: List[List[str]] = []
+    posted: List[int] = []
+
+    async def resolve_batch(list_of_worklogs: List[WorklogModel]) -> None:
+        resolved_batches.append([worklog.issue for worklog in list_of_worklogs])
+
+    async def post(index: int, worklog: WorklogModel) -> None:
+        posted.append(index)
+
+    pipeline = WorklogPipeline(resolve_batch, post, workers=2, batch_size=2)
+    summary = await pipeline.run(iter(rows))
+
+    assert summary == {"rows": 4, "invalid": 1}
+    assert sorted(posted) == [1, 2, 3]
+    assert sorted(sum(resolved_batches, [])) == ["INT-10", "INT-15", "INT-17"]
+
+
+def write_worklogs(file_path: Path, issues: List[str], time_spent: str = "1h") -> None:
+    """
+    Write a worklogs csv file with a row for each issue.
+
+    :param file_path: Path object for the csv file.
+    :param issues: issue name of each row.
+    :param time_spent: time spent of every row.
+    """
+    lines = ["issue,time_spent,start_date,start_time"]
+    lines.extend(
+        f"{issue},{time_spent},2024-02-{index % 28 + 1:02},9:00:00"
+        for index, issue in enumerate(issues)
+    )
+    file_path.write_text("\n".join(lines))
+
+
+@pytest.mark.anyio
+async def test_upload_checks_every_issue_before_posting(
+    tmp_path: Path,
+    start_stub_server: StartStubServer,
+) -> None:
+    """
+    Test run_upload_worklogs_file with unknown issues in a late batch.
+
+    GIVEN a file whose last batch has unknown issues
+    WHEN it is uploaded in batches of ten rows
+    THEN a single UnknownIssuesError must be raised before any worklog is posted
+    """
+    csv_file_path = tmp_path / "worklogs.csv"
+    write_worklogs(csv_file_path, ["INT-1"] * 50 + ["BAD-1", "BAD-2"])
+    server = await start_stub_server(
+        StubServerConfig(unknown_issues=["BAD-1", "BAD-2"]),
+        upload_journal=False,
+        pipeline_batch_size=10,
+    )
+
+    with pytest.raises(UnknownIssuesError, match="BAD-1, BAD-2"):
+        await run_upload_worklogs_file(csv_file_path)
+
+    assert not server.worklogs
+
+
+@pytest.mark.anyio
+async def test_upload_can_refuse_invalid_rows(
+    tmp_path: Path,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    """
+    Test run_upload_worklogs_file with invalid rows not skipped.
+
+    GIVEN a file with an invalid row and skip_invalid_rows disabled
+    WHEN it is uploaded
+    THEN InvalidWorklogsError must be raised before any request is sent
+    """
+    csv_file_path = tmp_path / "worklogs.csv"
+    write_worklogs(csv_file_path, ["INT-1", "INT-2"], time_spent="1x")
+    monkeypatch.setattr(settings, "skip_invalid_rows", False)
+    monkeypatch.setattr(settings, "upload_journal", False)
+
+    with pytest.raises(InvalidWorklogsError, match="2 invalid rows"):
+        await run_upload_worklogs_file(csv_file_path)
@@ -0,0 +1,113 @@
+import json
+from os.path import dirname
+from pathlib import Path
+
+import pytest
+
+from tempo_worklog_automation.client.utils.csv import (
+    CSV_ENCODING,
+    iter_csv_rows,
+    iter_csv_shard_rows,
+    split_csv_shards,
+)
+from tempo_worklog_automation.client.utils.readers import (
+    get_reader,
+    iter_worklog_rows,
+)
+
+RESOURCES = Path(dirname(__file__)) / "resources"
+
+
+def test_readers_yield_the_same_rows(tmp_path: Path) -> None:
+    """
+    Test iter_worklog_rows.
+
+    GIVEN the same worklogs as csv, YAML and JSON Lines files
+    WHEN each file is read with the reader of its extension
+    THEN every reader must yield the same row dictionaries
+    """
+    csv_rows = list(iter_csv_rows(RESOURCES / "random_sample_worklogs.csv"))
+    jsonl_path = tmp_path / "worklogs.jsonl"
+    jsonl_path.write_text(
+        "\n\n".join(json.dumps({**row, "comment": "extra"}) for row in csv_rows),
+    )
+
+    yaml_rows = iter_worklog_rows(RESOURCES / "random_sample_worklogs.yaml")
+
+    assert list(yaml_rows) == csv_rows
+    assert list(iter_worklog_rows(jsonl_path)) == csv_rows
+
+
+def test_csv_shard_rows_match_the_csv_reader(tmp_path: Path) -> None:
+    """
+    Test iter_csv_shard_rows.
+
+    GIVEN a csv file with line separator characters and a quoted line break in fields
+    WHEN the file is read as a single shard
+    THEN the rows must match the ones of the regular csv reader
+    """
+    csv_path = tmp_path / "worklogs.csv"
+    csv_path.write_bytes(
+        (
+            "issue,time_spent,start_date,start_time\n"
+            + "INT-1\x0bA,1h,2024-01-01,9:00:00\n"
+            + '"INT-2\nB",1h,2024-01-02,9:00:00\n'
+            + "INT-3\x1cC,1h,2024-01-03,9:00:00\n"
+        ).encode(CSV_ENCODING),
+    )
+
+    shard_rows = [
+        row
+        for shard in split_csv_shards(csv_path, 1)
+        for row in iter_csv_shard_rows(shard)
+    ]
+
+    assert [row["issue"] for row in shard_rows] == [
+        "INT-1\x0bA",
+        "INT-2\nB",
+        "INT-3\x1cC",
+    ]
+    assert shard_rows == list(iter_csv_rows(csv_path))
+
+
+def test_yaml_reader_streams_worklogs_entries(tmp_path: Path) -> None:
+    """
+    Test the YAML reader.
+
+    GIVEN a YAML file with other keys around the worklogs list and unquoted times
+    WHEN the file is read
+    THEN only the worklogs entries must be yielded, with their values as written
+    """
+    yaml_path = tmp_path / "worklogs.yml"
+    yaml_path.write_text(
+        "exported_by: {name: exporter, versions: [1, 2]}\n"
+        + "worklogs:\n"
+        + "  - {issue: INT-1, time_spent: 1h, start_date: 2024-01-02, start_time: 8:30:00}\n"  # noqa: E501
+        + "  - issue: INT-2\n"
+        + "    time_spent: 3600s\n"
+        + "footer: [done]\n",
+    )
+
+    rows = list(iter_worklog_rows(yaml_path))
+
+    assert rows == [
+        {
+            "issue": "INT-1",
+            "time_spent": "1h",
+            "start_date": "2024-01-02",
+            "start_time": "8:30:00",
+        },
+        {"issue": "INT-2", "time_spent": "3600s", "start_date": "", "start_time": ""},
+    ]
+
+
+def test_unsupported_extension() -> None:
+    """
+    Test get_reader.
+
+    GIVEN a file extension without a reader
+    WHEN its reader is requested
+    THEN a ValueError listing the supported extensions must be raised
+    """
+    with pytest.raises(ValueError, match=".jsonl"):
+        get_reader(Path("worklogs.xlsx"))
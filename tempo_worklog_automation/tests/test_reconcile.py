@@ -0,0 +1,202 @@
+from pathlib import Path
+from typing import Any, Dict, List
+
+import pytest
+
+from tempo_worklog_automation.client import (
+    run_sync_worklogs_file,
+    run_upload_worklogs_file,
+)
+from tempo_worklog_automation.client.exceptions import InvalidWorklogsError
+from tempo_worklog_automation.client.reconcile import (
+    WorklogMatch,
+    WorklogUpdate,
+    load_worklogs_file,
+    plan_reconciliation,
+)
+from tempo_worklog_automation.tests.stub_server import StartStubServer
+
+
+def create_payload(issue_id: int, start_time: str, hours: int = 1) -> Dict[str, Any]:
+    """
+    Create a worklog payload as returned by parse_worklog.
+
+    :param issue_id: Jira internal issue id.
+    :param start_time: time string as HH:MM:SS.
+    :param hours: time spent in hours.
+    :return: worklog payload.
+    """
+    return {
+        "issueId": issue_id,
+        "startDate": "2024-02-05",
+        "startTime": start_time,
+        "timeSpentSeconds": hours * 3600,
+    }
+
+
+def create_remote(worklog_id: int, issue_id: int, start_time: str) -> Dict[str, Any]:
+    """
+    Create a one hour remote worklog as returned by the Tempo api.
+
+    :param worklog_id: tempoWorklogId.
+    :param issue_id: Jira internal issue id.
+    :param start_time: time string as HH:MM:SS.
+    :return: remote worklog object.
+    """
+    return {
+        "tempoWorklogId": worklog_id,
+        "issue": {"id": issue_id},
+        "startDate": "2024-02-05",
+        "startTime": start_time,
+        "timeSpentSeconds": 3600,
+    }
+
+
+def write_worklogs(file_path: Path, slots: List[str]) -> None:
+    """
+    Write a one hour worklog for each issue and start time.
+
+    :param file_path: Path object for the csv file.
+    :param slots: issue and start time of each row, as ISSUE@HH:MM:SS.
+    """
+    lines = ["issue,time_spent,start_date,start_time"]
+    for slot in slots:
+        issue, start_time = slot.split("@")
+        lines.append(f"{issue},1h,2024-02-05,{start_time}")
+    file_path.write_text("\n".join(lines))
+
+
+def test_plan_reconciliation() -> None:
+    """
+    Test plan_reconciliation function.
+
+    GIVEN local rows with an unchanged, a moved, a lengthened and a new worklog
+    WHEN they are matched against remote worklogs, one of them gone from the rows
+        and one of them not owned by the rows
+    THEN only the changed rows must be updated, the new one created, the
+        removed one deleted and the one not owned left alone
+    """
+    local_worklogs = [
+        (1, create_payload(10001, "8:00:00")),
+        (2, create_payload(10001, "09:30:00")),
+        (3, create_payload(10002, "09:00:00", hours=2)),
+        (4, create_payload(10002, "13:00:00")),
+    ]
+    remote_worklogs = [
+        create_remote(101, 10001, "08:00:00"),
+        create_remote(102, 10001, "09:00:00"),
+        create_remote(103, 10002, "09:00:00"),
+        create_remote(104, 10003, "09:00:00"),
+        create_remote(105, 10003, "10:00:00"),
+    ]
+
+    plan = plan_reconciliation(local_worklogs, remote_worklogs, {101, 102, 103, 104})
+
+    assert plan.unchanged == [WorklogMatch(1, 101, True)]
+    assert plan.updates == [
+        WorklogUpdate(2, 102, local_worklogs[1][1]),
+        WorklogUpdate(3, 103, local_worklogs[2][1]),
+    ]
+    assert plan.creates == [local_worklogs[3]]
+    assert plan.deletes == [104]
+    assert plan.requests == 4
+
+
+def test_load_worklogs_file_rejects_invalid_rows(tmp_path: Path) -> None:
+    """
+    Test load_worklogs_file with an invalid row.
+
+    GIVEN a csv file with an invalid time spent
+    WHEN it is loaded for synchronisation
+    THEN InvalidWorklogsError must be raised
+    """
+    csv_file_path = tmp_path / "worklogs.csv"
+    csv_file_path.write_text(
+        "issue,time_spent,start_date,start_time\nINT-1,1x,2024-02-05,09:00:00",
+    )
+
+    with pytest.raises(InvalidWorklogsError):
+        load_worklogs_file(csv_file_path)
+
+
+@pytest.mark.anyio
+async def test_sync_sends_one_request_per_edited_row(
+    tmp_path: Path,
+    start_stub_server: StartStubServer,
+) -> None:
+    """
+    Test run_sync_worklogs_file against the stand-in server.
+
+    GIVEN an uploaded file in which a row is then moved, a row removed and a row added
+    WHEN the file is synchronised
+    THEN a single update, delete and create must be sent and the remote worklogs
+    must match the file
+    """
+    csv_file_path = tmp_path / "worklogs.csv"
+    write_worklogs(
+        csv_file_path,
+        ["INT-1@8:00:00", "INT-1@9:00:00", "INT-1@10:00:00", "INT-2@11:00:00"],
+    )
+    server = await start_stub_server(upload_journal_path=tmp_path / "journal.sqlite3")
+    await run_upload_worklogs_file(csv_file_path)
+
+    write_worklogs(
+        csv_file_path,
+        ["INT-1@8:00:00", "INT-1@9:00:00", "INT-1@10:30:00", "INT-3@16:00:00"],
+    )
+    requests = server.counters["requests"]
+    summary = await run_sync_worklogs_file(csv_file_path)
+
+    assert summary == {
+        "created": 1,
+        "updated": 1,
+        "deleted": 1,
+        "unchanged": 2,
+        "failed": 0,
+    }
+    # One issue search and one page of remote worklogs, then the plan.
+    assert server.counters["requests"] - requests == 5
+    start_times = sorted(worklog["startTime"] for worklog in server.worklogs.values())
+    assert start_times == ["10:30:00", "16:00:00", "8:00:00", "9:00:00"]
+
+
+@pytest.mark.anyio
+async def test_sync_only_deletes_the_worklogs_of_the_file(
+    tmp_path: Path,
+    start_stub_server: StartStubServer,
+) -> None:
+    """
+    Test run_sync_worklogs_file with worklogs uploaded from another file.
+
+    GIVEN two files uploaded over the same days
+    WHEN the last day is removed from one file and it is synchronised
+    THEN only the worklog of that file on the removed day must be deleted
+    """
+    server = await start_stub_server(upload_journal_path=tmp_path / "journal.sqlite3")
+    header = "issue,time_spent,start_date,start_time\n"
+    other_file_path = tmp_path / "other.csv"
+    other_file_path.write_text(
+        header + "INT-2,1h,2024-02-05,9:00:00\nINT-2,1h,2024-02-06,9:00:00\n",
+    )
+    await run_upload_worklogs_file(other_file_path)
+    csv_file_path = tmp_path / "worklogs.csv"
+    csv_file_path.write_text(
+        header + "INT-1,1h,2024-02-05,8:00:00\nINT-1,1h,2024-02-06,8:00:00\n",
+    )
+    await run_upload_worklogs_file(csv_file_path)
+
+    csv_file_path.write_text(header + "INT-1,1h,2024-02-05,8:00:00\n")
+    summary = await run_sync_worklogs_file(csv_file_path)
+    second_summary = await run_sync_worklogs_file(csv_file_path)
+
+    assert summary == {**summary, "deleted": 1, "unchanged": 1, "updated": 0}
+    assert second_summary == {**second_summary, "deleted": 0, "unchanged": 1}
+    remote_worklogs = sorted(
+        (worklog["startDate"], worklog["startTime"])
+        for worklog in server.worklogs.values()
+    )
+    assert remote_worklogs == [
+        ("2024-02-05", "8:00:00"),
+        ("2024-02-05", "9:00:00"),
+        ("2024-02-06", "9:00:00"),
+    ]
@@ -0,0 +1,130 @@
+import csv
+import json
+from pathlib import Path
+
+import pytest
+
+from tempo_worklog_automation.benchmarks.stub_server import StubServerConfig
+from tempo_worklog_automation.client import make_async_upload_worklogs_file
+from tempo_worklog_automation.client.results import (
+    FAILED,
+    RETRYABLE,
+    SUCCEEDED,
+    FileResultSink,
+    MemoryResultSink,
+    RowOutcome,
+)
+from tempo_worklog_automation.tests.stub_server import StartStubServerInThread
+
+
+def test_memory_result_sink() -> None:
+    """
+    Test MemoryResultSink.
+
+    GIVEN outcomes of created, throttled then created, and failed rows
+    WHEN they are recorded
+    THEN the arrays must give them back with the ids of the successful rows only
+    """
+    sink = MemoryResultSink()
+    outcomes = [
+        RowOutcome(1, 200, 11, 1, 0.5),
+        RowOutcome(2, 200, 12, 3, 1.5),
+        RowOutcome(3, 400, None, 1, 0.25),
+    ]
+    for outcome in outcomes:
+        sink.record(outcome)
+
+    assert list(sink) == outcomes
+    assert sink.status_codes == [200, 200, 400]
+    assert sink.worklog_ids == [11, 12]
+    assert sink.retries == 2
+
+
+def test_rows_by_outcome() -> None:
+    """
+    Test MemoryResultSink.rows_by_outcome.
+
+    GIVEN created, duplicate, rejected, throttled, unavailable and unanswered rows
+    WHEN their row numbers are grouped by outcome
+    THEN only the rejected row must be failed and the others succeeded or retryable
+    """
+    sink = MemoryResultSink()
+    for row, status, worklog_id in (
+        (6, 0, None),
+        (1, 201, 11),
+        (2, 0, 12),
+        (3, 400, None),
+        (4, 429, None),
+        (5, 503, None),
+    ):
+        sink.record(RowOutcome(row, status, worklog_id, 1, 0))
+
+    assert sink.rows_by_outcome() == {
+        SUCCEEDED: [1, 2],
+        FAILED: [3],
+        RETRYABLE: [4, 5, 6],
+    }
+
+
+@pytest.mark.parametrize("suffix", [".jsonl", ".csv"])
+def test_file_result_sink(tmp_path: Path, suffix: str) -> None:
+    """
+    Test FileResultSink.
+
+    GIVEN a receipt path with a JSON Lines or a CSV suffix
+    WHEN outcomes are recorded and the sink is closed
+    THEN the receipt must hold one entry per row with every outcome field
+    """
+    receipt_path = tmp_path / f"receipt{suffix}"
+    with FileResultSink(receipt_path) as sink:
+        sink.record(RowOutcome(1, 200, 11, 2, 0.5))
+        sink.record(RowOutcome(2, 0, None, 0, 0))
+
+    with open(receipt_path) as receipt:
+        if suffix == ".csv":
+            entries = list(csv.DictReader(receipt))
+        else:
+            entries = [json.loads(line) for line in receipt]
+    assert [str(entry["row"]) for entry in entries] == ["1", "2"]
+    assert str(entries[0]["worklog_id"]) == "11"
+    assert str(entries[0]["attempts"]) == "2"
+    assert entries[1]["worklog_id"] in {None, ""}
+    assert [entry["outcome"] for entry in entries] == [SUCCEEDED, RETRYABLE]
+
+
+def test_upload_writes_receipt(
+    start_stub_server_in_thread: StartStubServerInThread,
+    tmp_path: Path,
+) -> None:
+    """
+    Test make_async_upload_worklogs_file with a receipt.
+
+    GIVEN a throttling stand-in server and a worklogs file with an invalid row
+    WHEN the file is uploaded with a JSON Lines receipt
+    THEN the receipt must hold the final status and worklog id of each posted row
+    """
+    file_path = tmp_path / "worklogs.csv"
+    file_path.write_text(
+        "issue,time_spent,start_date,start_time\n"
+        + "INT-1,1h,2024-04-01,9:00:00\n"
+        + "INT-2,1x,2024-04-01,10:00:00\n"
+        + "INT-3,2h,2024-04-02,9:00:00\n",
+    )
+    receipt_path = tmp_path / "receipt.jsonl"
+    server = start_stub_server_in_thread(
+        StubServerConfig(rate_429=0.3, retry_after=0.01, seed=2),
+        upload_journal=False,
+    )
+
+    summary = make_async_upload_worklogs_file(file_path, receipt_path=receipt_path)
+
+    entries = sorted(
+        (json.loads(line) for line in receipt_path.read_text().splitlines()),
+        key=lambda entry: entry["row"],
+    )
+    assert summary["created"] == 2
+    assert [entry["row"] for entry in entries] == [1, 3]
+    assert {entry["status"] for entry in entries} == {200}
+    assert {entry["worklog_id"] for entry in entries} == set(server.worklogs)
+    attempts = sum(entry["attempts"] for entry in entries)
+    assert attempts == 2 + server.counters["throttled"]
@@ -0,0 +1,206 @@
+from typing import Callable, Iterator, List
+
+import anyio
+import httpx
+import pytest
+
+from tempo_worklog_automation.benchmarks.stub_server import StubServerConfig
+from tempo_worklog_automation.client import (
+    create_worklog,
+    get_issue_id,
+    run_create_worklog_requests,
+)
+from tempo_worklog_automation.client.exceptions import UnknownIssuesError
+from tempo_worklog_automation.client.models import WorklogModel
+from tempo_worklog_automation.client.retry import RetryPolicy
+from tempo_worklog_automation.client.throttle import (
+    CircuitBreaker,
+    CircuitOpenError,
+    RateLimiter,
+    RetryBudget,
+)
+from tempo_worklog_automation.settings import RetryJitter, settings
+from tempo_worklog_automation.tests.stub_server import StartStubServer
+
+
+@pytest.fixture
+def no_backoff(monkeypatch: pytest.MonkeyPatch) -> None:
+    """
+    Retry the requests without waiting.
+
+    :param monkeypatch: pytest MonkeyPatch.
+    """
+    monkeypatch.setattr(settings, "retry_backoff_factor", 0)
+
+
+def create_scripted_client(
+    statuses: List[int],
+    requests: List[httpx.Request],
+) -> httpx.AsyncClient:
+    """
+    Create an httpx.AsyncClient answering each request with the next scripted status.
+
+    A status of 0 raises a connection error instead of answering.
+
+    :param statuses: http response codes answered in order, the last one repeats.
+    :param requests: list to store the received requests.
+    :return: httpx.AsyncClient with a mock transport.
+    """
+    scripted: Iterator[int] = iter(statuses)
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        requests.append(request)
+        status = next(scripted, statuses[-1])
+        if not status:
+            raise httpx.ConnectError("Connection refused", request=request)
+        return httpx.Response(status, json={"id": 10010, "tempoWorklogId": 1})
+
+    return httpx.AsyncClient(transport=httpx.MockTransport(handler))
+
+
+def test_wait_time_jitter_and_retry_after() -> None:
+    """
+    Test RetryPolicy.wait_time.
+
+    GIVEN retry policies with full, decorrelated and no jitter
+    WHEN wait times are computed
+    THEN they must stay within the jitter bounds, the cap and the Retry-After
+    """
+    full = RetryPolicy(backoff_factor=1, max_backoff=5)
+    decorrelated = RetryPolicy(
+        backoff_factor=1,
+        max_backoff=5,
+        jitter=RetryJitter.DECORRELATED,
+    )
+    for attempt in range(6):
+        assert 0 <= full.wait_time(attempt) <= min(2**attempt, 5)
+        assert 1 <= decorrelated.wait_time(attempt, previous_wait=1) <= 3
+    assert decorrelated.wait_time(3, previous_wait=4) <= 5
+
+    exponential = RetryPolicy(backoff_factor=1, jitter=RetryJitter.NONE)
+    assert exponential.wait_time(2) == 4
+    assert exponential.wait_time(0, retry_after=7) == 7
+
+
+@pytest.mark.anyio
+@pytest.mark.usefixtures("no_backoff")
+async def test_get_issue_id_retries_server_and_transport_errors() -> None:
+    """
+    Test get_issue_id retries.
+
+    GIVEN a Jira api failing to connect and then answering 503
+    WHEN get_issue_id is called
+    THEN the request must be retried until the issue id is returned
+    """
+    requests: List[httpx.Request] = []
+    async with create_scripted_client([0, 503, 200], requests) as client:
+        assert await get_issue_id("INT-10", client=client) == 10010
+    assert len(requests) == 3
+
+
+@pytest.mark.anyio
+@pytest.mark.usefixtures("no_backoff")
+async def test_get_issue_id_does_not_retry_unknown_issues() -> None:
+    """
+    Test get_issue_id with an unknown issue.
+
+    GIVEN a Jira api answering 404
+    WHEN get_issue_id is called
+    THEN UnknownIssuesError must be raised after a single request
+    """
+    requests: List[httpx.Request] = []
+    async with create_scripted_client([404], requests) as client:
+        with pytest.raises(UnknownIssuesError):
+            await get_issue_id("INT-404", client=client)
+    assert len(requests) == 1
+
+
+@pytest.mark.anyio
+@pytest.mark.usefixtures("no_backoff")
+async def test_retry_budget_is_shared_by_the_requests() -> None:
+    """
+    Test RetryBudget.
+
+    GIVEN a Tempo api always answering 503 and a limiter with a budget of 3 retries
+    WHEN two worklogs are created with up to 5 retries each
+    THEN both must fail after 3 retries in total
+    """
+    requests: List[httpx.Request] = []
+    limiter = RateLimiter(retry_budget=RetryBudget(3))
+    async with create_scripted_client([503], requests) as client:
+        for _ in range(2):
+            response = await create_worklog(client, {}, "http://tempo", {}, limiter)
+            assert response is None
+    assert len(requests) == 5
+    assert limiter.retry_budget.denied == 2
+
+
+@pytest.mark.anyio
+@pytest.mark.usefixtures("no_backoff")
+async def test_circuit_breaker_fails_fast_and_recovers() -> None:
+    """
+    Test CircuitBreaker.
+
+    GIVEN a Tempo api answering 503 three times and a breaker opening after three
+    WHEN worklogs are created before and after the reset timeout
+    THEN requests must fail fast while the breaker is open and a probe must close it
+    """
+    requests: List[httpx.Request] = []
+    limiter = RateLimiter(breaker=CircuitBreaker(3, reset_timeout=0.05))
+    async with create_scripted_client([503, 503, 503, 201], requests) as client:
+        with pytest.raises(CircuitOpenError):
+            await create_worklog(client, {}, "http://tempo", {}, limiter)
+        assert len(requests) == 3
+        assert limiter.breaker.opened == 1
+
+        await anyio.sleep(0.05)
+        response = await create_worklog(client, {}, "http://tempo", {}, limiter)
+    assert response is not None
+    assert not limiter.breaker.is_open
+
+
+@pytest.mark.anyio
+async def test_cancelled_probe_lets_the_next_request_probe() -> None:
+    """
+    Test CircuitBreaker probes.
+
+    GIVEN an open breaker past its reset timeout
+    WHEN the probe request is cancelled before any outcome is recorded
+    THEN the next request must be let through as the only probe
+    """
+    breaker = CircuitBreaker(1, reset_timeout=0.01)
+    limiter = RateLimiter(breaker=breaker)
+    breaker.record_failure()
+    await anyio.sleep(0.01)
+
+    with anyio.move_on_after(0.01):
+        async with limiter:
+            await anyio.sleep(1)
+    async with limiter:
+        with pytest.raises(CircuitOpenError):
+            breaker.before_request()
+    async with limiter:
+        pass  # noqa: WPS420
+
+
+@pytest.mark.anyio
+@pytest.mark.usefixtures("no_backoff")
+async def test_create_retries_server_errors_against_stub_server(
+    start_stub_server: StartStubServer,
+    create_worklogs: Callable[[int], List[WorklogModel]],
+) -> None:
+    """
+    Test run_create_worklog_requests with server errors.
+
+    GIVEN a stand-in server answering 503 to a fifth of the Tempo posts
+    WHEN worklogs are created
+    THEN every worklog must be created once
+    """
+    server = await start_stub_server(
+        StubServerConfig(rate_5xx=0.2, fail_methods=["POST"], seed=2),
+    )
+
+    results = await run_create_worklog_requests(create_worklogs(20))
+    assert server.counters["errors"]
+    assert sorted(results["worklog_ids"]) == list(range(1, 21))
+    assert results["retries"] == server.counters["errors"]
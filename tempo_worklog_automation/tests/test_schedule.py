@@ -0,0 +1,152 @@
+from pathlib import Path
+from typing import Any, Iterator, List
+
+import pytest
+
+from tempo_worklog_automation.client import api, run_upload_worklogs_file
+from tempo_worklog_automation.client.exceptions import ScheduleConflictsError
+from tempo_worklog_automation.client.schedule import (
+    OverbookedDay,
+    Overlap,
+    ScheduleChecker,
+    check_worklogs_file,
+    find_schedule_conflicts,
+)
+from tempo_worklog_automation.settings import OverlapCheck, settings
+from tempo_worklog_automation.tests.stub_server import StartStubServer
+
+OVERLAPPING_ROWS = """issue,time_spent,start_date,start_time
+INT-1,2h,2024-02-05,09:00:00
+INT-2,1h,2024-02-05,8:00:00
+INT-3,1h,2024-02-05,10:30:00
+INT-1,1h,2024-02-06,10:30:00
+INT-4,1x,2024-02-05,09:00:00
+"""
+UNGROUPED_ROWS = """issue,time_spent,start_date,start_time
+INT-1,1h,2024-02-05,09:00:00
+INT-2,1h,2024-02-05,10:00:00
+INT-1,1h,2024-02-06,09:00:00
+INT-3,1h,2024-02-05,10:30:00
+INT-4,22h,2024-02-05,11:30:00
+"""
+
+
+def test_find_schedule_conflicts() -> None:
+    """
+    Test find_schedule_conflicts function.
+
+    GIVEN unsorted intervals with nested, chained and back-to-back worklogs
+    WHEN find_schedule_conflicts is called
+    THEN each worklog starting before an earlier one ends and each day booked over
+    24 hours must be reported
+    """
+    intervals = [
+        ("2024-02-05", 36000, 39600, 3),
+        ("2024-02-05", 28800, 43200, 1),
+        ("2024-02-05", 43200, 46800, 4),
+        ("2024-02-05", 30000, 31000, 2),
+        ("2024-02-06", 0, 50000, 5),
+        ("2024-02-06", 50000, 90000, 6),
+    ]
+
+    report = find_schedule_conflicts(intervals)
+
+    assert report.overlaps == [
+        Overlap("2024-02-05", 2, 1, 1000),
+        Overlap("2024-02-05", 3, 1, 3600),
+    ]
+    assert report.overbooked_days == [OverbookedDay("2024-02-06", 90000)]
+    assert list(report.format_lines())[-1] == "2024-02-06: 25h booked, more than 24h"
+
+
+def test_check_worklogs_file(tmp_path: Path) -> None:
+    """
+    Test check_worklogs_file function.
+
+    GIVEN a csv file with an overlapping row and an invalid row
+    WHEN check_worklogs_file is called
+    THEN the overlap must be reported with its row numbers and the invalid row ignored
+    """
+    csv_file_path = tmp_path / "worklogs.csv"
+    csv_file_path.write_text(OVERLAPPING_ROWS)
+
+    report = check_worklogs_file(csv_file_path, batch_size=2)
+
+    assert report.overlaps == [Overlap("2024-02-05", 3, 1, 1800)]
+    assert not report.overbooked_days
+
+
+def test_check_worklogs_file_with_a_day_read_again(tmp_path: Path) -> None:
+    """
+    Test check_worklogs_file function with rows that are not grouped by date.
+
+    GIVEN a csv file with back-to-back worklogs of a day, a worklog of another day,
+    then more worklogs of the first day
+    WHEN check_worklogs_file is called
+    THEN the late worklog overlapping the first day must be reported and the day
+    hours must add up across its rows
+    """
+    csv_file_path = tmp_path / "worklogs.csv"
+    csv_file_path.write_text(UNGROUPED_ROWS)
+
+    report = check_worklogs_file(csv_file_path, batch_size=2)
+
+    assert report.overlaps == [Overlap("2024-02-05", 4, 2, 1800)]
+    assert report.overbooked_days == [OverbookedDay("2024-02-05", 90000)]
+    assert not ScheduleChecker().report()
+
+
+def test_scan_worklogs_file_reads_the_file_once(
+    tmp_path: Path,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    """
+    Test scan_worklogs_file function.
+
+    GIVEN a csv file with an overlapping row and an invalid row
+    WHEN it is scanned with the overlap check on and invalid rows skipped
+    THEN the file must be read once for its issue names, dates and overlaps
+    """
+    csv_file_path = tmp_path / "worklogs.csv"
+    csv_file_path.write_text(OVERLAPPING_ROWS)
+    reads: List[Path] = []
+
+    def iter_worklog_rows(file_path: Path) -> Iterator[Any]:
+        reads.append(file_path)
+        return read_worklog_rows(file_path)
+
+    read_worklog_rows = api.iter_worklog_rows
+    monkeypatch.setattr(api, "iter_worklog_rows", iter_worklog_rows)
+    monkeypatch.setattr(settings, "overlap_check", OverlapCheck.WARN)
+    monkeypatch.setattr(settings, "skip_invalid_rows", True)
+
+    scan = api.scan_worklogs_file(csv_file_path, batch_size=2)
+
+    assert reads == [csv_file_path]
+    assert scan.issue_names == {"INT-1", "INT-2", "INT-3", "INT-4"}
+    assert scan.start_dates == {"2024-02-05", "2024-02-06"}
+
+
+@pytest.mark.anyio
+async def test_upload_fails_before_any_request(
+    tmp_path: Path,
+    start_stub_server: StartStubServer,
+) -> None:
+    """
+    Test run_upload_worklogs_file with the overlap check set to fail.
+
+    GIVEN a csv file with overlapping worklogs
+    WHEN it is uploaded
+    THEN ScheduleConflictsError must be raised before any request is sent
+    """
+    csv_file_path = tmp_path / "worklogs.csv"
+    csv_file_path.write_text(OVERLAPPING_ROWS)
+    server = await start_stub_server(
+        overlap_check=OverlapCheck.FAIL,
+        upload_journal=False,
+    )
+
+    with pytest.raises(ScheduleConflictsError):
+        await run_upload_worklogs_file(csv_file_path)
+
+    assert server.counters["requests"] == 0
@@ -0,0 +1,74 @@
+from collections import Counter
+from typing import Counter as CounterType
+
+import httpx
+import pytest
+
+from tempo_worklog_automation.client.session import HttpSession, session_scope
+from tempo_worklog_automation.settings import settings
+
+
+def create_counting_transport(hosts: CounterType[str]) -> httpx.MockTransport:
+    """
+    Create a transport answering every request, counting the HEAD requests per host.
+
+    :param hosts: Counter receiving the host of each HEAD request.
+    :return: httpx.MockTransport.
+    """
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        if request.method == "HEAD":
+            assert request.url.path == "/"
+            hosts[request.url.host] += 1
+        return httpx.Response(200)
+
+    return httpx.MockTransport(handler)
+
+
+def test_session_from_settings(monkeypatch: pytest.MonkeyPatch) -> None:
+    """
+    Test HttpSession.from_settings.
+
+    GIVEN connection pool settings
+    WHEN an HttpSession is created from them
+    THEN both clients must share the limits and timeout of the settings
+    """
+    monkeypatch.setattr(settings, "http_max_connections", 7)
+    monkeypatch.setattr(settings, "http_max_keepalive_connections", 3)
+    monkeypatch.setattr(settings, "http_keepalive_expiry", 12)
+    monkeypatch.setattr(settings, "http_timeout", 2.5)
+
+    session = HttpSession.from_settings()
+
+    assert session.limits == httpx.Limits(
+        max_connections=7,
+        max_keepalive_connections=3,
+        keepalive_expiry=12,
+    )
+    assert session.jira is not session.tempo
+    for client in (session.jira, session.tempo):
+        assert client.timeout == httpx.Timeout(2.5)
+
+
+@pytest.mark.anyio
+async def test_prewarm_opens_connections_to_both_hosts(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    """
+    Test HttpSession.prewarm.
+
+    GIVEN Jira and Tempo apis on different hosts
+    WHEN a session is pre-warmed with three connections
+    THEN three HEAD requests must be sent to the root of each host
+    """
+    monkeypatch.setattr(settings, "jira_base_api_url", "http://jira.test/rest/api/2")
+    monkeypatch.setattr(settings, "tempo_base_api_url", "http://tempo.test/4/worklogs")
+    hosts: CounterType[str] = Counter()
+
+    async with HttpSession(transport=create_counting_transport(hosts)) as session:
+        await session.prewarm(3)
+        async with session_scope(session) as shared_session:
+            assert shared_session is session
+
+    assert hosts == {"jira.test": 3, "tempo.test": 3}
+    assert session.jira.is_closed
@@ -0,0 +1,41 @@
+from typing import Callable, List
+
+import pytest
+
+from tempo_worklog_automation.benchmarks.stub_server import StubServerConfig
+from tempo_worklog_automation.client import (
+    run_create_worklog_requests,
+    run_delete_worklog_requests,
+)
+from tempo_worklog_automation.client.models import WorklogModel
+from tempo_worklog_automation.tests.stub_server import StartStubServer
+
+
+@pytest.mark.anyio
+async def test_create_and_delete_against_stub_server(
+    start_stub_server: StartStubServer,
+    create_worklogs: Callable[[int], List[WorklogModel]],
+) -> None:
+    """
+    Test run_create_worklog_requests and run_delete_worklog_requests end to end.
+
+    GIVEN a stand-in server throttling a fifth of the Tempo requests
+    WHEN worklogs are created and then deleted
+    THEN every worklog must be created once and deleted afterwards
+
+    :param start_stub_server: fixture starting a stand-in server.
+    :param create_worklogs: worklog factory fixture.
+    """
+    server = await start_stub_server(
+        StubServerConfig(rate_429=0.2, retry_after=0.01, seed=1),
+    )
+
+    results = await run_create_worklog_requests(create_worklogs(20))
+    assert sorted(results["worklog_ids"]) == list(range(1, 21))
+    assert len(server.worklogs) == 20
+    assert results["status_codes"] == [200] * 20
+    assert results["retries"] == server.counters["throttled"]
+
+    status_codes = await run_delete_worklog_requests(results["worklog_ids"])
+    assert status_codes.count(204) == 20
+    assert not server.worklogs
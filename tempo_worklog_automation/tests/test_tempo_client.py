@@ -0,0 +1,41 @@
+from typing import Callable, List
+
+import pytest
+
+from tempo_worklog_automation.client import TempoClient
+from tempo_worklog_automation.client.models import WorklogModel
+from tempo_worklog_automation.tests.stub_server import StartStubServer
+
+
+@pytest.mark.anyio
+async def test_tempo_client_keeps_its_state_across_calls(
+    start_stub_server: StartStubServer,
+    create_worklogs: Callable[[int], List[WorklogModel]],
+) -> None:
+    """
+    Test TempoClient in a running event loop.
+
+    GIVEN an open TempoClient
+    WHEN issues are resolved and worklogs are created twice and then deleted
+    THEN the issues must be searched once and the same pools reused for every call
+    """
+    server = await start_stub_server()
+
+    async with TempoClient() as tempo_client:
+        tempo_session = tempo_client.session
+        issue_ids = await tempo_client.resolve_issues(["INT-1", "INT-2", "INT-3"])
+        searches = server.counters["requests"]
+
+        first = await tempo_client.create_many(create_worklogs(6))
+        second = await tempo_client.create_many(create_worklogs(6))
+        assert server.counters["requests"] == searches + 12
+
+        worklog_ids = first["worklog_ids"] + second["worklog_ids"]
+        status_codes = await tempo_client.delete_many(worklog_ids)
+        assert tempo_client.session is tempo_session
+
+    assert sorted(issue_ids) == ["INT-1", "INT-2", "INT-3"]
+    assert status_codes == [204] * 12
+    assert not server.worklogs
+    with pytest.raises(RuntimeError):
+        tempo_client.session  # noqa: WPS428
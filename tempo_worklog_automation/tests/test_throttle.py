@@ -0,0 +1,86 @@
+import time
+
+import anyio
+import httpx
+import pytest
+
+from tempo_worklog_automation.client.throttle import RateLimiter, parse_retry_after
+
+
+@pytest.mark.anyio
+async def test_concurrency_is_bounded() -> None:
+    """
+    Test RateLimiter concurrency limit.
+
+    GIVEN a RateLimiter with a concurrency limit of 2
+    WHEN 6 tasks enter it at the same time
+    THEN no more than 2 tasks must be inside it at once
+    """
+    limiter = RateLimiter(max_concurrency=2)
+    in_flight = 0
+    peak = 0
+
+    async def request() -> None:
+        nonlocal in_flight, peak
+        async with limiter:
+            in_flight += 1
+            peak = max(peak, in_flight)
+            await anyio.sleep(0.01)
+            in_flight -= 1
+
+    async with anyio.create_task_group() as tg:
+        for _ in range(6):
+            tg.start_soon(request)
+
+    assert peak == 2
+
+
+@pytest.mark.anyio
+async def test_token_bucket_paces_requests() -> None:
+    """
+    Test RateLimiter token bucket.
+
+    GIVEN a RateLimiter allowing 50 requests per second
+    WHEN 60 requests go through it
+    THEN the requests beyond the initial burst must be paced
+    """
+    limiter = RateLimiter(requests_per_second=50)
+    started_at = time.monotonic()
+    for _ in range(60):
+        async with limiter:
+            pass  # noqa: WPS420
+    assert time.monotonic() - started_at >= 0.15
+
+
+def test_adaptive_rate_backs_off_and_recovers() -> None:
+    """
+    Test RateLimiter adaptive mode.
+
+    GIVEN an adaptive RateLimiter
+    WHEN a 429 is recorded and then successes
+    THEN the rate must be halved and then grow again
+    """
+    limiter = RateLimiter(requests_per_second=8, adaptive=True)
+    limiter.on_throttled()
+    assert limiter.requests_per_second == 4
+
+    limiter.on_success()
+    assert limiter.requests_per_second == 4.25
+
+
+def test_parse_retry_after() -> None:
+    """
+    Test parse_retry_after.
+
+    GIVEN throttled responses without, with valid, non-finite and huge Retry-After
+    WHEN parse_retry_after is called
+    THEN the number of seconds capped at 300 or None must be returned
+    """
+    assert parse_retry_after(httpx.Response(429, headers={"Retry-After": "3"})) == 3
+    assert parse_retry_after(httpx.Response(429)) is None
+    assert parse_retry_after(httpx.Response(429, headers={"Retry-After": "x"})) is None
+    for non_finite in ("inf", "-inf", "nan"):
+        headers = {"Retry-After": non_finite}
+        assert parse_retry_after(httpx.Response(429, headers=headers)) is None
+    headers = {"Retry-After": "86400"}
+    assert parse_retry_after(httpx.Response(429, headers=headers)) == 300
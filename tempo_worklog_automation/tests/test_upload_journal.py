@@ -0,0 +1,174 @@
+import sqlite3
+
+from tempo_worklog_automation.client.journal import (
+    CREATED,
+    DELETED,
+    FAILED,
+    MATCHED,
+    PENDING,
+    UploadJournal,
+)
+from tempo_worklog_automation.client.models import WorklogModel
+
+
+def create_worklogs() -> list:  # type: ignore
+    """
+    Create three worklogs where the first two are identical.
+
+    :return: list of row numbers and WorklogModel objects.
+    """
+    worklog = WorklogModel(
+        issue="INT-10",
+        time_spent="2h",  # type: ignore
+        start_date="2024-02-05",
+        start_time="8:00:00",
+    )
+    other_worklog = WorklogModel(
+        issue="INT-15",
+        time_spent="3h",  # type: ignore
+        start_date="2024-02-05",
+        start_time="10:00:00",
+    )
+    return [(1, worklog), (2, worklog), (3, other_worklog)]
+
+
+def test_resume_skips_created_rows(tmp_path) -> None:  # type: ignore
+    """
+    Test UploadJournal resume.
+
+    GIVEN a journal where the first of two identical rows was created
+    WHEN the same rows are selected again with resume
+    THEN only the rows not created yet must be selected
+
+    :param tmp_path: pytest temporary directory fixture.
+    """
+    journal_path = tmp_path / "upload_journal.sqlite3"
+    with UploadJournal(journal_path, "worklogs.csv") as journal:
+        selected = journal.select(create_worklogs())
+        assert [row_number for row_number, _ in selected] == [1, 2, 3]
+        assert journal.count(PENDING) == 0
+        journal.record_pending(1)
+        journal.record_pending(2)
+        journal.record_created(1, 1001)
+        assert journal.count(CREATED) == 1
+        assert journal.count(PENDING) == 1
+
+    with UploadJournal(journal_path, "worklogs.csv") as resumed_journal:
+        selected = resumed_journal.select(create_worklogs(), resume=True)
+        assert [row_number for row_number, _ in selected] == [2, 3]
+        assert resumed_journal.skipped == 1
+
+
+def test_sources_are_isolated(tmp_path) -> None:  # type: ignore
+    """
+    Test UploadJournal sources.
+
+    GIVEN a journal where a row of one file was created
+    WHEN the same row of another file is selected with resume
+    THEN the row must be selected
+
+    :param tmp_path: pytest temporary directory fixture.
+    """
+    journal_path = tmp_path / "upload_journal.sqlite3"
+    with UploadJournal(journal_path, "first.csv") as journal:
+        journal.select(create_worklogs()[:1])
+        journal.record_created(1, 1001)
+
+    with UploadJournal(journal_path, "second.csv") as other_journal:
+        assert len(other_journal.select(create_worklogs()[:1], resume=True)) == 1
+
+
+def test_rerun_keeps_created_rows(tmp_path) -> None:  # type: ignore
+    """
+    Test UploadJournal without resume.
+
+    GIVEN a journal where a row was created
+    WHEN the row is selected again without resume and its post fails
+    THEN the row must stay created with its worklog id
+
+    :param tmp_path: pytest temporary directory fixture.
+    """
+    journal_path = tmp_path / "upload_journal.sqlite3"
+    with UploadJournal(journal_path, "worklogs.csv") as journal:
+        journal.select(create_worklogs()[:1])
+        journal.record_pending(1)
+        journal.record_created(1, 1001)
+
+    with UploadJournal(journal_path, "worklogs.csv") as rerun_journal:
+        assert len(rerun_journal.select(create_worklogs()[:1])) == 1
+        rerun_journal.record_pending(1)
+        rerun_journal.record_failed(1, "All retries failed.")
+        assert rerun_journal.count(CREATED) == 1
+        assert rerun_journal.count(PENDING) == rerun_journal.count(FAILED) == 0
+        assert list(rerun_journal.iter_created_worklog_ids()) == [[1001]]
+
+
+def test_matched_rows_are_not_deleted(tmp_path) -> None:  # type: ignore
+    """
+    Test UploadJournal matched rows.
+
+    GIVEN a journal where a row was created and another matched an existing worklog
+    WHEN the rows are selected again with resume and the created ids are listed
+    THEN both rows must be skipped and only the created id must be listed
+
+    :param tmp_path: pytest temporary directory fixture.
+    """
+    journal_path = tmp_path / "upload_journal.sqlite3"
+    with UploadJournal(journal_path, "worklogs.csv") as journal:
+        journal.select(create_worklogs()[1:])
+        journal.record_created(2, 1001)
+        journal.record_matched(3, 77)
+        assert journal.count(MATCHED) == 1
+
+    with UploadJournal(journal_path, "worklogs.csv") as resumed_journal:
+        assert not resumed_journal.select(create_worklogs()[1:], resume=True)
+        assert list(resumed_journal.iter_created_worklog_ids()) == [[1001]]
+
+
+def test_coalesced_rows_list_their_worklog_once(tmp_path) -> None:  # type: ignore
+    """
+    Test UploadJournal.iter_created_worklog_ids.
+
+    GIVEN a journal where three rows were merged into a single worklog
+    WHEN the created worklog ids are listed and marked deleted
+    THEN the worklog id must be listed once and every row must be marked deleted
+
+    :param tmp_path: pytest temporary directory fixture.
+    """
+    journal_path = tmp_path / "upload_journal.sqlite3"
+    with UploadJournal(journal_path, "worklogs.csv") as journal:
+        journal.select(create_worklogs())
+        for row_number in (1, 2, 3):
+            journal.record_created(row_number, 1001)
+
+        assert list(journal.iter_created_worklog_ids(batch_size=1)) == [[1001]]
+        journal.mark_deleted([1001])
+        assert journal.count(DELETED) == 3
+
+
+def test_created_worklogs_keep_their_start_date(tmp_path) -> None:  # type: ignore
+    """
+    Test UploadJournal.created_worklogs with a journal written without start dates.
+
+    GIVEN a journal table without the start date column
+    WHEN it is opened and rows are created and matched
+    THEN the created worklogs must be listed with their start date
+
+    :param tmp_path: pytest temporary directory fixture.
+    """
+    journal_path = tmp_path / "upload_journal.sqlite3"
+    with sqlite3.connect(journal_path) as connection:
+        connection.execute(
+            "CREATE TABLE worklog_rows (source TEXT NOT NULL, row_key TEXT NOT NULL, "
+            + "row_number INTEGER NOT NULL, state TEXT NOT NULL, "
+            + "tempo_worklog_id INTEGER, error TEXT, updated_at REAL NOT NULL, "
+            + "PRIMARY KEY (source, row_key))",
+        )
+    connection.close()
+
+    with UploadJournal(journal_path, "worklogs.csv") as journal:
+        journal.select(create_worklogs()[1:])
+        journal.record_created(2, 1001)
+        journal.record_matched(3, 77)
+
+        assert journal.created_worklogs() == {1001: "2024-02-05"}
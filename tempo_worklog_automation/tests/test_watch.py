@@ -0,0 +1,189 @@
+from pathlib import Path
+
+import pytest
+
+from tempo_worklog_automation.benchmarks.stub_server import StubServerConfig
+from tempo_worklog_automation.client import run_watch_worklogs_file
+from tempo_worklog_automation.client.results import FAILED
+from tempo_worklog_automation.client.utils.tail import CsvTail
+from tempo_worklog_automation.client.watch import load_watch_state
+from tempo_worklog_automation.tests.stub_server import StartStubServer
+
+HEADER = "issue,time_spent,start_date,start_time\n"
+REJECTED_LINE = "INT-1,0h,2024-02-28,9:00:00\n"
+
+
+def worklog_lines(first_day: int, count: int) -> str:
+    """
+    Create csv lines of one worklog per day.
+
+    :param first_day: day of month of the first worklog.
+    :param count: number of lines.
+    :return: csv lines.
+    """
+    return "".join(
+        f"INT-1,1h,2024-02-{day:02d},9:00:00\n"
+        for day in range(first_day, first_day + count)
+    )
+
+
+def test_tail_reads_appended_rows(tmp_path: Path) -> None:
+    """
+    Test CsvTail.
+
+    GIVEN a csv file appended to, rotated and truncated between reads
+    WHEN the rows are read after each change
+    THEN only complete new rows must be returned with their row numbers
+    """
+    csv_path = tmp_path / "worklogs.csv"
+    csv_path.write_text(HEADER + worklog_lines(1, 2) + "INT-1,1h,2024-02")
+    with CsvTail(csv_path) as tail:
+        assert tail.read_rows() == (1, [_row(1), _row(2)])
+        with open(csv_path, "a") as csv_file:
+            csv_file.write("-03,9:00:00\n")
+        assert tail.read_rows() == (3, [_row(3)])
+        assert tail.read_rows() == (4, [])
+        checkpoint = tail.checkpoint
+
+    with open(csv_path, "a") as csv_file:
+        csv_file.write(worklog_lines(4, 1))
+    with CsvTail(csv_path, checkpoint) as resumed_tail:
+        assert resumed_tail.read_rows() == (4, [_row(4)])
+
+        with open(csv_path, "a") as csv_file:
+            csv_file.write(worklog_lines(5, 1))
+        csv_path.rename(tmp_path / "worklogs.csv.1")
+        csv_path.write_text(HEADER + worklog_lines(10, 1))
+        assert resumed_tail.read_rows() == (5, [_row(5)])
+        assert resumed_tail.read_rows() == (1, [_row(10)])
+
+        csv_path.write_text(HEADER)
+        assert resumed_tail.read_rows() == (1, [])
+
+
+def test_tail_reads_long_and_unterminated_lines(tmp_path: Path) -> None:
+    """
+    Test CsvTail with a small chunk size.
+
+    GIVEN a csv file with lines longer than the chunk size, rotated after a line
+        that was never terminated
+    WHEN the rows are read
+    THEN every row must be returned, the unterminated one before the new file rows
+    """
+    csv_path = tmp_path / "worklogs.csv"
+    csv_path.write_text(HEADER + worklog_lines(1, 2) + "INT-1,1h,2024-02-03,9:00:00")
+    with CsvTail(csv_path, chunk_size=8) as tail:
+        # Every line is longer than a chunk, each read returns a single line.
+        assert tail.read_rows() == (1, [])
+        assert tail.read_rows() == (1, [_row(1)])
+        assert tail.read_rows() == (2, [_row(2)])
+        assert tail.read_rows() == (3, [])
+
+        csv_path.rename(tmp_path / "worklogs.csv.1")
+        csv_path.write_text(HEADER + worklog_lines(10, 1))
+        assert tail.read_rows() == (3, [_row(3)])
+        assert tail.read_rows() == (1, [])
+        assert tail.read_rows() == (1, [_row(10)])
+
+
+def _row(day: int) -> dict:  # type: ignore
+    return {
+        "issue": "INT-1",
+        "time_spent": "1h",
+        "start_date": f"2024-02-{day:02d}",
+        "start_time": "9:00:00",
+    }
+
+
+@pytest.mark.anyio
+async def test_watch_uploads_new_rows_once(
+    start_stub_server: StartStubServer,
+    tmp_path: Path,
+) -> None:
+    """
+    Test run_watch_worklogs_file.
+
+    GIVEN a csv file watched, appended to and watched again
+    WHEN the checkpoint of the first watch was lost after its rows were posted
+    THEN every row must be created once
+    """
+    server = await start_stub_server(
+        upload_journal_path=tmp_path / "journal.sqlite3",
+        watch_state_path=tmp_path / "watch_state.json",
+    )
+    csv_path = tmp_path / "worklogs.csv"
+    csv_path.write_text(HEADER + worklog_lines(1, 3))
+
+    first_watch = await run_watch_worklogs_file(csv_path, 0, polls=2)
+    with open(csv_path, "a") as csv_file:
+        csv_file.write(worklog_lines(4, 2))
+    second_watch = await run_watch_worklogs_file(csv_path, 0, polls=1)
+    (tmp_path / "watch_state.json").unlink()
+    replayed_watch = await run_watch_worklogs_file(csv_path, 0, polls=1)
+
+    assert first_watch["created"] == 3
+    assert second_watch == {**second_watch, "rows": 2, "created": 2}
+    assert replayed_watch == {**replayed_watch, "rows": 5, "skipped": 5, "created": 0}
+    assert len(server.worklogs) == 5
+
+
+@pytest.mark.anyio
+async def test_watch_reads_failed_rows_again(
+    start_stub_server: StartStubServer,
+    tmp_path: Path,
+) -> None:
+    """
+    Test run_watch_worklogs_file with a server answering 503 at times.
+
+    GIVEN a watched csv file whose rows are not all created at the first read
+        and whose last row is rejected by the api
+    WHEN the file is watched until every row is created
+    THEN the checkpoint must not move past the retryable rows, no row is created
+        twice and the rejected row must be posted once
+    """
+    server = await start_stub_server(
+        StubServerConfig(rate_5xx=0.5, fail_methods=["POST"], seed=3),
+        upload_journal_path=tmp_path / "journal.sqlite3",
+        watch_state_path=tmp_path / "watch_state.json",
+        retry_max_retries=0,
+    )
+    csv_path = tmp_path / "worklogs.csv"
+    csv_path.write_text(HEADER + worklog_lines(1, 6) + REJECTED_LINE)
+
+    watch = await run_watch_worklogs_file(csv_path, 0, polls=20)
+
+    assert server.counters["errors"]
+    assert watch["created"] == len(server.worklogs) == 6
+    assert watch[FAILED] == 1
+    checkpoint = load_watch_state().get(csv_path)
+    assert checkpoint is not None
+    assert checkpoint.row_number == 7
+
+
+@pytest.mark.anyio
+async def test_watch_does_not_post_rejected_rows_again(
+    start_stub_server: StartStubServer,
+    tmp_path: Path,
+) -> None:
+    """
+    Test run_watch_worklogs_file with a row the api rejects.
+
+    GIVEN a watched csv file with a rejected row
+    WHEN a row is appended and the file is read again
+    THEN only the appended row must be posted
+    """
+    server = await start_stub_server(
+        upload_journal_path=tmp_path / "journal.sqlite3",
+        watch_state_path=tmp_path / "watch_state.json",
+    )
+    csv_path = tmp_path / "worklogs.csv"
+    csv_path.write_text(HEADER + REJECTED_LINE + worklog_lines(1, 1))
+
+    first_watch = await run_watch_worklogs_file(csv_path, 0, polls=1)
+    with open(csv_path, "a") as csv_file:
+        csv_file.write(worklog_lines(2, 1))
+    second_watch = await run_watch_worklogs_file(csv_path, 0, polls=1)
+
+    assert first_watch == {**first_watch, "created": 1, FAILED: 1}
+    assert second_watch == {**second_watch, "rows": 1, "created": 1, FAILED: 0}
+    assert len(server.worklogs) == 2
@@ -55,3 +55,20 @@ async def test_load_issue_model(load_csv_file_with_random_values) -> None:  # ty
             start_date=worklog["start_date"],
             start_time=worklog["start_time"],
         )
+
+
+def test_start_date_is_zero_padded() -> None:
+    """
+    Test WorklogModel start_date validation.
+
+    GIVEN a worklog with an unpadded start date
+    WHEN the model is validated
+    THEN the start date must be zero padded
+    """
+    issue_model = WorklogModel(
+        issue="INT-10",
+        time_spent="1h",  # type: ignore
+        start_date="2024-2-5",
+        start_time="9:00:00",
+    )
+    assert issue_model.start_date == "2024-02-05"